@@ -0,0 +1,30 @@
+import os
+import statistics
+import tempfile
+from typing import Sequence
+
+"""Ad-hoc performance benchmarks, run from the repo root:
+
+    python -m benchmarks.<module> [--help]
+
+Each module prints a small table; nothing here is asserted, see tests/ for that.
+"""
+
+# Settings are read on first import of the app modules; no real LLM is called.
+os.environ.setdefault("ANTHROPIC_API_KEY", "benchmark")
+os.environ.setdefault("LOG_CONSOLE_LEVEL", "ERROR")
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="healthcare-agent-logs-"))
+os.environ.setdefault("LOG_FILE_LEVEL", "WARNING")
+
+
+def latency_summary(seconds: Sequence[float]) -> str:
+    """p50 / p95 / p99 / max of `seconds`, in milliseconds."""
+    ordered = sorted(seconds)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return (
+        f"p50 {statistics.median(ordered) * 1000:7.3f}ms  p95 {at(0.95):7.3f}ms  "
+        f"p99 {at(0.99):7.3f}ms  max {ordered[-1] * 1000:7.3f}ms"
+    )
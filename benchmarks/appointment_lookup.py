@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from benchmarks import latency_summary
+from src.app.voice.warmup import build_initial_state
+from src.core.repository import (
+    InMemoryAppointmentRepository,
+    InMemoryCustomerRepository,
+    Repositories,
+)
+from src.mock.customer import customer_store
+from src.mock.provider import Appointment, AppointmentStatus, ProviderStore
+from src.verticals.provider.tools import tools
+
+"""Provider tool latency as the appointment store grows to 1M records.
+
+Fills a `ProviderStore` with past appointments spread over many customers,
+then times `list_appointments`, `confirm_appointment` and `cancel_appointment`
+for one caller through the tools themselves (listing cache off). With indexed
+lookups the numbers should not move with the store size.
+"""
+
+CUSTOMERS = 100_000
+SAMPLES = 2_000
+
+
+def _fill(store: ProviderStore, size: int) -> None:
+    first = datetime(2020, 1, 6, 9, 0)
+    for i in range(size - len(store)):
+        store.add_appointment(
+            Appointment.at(
+                "",
+                f"CUST-B{i % CUSTOMERS:06d}",
+                first + timedelta(minutes=30 * i),
+                AppointmentStatus.COMPLETED,
+            )
+        )
+
+
+async def _time_tools(store: ProviderStore, appointment_id: str) -> Dict[str, List[float]]:
+    tools.get_repositories = lambda: Repositories(
+        appointments=InMemoryAppointmentRepository(store),
+        customers=InMemoryCustomerRepository(customer_store),
+    )
+    state = build_initial_state(customer_store.customers[0], "voice", authorized=True)
+
+    async def call(tool: Any, i: int, **args: Any) -> float:
+        started_at = time.perf_counter()
+        await tool.ainvoke(
+            {
+                "type": "tool_call",
+                "id": f"call-{i}",
+                "name": tool.name,
+                "args": {**args, "state": state},
+            }
+        )
+        return time.perf_counter() - started_at
+
+    timings: Dict[str, List[float]] = {"list": [], "confirm": [], "cancel": []}
+    for i in range(SAMPLES):
+        timings["list"].append(await call(tools.list_appointments, i, limit=3))
+        timings["confirm"].append(
+            await call(tools.confirm_appointment, i, appointment_id=appointment_id)
+        )
+        timings["cancel"].append(
+            await call(tools.cancel_appointment, i, appointment_id=appointment_id)
+        )
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    store = ProviderStore()
+    # Confirmed and cancelled in turn; cancelling frees its slot for the next confirm.
+    slot = store.find_free_slots(datetime(2031, 1, 6, 9, 0), 1)[0]
+    appointment_id = store.add_appointment(
+        Appointment.at("", customer_store.customers[0].id, slot.start, AppointmentStatus.PENDING)
+    ).id
+
+    for size in sorted(args.sizes):
+        started_at = time.perf_counter()
+        _fill(store, size)
+        filled_in = time.perf_counter() - started_at
+
+        timings = asyncio.run(_time_tools(store, appointment_id))
+        print(f"{len(store):>9,} appointments (filled in {filled_in:.1f}s)")
+        for name, samples in timings.items():
+            print(f"  {name:>8}  {latency_summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver, empty_checkpoint
+
+from benchmarks import latency_summary
+from src.core.checkpoint import create_checkpointer
+
+"""Checkpoint put/get latency with many conversation threads at once.
+
+Every thread runs `--turns` turns concurrently with all the others; a turn is a
+`put` of the grown `messages` channel followed by a `get` of the latest
+checkpoint, as a resumed call does.
+"""
+
+
+async def _thread(
+    saver: BaseCheckpointSaver, thread_id: str, turns: int, puts: List[float], gets: List[float]
+) -> None:
+    config: Dict[str, Any] = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    messages: List[BaseMessage] = []
+    version = None
+
+    for turn in range(turns):
+        messages = messages + [
+            HumanMessage(content=f"Can I move my appointment to day {turn}?"),
+            AIMessage(content=f"Sure, day {turn} at 10:30 is free. Shall I book it?"),
+        ]
+        version = saver.get_next_version(version, None)
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"messages": messages}
+        checkpoint["channel_versions"] = {"messages": version}
+
+        started_at = time.perf_counter()
+        config = await saver.aput(config, checkpoint, {"step": turn}, {"messages": version})
+        puts.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        checkpoint_tuple = await saver.aget_tuple(config)
+        gets.append(time.perf_counter() - started_at)
+        assert len(checkpoint_tuple.checkpoint["channel_values"]["messages"]) == len(messages)
+
+
+async def _run(backend: str, threads: int, turns: int, path: str) -> Tuple[List[float], List[float], float]:
+    saver = create_checkpointer(backend, path)
+    puts: List[float] = []
+    gets: List[float] = []
+
+    started_at = time.perf_counter()
+    await asyncio.gather(
+        *(_thread(saver, f"call-{i}", turns, puts, gets) for i in range(threads))
+    )
+    elapsed = time.perf_counter() - started_at
+
+    if hasattr(saver, "close"):
+        saver.close()
+    return puts, gets, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--threads", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--backends", nargs="+", default=["memory", "sqlite"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            path = str(Path(directory) / f"{backend}.sqlite")
+            puts, gets, elapsed = asyncio.run(_run(backend, args.threads, args.turns, path))
+            operations = len(puts) + len(gets)
+            print(
+                f"{backend:>7}: {args.threads} threads x {args.turns} turns, "
+                f"{operations / elapsed:,.0f} ops/s"
+            )
+            print(f"         put  {latency_summary(puts)}")
+            print(f"         get  {latency_summary(gets)}")
+
+
+if __name__ == "__main__":
+    main()
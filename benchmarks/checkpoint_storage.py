@@ -0,0 +1,145 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver, empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from benchmarks import latency_summary
+from src.app.voice.warmup import build_initial_state
+from src.core.checkpoint import BoundedMemorySaver, SqliteCheckpointSaver
+from src.mock.customer import customer_store
+
+"""Checkpoint bytes written and put/get latency: `MemorySaver` vs our savers.
+
+Replays conversations shaped like real calls: each turn is a caller utterance,
+a tool call, its result and a spoken reply, written as the three super-steps
+the graph checkpoints (agent, tools, agent). The initial `State` channels are
+written once, as LangGraph does for channels that don't change.
+"""
+
+
+def _turn(turn: int) -> Iterator[List[BaseMessage]]:
+    """The messages each super-step of one turn appends."""
+    call_id = f"toolu_{turn:04d}"
+    yield [
+        HumanMessage(content=f"Can you move my appointment on the {turn + 1}th to the afternoon?"),
+        AIMessage(
+            content="Let me check what's available.",
+            tool_calls=[
+                {
+                    "name": "find_available_slots",
+                    "args": {"date": f"06-{turn % 28 + 1:02d}-2031", "part_of_day": "afternoon"},
+                    "id": call_id,
+                }
+            ],
+        ),
+    ]
+    yield [
+        ToolMessage(
+            content='{"slots": ["14:00", "14:30", "15:00", "15:30", "16:00"], "provider": "Dr. Rao"}',
+            tool_call_id=call_id,
+            name="find_available_slots",
+        )
+    ]
+    yield [
+        AIMessage(
+            content="Dr. Rao has 2, 2:30, 3, 3:30 and 4 o'clock free that afternoon. "
+            "Which one works for you?"
+        )
+    ]
+
+
+def _replay(saver: BaseCheckpointSaver, thread_id: str, turns: int) -> Tuple[List[float], List[float]]:
+    config: Dict[str, Any] = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    state = build_initial_state(customer_store.customers[0]).model_dump(exclude={"messages"})
+    messages: List[BaseMessage] = []
+    versions: Dict[str, Any] = {}
+    puts: List[float] = []
+    gets: List[float] = []
+
+    def step(changed: Dict[str, Any]) -> None:
+        nonlocal config
+        for channel in changed:
+            versions[channel] = saver.get_next_version(versions.get(channel), None)
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {**state, "messages": messages}
+        checkpoint["channel_versions"] = dict(versions)
+
+        started_at = time.perf_counter()
+        config = saver.put(
+            config, checkpoint, {"step": len(puts)}, {c: versions[c] for c in changed}
+        )
+        puts.append(time.perf_counter() - started_at)
+
+        started_at = time.perf_counter()
+        saver.get_tuple(config)
+        gets.append(time.perf_counter() - started_at)
+
+    step({**state, "messages": messages})
+    for turn in range(turns):
+        for appended in _turn(turn):
+            messages = messages + appended
+            step({"messages": messages})
+
+    return puts, gets
+
+
+def _stored_bytes(saver: BaseCheckpointSaver, path: Path) -> int:
+    if isinstance(saver, SqliteCheckpointSaver):
+        with sqlite3.connect(path) as conn:
+            return sum(
+                conn.execute(query).fetchone()[0] or 0
+                for query in (
+                    "SELECT SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints",
+                    "SELECT SUM(LENGTH(blob)) FROM blobs",
+                    "SELECT SUM(LENGTH(value)) FROM writes",
+                )
+            )
+
+    total = sum(len(blob) for _, blob in saver.blobs.values())
+    for namespaces in saver.storage.values():
+        for checkpoints in namespaces.values():
+            for (_, checkpoint), (_, metadata), _ in checkpoints.values():
+                total += len(checkpoint) + len(metadata)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 40])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for turns in args.turns:
+            print(f"{args.calls} calls x {turns} turns")
+            for name in ("MemorySaver", "BoundedMemorySaver", "SqliteCheckpointSaver"):
+                path = Path(directory) / f"{name}-{turns}.sqlite"
+                saver = {
+                    "MemorySaver": MemorySaver,
+                    "BoundedMemorySaver": BoundedMemorySaver,
+                    "SqliteCheckpointSaver": lambda: SqliteCheckpointSaver(str(path)),
+                }[name]()
+
+                puts: List[float] = []
+                gets: List[float] = []
+                for call in range(args.calls):
+                    call_puts, call_gets = _replay(saver, f"call-{call}", turns)
+                    puts += call_puts
+                    gets += call_gets
+
+                if isinstance(saver, SqliteCheckpointSaver):
+                    saver.close()
+                stored = _stored_bytes(saver, path)
+                print(f"  {name:>21}: {stored / args.calls / 1024:9,.1f} KiB per call")
+                print(f"  {'put':>21}  {latency_summary(puts)}")
+                print(f"  {'get':>21}  {latency_summary(gets)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from benchmarks import latency_summary
+from src.mock.customer import CustomerStore
+
+"""Customer store memory per customer and lookup latency at millions of rows.
+
+Writes a JSONL customer file, streams it into a `CustomerStore` under
+tracemalloc, then times phone lookups (in the formats callers' numbers arrive
+in) and ID lookups against the loaded store.
+"""
+
+SAMPLES = 100_000
+
+
+def _write_customers(path: Path, count: int) -> None:
+    rng = random.Random(19)
+    with path.open("w", encoding="utf-8") as file:
+        for i in range(count):
+            row = {
+                "id": f"CUST-{i:08d}",
+                "name": f"Customer {i}",
+                "phone_number": f"({200 + i // 10_000_000}) {i // 10_000 % 1000:03d}-{i % 10_000:04d}",
+                "dob": f"{rng.randint(1940, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            }
+            file.write(json.dumps(row) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "customers.jsonl"
+        _write_customers(path, args.customers)
+
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        started_at = time.perf_counter()
+        store = CustomerStore()
+        result = store.load_file(path)
+        loaded_in = time.perf_counter() - started_at
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f"{result.loaded:,} customers loaded in {loaded_in:.1f}s (under tracemalloc), "
+        f"{(after - before) / result.loaded:.0f} bytes per customer, "
+        f"peak {(peak - after) / 1024 / 1024:.1f} MiB over resident"
+    )
+
+    rng = random.Random(5)
+    customers = store.customers
+    formats = [
+        lambda digits: f"+1{digits}",
+        lambda digits: f"({digits[:3]}) {digits[3:6]}-{digits[6:]}",
+        lambda digits: f"1-{digits[:3]}-{digits[3:6]}-{digits[6:]}",
+    ]
+    by_phone: List[float] = []
+    by_id: List[float] = []
+    for _ in range(SAMPLES):
+        customer = rng.choice(customers)
+        phone = rng.choice(formats)(customer.phone_number[2:])
+
+        started_at = time.perf_counter()
+        found = store.find_customer_by_phone_number(phone)
+        by_phone.append(time.perf_counter() - started_at)
+        assert found is customer
+
+        started_at = time.perf_counter()
+        store.get_customer_by_id(customer.id)
+        by_id.append(time.perf_counter() - started_at)
+
+    print(f"  by phone  {latency_summary(by_phone)}")
+    print(f"     by id  {latency_summary(by_id)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks import latency_summary
+from src.core.otp import LocalSmsSink, OtpService, OtpStore, SmsDispatcher, TokenBucketLimiter
+
+"""OTP send throughput and per-send latency against a slow SMS gateway.
+
+`OtpService.send` only hashes and enqueues, so its latency should stay flat
+however slow the gateway is; delivery throughput is bounded by the workers.
+"""
+
+
+class SlowSink(LocalSmsSink):
+    def __init__(self, latency: float) -> None:
+        super().__init__()
+        self.latency = latency
+
+    async def send(self, to: str, body: str) -> None:
+        await asyncio.sleep(self.latency)
+        self.sent.append((to, body))
+
+
+async def _run(numbers: int, gateway_latency: float, workers: int) -> None:
+    service = OtpService(
+        store=OtpStore(),
+        limiter=TokenBucketLimiter(capacity=3, refill_per_second=1 / 30),
+        dispatcher=SmsDispatcher(
+            SlowSink(gateway_latency), queue_size=numbers, workers=workers
+        ),
+    )
+    latencies: List[float] = []
+
+    started_at = time.perf_counter()
+    for i in range(numbers):
+        sent_at = time.perf_counter()
+        result = service.send(f"+1555{i:07d}")
+        latencies.append(time.perf_counter() - sent_at)
+        assert result.sent
+    queued_in = time.perf_counter() - started_at
+
+    await service.dispatcher.aclose()
+    delivered_in = time.perf_counter() - started_at
+
+    stats = service.dispatcher.stats()
+    print(
+        f"{numbers} sends, gateway {gateway_latency * 1000:.0f}ms, {workers} workers: "
+        f"{numbers / queued_in:,.0f} sends/s queued, "
+        f"{stats.delivered / delivered_in:,.0f} msgs/s delivered"
+    )
+    print(f"    send  {latency_summary(latencies)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--numbers", type=int, default=2_000)
+    parser.add_argument("--gateway-latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[16, 128])
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        asyncio.run(_run(args.numbers, args.gateway_latency, workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 from typing import TypedDict
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import START, StateGraph, END
-from langgraph.prebuilt import ToolNode
 from src.agents.state import State
 from src.verticals.provider.tools import (
     welcome_message,
@@ -9,15 +8,19 @@ from src.verticals.provider.tools import (
     book_appointment,
     confirm_appointment,
     cancel_appointment,
+    find_available_slots,
 )
-from langchain.chat_models import init_chat_model
-from langchain_core.messages import ToolMessage, AIMessage, SystemMessage
-import json
+from langchain_core.messages import AIMessage
 from src.verticals.provider.prompts import agent_prompt
 from src.verticals.authentication import send_otp, verify_otp
-from langgraph.checkpoint.memory import MemorySaver
+from src.core.checkpoint import create_checkpointer
+from src.app.config import get_settings
 from src.lib.logger import logger
 from src.core.prebuilt.types.llm_provider import LLMProvider, LLMModel
+from src.core.llm import llm_registry
+from src.core.llm.prompt_cache import log_prompt_cache_usage
+from src.agents.tool_node import ConcurrentToolNode
+from src.agents.memory import ContextWindowPolicy, make_memory_node, summary_context
 
 class Configuration(TypedDict):
     """Configurable parameters for the agent.
@@ -36,6 +39,7 @@ appointment_tools = [
     book_appointment,
     confirm_appointment,
     cancel_appointment,
+    find_available_slots,
 ]
 
 authentication_tools = [
@@ -48,47 +52,53 @@ tools = appointment_tools + authentication_tools
 tools_by_name = {tool.name: tool for tool in tools}
 
 
-def appointment_node(state: State, config: RunnableConfig):
-    system_prompt = agent_prompt(state)
+def build_tool_node():
+    return ConcurrentToolNode(
+        tools,
+        default_timeout=10.0,
+        # Confirm/cancel on the same appointment must not interleave.
+        serialize_by={
+            confirm_appointment.name: "appointment_id",
+            cancel_appointment.name: "appointment_id",
+        },
+        # Never time out a write; the model would retry one that may have landed.
+        writes=[
+            book_appointment.name,
+            confirm_appointment.name,
+            cancel_appointment.name,
+        ],
+    )
 
-    messages = [SystemMessage(content=system_prompt)] + state.messages
 
-    llm = init_chat_model(
-        model=LLMModel.CLAUDE_3_HAIKU_20240307.value,
-        model_provider=LLMProvider.ANTHROPIC.value,
+def appointment_llm():
+    return llm_registry.get(
+        LLMProvider.ANTHROPIC,
+        LLMModel.CLAUDE_3_HAIKU_20240307,
+        tools=tools,
         temperature=0.0,
         max_retries=2,
         timeout=10,
-    ).bind_tools(tools)
-
-    response = llm.invoke(messages)
-
-    return {"messages": [response], "active_node": "appointment_node"}
+    )
 
 
-def tool_node(state: State):
-    outputs = []
+def warm_llm_clients():
+    """Build the node runnables up front so the first call skips client setup."""
+    appointment_llm()
 
-    last_message = state.messages[-1]
 
-    if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        print(f"Tool calls: {last_message.tool_calls}")
+async def appointment_node(state: State, config: RunnableConfig):
+    system_prompt = agent_prompt(state)
 
-        for tool_call in last_message.tool_calls:
-            print(f"Tool call: {tool_call}")
+    messages = [
+        system_prompt.with_context(summary_context(state)).to_message(cache=True)
+    ] + state.messages
 
-            tool_result = tools_by_name[tool_call["name"]].invoke(tool_call["args"])
-            print(f"Tool result: {tool_result}")
+    llm = appointment_llm()
 
-            outputs.append(
-                ToolMessage(
-                    content=json.dumps(tool_result),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-            )
+    response = await llm.ainvoke(messages)
+    log_prompt_cache_usage("appointment_node", response)
 
-    return {"messages": outputs}
+    return {"messages": [response], "active_node": "appointment_node"}
 
 
 # Define the conditional edge that determines whether to continue or not
@@ -105,13 +115,19 @@ def should_continue(state: State):
         return "continue"
 
 
-def build_agent(add_checkpoint: bool = False):
+def build_agent(
+    add_checkpoint: bool = False,
+    context_policy: ContextWindowPolicy = ContextWindowPolicy(),
+):
     agent_builder = StateGraph(State, config_schema=Configuration)
 
+    agent_builder.add_node("memory", make_memory_node(context_policy))
+
     agent_builder.add_node("appointment_node", appointment_node)
-    agent_builder.add_node("tools", ToolNode(tools))
+    agent_builder.add_node("tools", build_tool_node())
 
-    agent_builder.add_edge(START, "appointment_node")
+    agent_builder.add_edge(START, "memory")
+    agent_builder.add_edge("memory", "appointment_node")
 
     agent_builder.add_conditional_edges(
         "appointment_node",
@@ -131,6 +147,12 @@ def build_agent(add_checkpoint: bool = False):
         return agent_builder.compile(name="provider_agent")
 
 
-checkpointer = MemorySaver()
+settings = get_settings()
+checkpointer = create_checkpointer(
+    settings.checkpoint_backend,
+    settings.checkpoint_sqlite_path,
+    ttl_seconds=settings.checkpoint_ttl_seconds,
+    max_bytes=settings.checkpoint_max_bytes,
+)
 appointment_agent = build_agent(add_checkpoint=True)
 langgraph_agent = build_agent(add_checkpoint=False)
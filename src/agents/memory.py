@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from langchain_core.messages import (
+    AIMessage,
+    AnyMessage,
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    ToolMessage,
+)
+
+from src.agents.state import State
+from src.lib.logger import logger
+
+
+"""Context-window policy for long calls.
+
+Every node sends `[SystemMessage] + state.messages` to the model, so without a
+bound the input grows on every turn. Before each graph run the memory node keeps
+the last `keep_last_turns` caller turns verbatim and folds everything older into
+`State.summary`, a compact running transcript that rides in the dynamic part of
+the system prompt. Older turns are then removed from the checkpointed history.
+
+The summary is built deterministically (no extra LLM round trip on the caller's
+critical path): tool payloads are truncated and OTP-like digit runs from the caller are masked.
+"""
+
+# Only caller text is masked; appointment ids and dates in tool results stay intact.
+_OTP_LIKE = re.compile(r"\b\d{4,8}\b")
+
+
+@dataclass(frozen=True)
+class ContextWindowPolicy:
+    """Limits applied to the history sent to the model."""
+
+    # Caller turns (a HumanMessage and everything after it) kept verbatim.
+    keep_last_turns: int = 6
+    # Hard budget for summary + verbatim messages; older turns are summarized
+    # until it fits. The latest turn is always kept whole.
+    max_input_tokens: int = 6000
+    # Upper bound for the running summary itself; its oldest lines are dropped.
+    max_summary_tokens: int = 800
+    # How much of a consumed tool result survives into the summary.
+    tool_payload_chars: int = 240
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def message_text(message: BaseMessage) -> str:
+    """Plain text of a message, flattening content blocks."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+
+    parts: List[str] = []
+    for block in content:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(str(block.get("text", "")))
+    return "".join(parts)
+
+
+def compact_history(state: State, policy: ContextWindowPolicy) -> Dict[str, Any]:
+    """Return the state update that moves turns outside the window into the summary."""
+
+    messages = state.messages
+    turn_starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+
+    if not turn_starts:
+        return {}
+
+    cut_position = max(len(turn_starts) - max(policy.keep_last_turns, 1), 0)
+    cut = turn_starts[cut_position]
+
+    # Enforce the token budget by summarizing whole turns, never the latest one.
+    message_tokens = [estimate_tokens(message_text(m)) for m in messages]
+    summary_tokens = estimate_tokens(state.summary) if state.summary else 0
+    total = summary_tokens + sum(message_tokens[cut:])
+
+    while total > policy.max_input_tokens and cut_position < len(turn_starts) - 1:
+        next_cut = turn_starts[cut_position + 1]
+        total -= sum(message_tokens[cut:next_cut])
+        cut_position += 1
+        cut = next_cut
+
+    if cut == 0:
+        return {}
+
+    dropped = messages[:cut]
+    summary = _roll_summary(state.summary, dropped, policy)
+
+    logger.debug(
+        f"Summarized {len(dropped)} messages, keeping {len(messages) - cut} "
+        f"(~{total} tokens incl. summary)"
+    )
+
+    return {
+        "summary": summary,
+        "messages": [RemoveMessage(id=m.id) for m in dropped if m.id],
+    }
+
+
+def make_memory_node(policy: ContextWindowPolicy):
+    """Build the graph node that applies `policy` before the agent runs."""
+
+    async def memory_node(state: State):
+        return compact_history(state, policy)
+
+    return memory_node
+
+
+def summary_context(state: State) -> str:
+    """Dynamic system-prompt section carrying the running summary, if any."""
+    if not state.summary:
+        return ""
+
+    return f"""
+    Summary of the earlier part of this conversation:
+{state.summary}
+"""
+
+
+# ---------------------------------------------------------------------------
+# Internals
+# ---------------------------------------------------------------------------
+
+
+def _roll_summary(
+    previous: str, dropped: List[AnyMessage], policy: ContextWindowPolicy
+) -> str:
+    lines = previous.splitlines() if previous else []
+    lines.extend(_summary_line(m, policy) for m in dropped)
+    lines = [line for line in lines if line]
+
+    # Keep the newest lines within the summary budget.
+    budget = policy.max_summary_tokens * 4
+    kept: List[str] = []
+    size = 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > budget:
+            break
+        kept.append(line)
+
+    return "\n".join(reversed(kept))
+
+
+def _summary_line(message: AnyMessage, policy: ContextWindowPolicy) -> str:
+    text = " ".join(message_text(message).split())
+
+    if isinstance(message, HumanMessage):
+        return f"- Caller: {_OTP_LIKE.sub('[redacted]', text)}"
+
+    if isinstance(message, ToolMessage):
+        if len(text) > policy.tool_payload_chars:
+            text = text[: policy.tool_payload_chars] + "…"
+        return f"- Result of {message.name or 'tool'}: {text}"
+
+    if isinstance(message, AIMessage):
+        if message.tool_calls:
+            names = ", ".join(call["name"] for call in message.tool_calls)
+            return f"- Agent used: {names}" + (f" ({text})" if text else "")
+        return f"- Agent: {text}" if text else ""
+
+    return ""
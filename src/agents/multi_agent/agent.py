@@ -1,7 +1,6 @@
 from typing import TypedDict
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import START, StateGraph, END
-from langgraph.prebuilt import ToolNode
 from src.agents.state import State, IntentIdentificationResponse
 from src.verticals.provider.tools import (
     welcome_message,
@@ -9,15 +8,21 @@ from src.verticals.provider.tools import (
     book_appointment,
     confirm_appointment,
     cancel_appointment,
+    find_available_slots,
 )
-from langchain_anthropic import ChatAnthropic
-from langchain_core.messages import ToolMessage, AIMessage, SystemMessage
-import json
+from langchain_core.messages import AIMessage
 from src.verticals.provider.prompts import agent_prompt
 from src.verticals.authentication import authentication_prompt, send_otp, verify_otp
-from langgraph.checkpoint.memory import MemorySaver
+from src.core.checkpoint import create_checkpointer
+from src.app.config import get_settings
 from src.verticals.intent_identification.prompt import intent_identification_prompt
 from src.lib.logger import logger
+from src.agents.multi_agent.fast_router import fast_route, routing_stats
+from src.core.prebuilt.types.llm_provider import LLMProvider, LLMModel
+from src.core.llm import llm_registry
+from src.core.llm.prompt_cache import log_prompt_cache_usage
+from src.agents.tool_node import ConcurrentToolNode
+from src.agents.memory import ContextWindowPolicy, make_memory_node, summary_context
 
 
 class Configuration(TypedDict):
@@ -37,6 +42,7 @@ appointment_tools = [
     book_appointment,
     confirm_appointment,
     cancel_appointment,
+    find_available_slots,
 ]
 
 authentication_tools = [
@@ -49,21 +55,69 @@ tools = appointment_tools + authentication_tools
 tools_by_name = {tool.name: tool for tool in tools}
 
 
-def intent_identification_node(state: State):
-    system_prompt = intent_identification_prompt(state)
-    messages = [SystemMessage(content=system_prompt)] + state.messages
+def build_tool_node():
+    return ConcurrentToolNode(
+        tools,
+        default_timeout=10.0,
+        # Confirm/cancel on the same appointment must not interleave.
+        serialize_by={
+            confirm_appointment.name: "appointment_id",
+            cancel_appointment.name: "appointment_id",
+        },
+        # Never time out a write; the model would retry one that may have landed.
+        writes=[
+            book_appointment.name,
+            confirm_appointment.name,
+            cancel_appointment.name,
+        ],
+    )
+
 
-    llm = ChatAnthropic(
-        model_name="claude-sonnet-4-20250514",
+def sonnet_llm(tools=None, structured_output=None):
+    return llm_registry.get(
+        LLMProvider.ANTHROPIC,
+        LLMModel.CLAUDE_SONNET_4_20250514,
+        tools=tools,
+        structured_output=structured_output,
+        include_raw=structured_output is not None,
         temperature=0.0,
         max_retries=2,
         timeout=10,
         stop=None,
     )
 
-    response = llm.with_structured_output(IntentIdentificationResponse).invoke(messages)
 
-    parsed_response = IntentIdentificationResponse.model_validate(response)
+def warm_llm_clients():
+    """Build the node runnables up front so the first call skips client setup."""
+    sonnet_llm(structured_output=IntentIdentificationResponse)
+    sonnet_llm(tools=[*appointment_tools, *authentication_tools])
+    sonnet_llm(tools=authentication_tools)
+
+
+async def intent_identification_node(state: State):
+    fast_node = fast_route(state)
+
+    if fast_node is not None:
+        routing_stats.fast_path += 1
+        logger.info(
+            f"Intent identification (fast path): {fast_node} "
+            f"[{routing_stats.fast_path_ratio:.0%} fast]"
+        )
+        return {"active_node": fast_node}
+
+    routing_stats.llm_fallback += 1
+
+    system_prompt = intent_identification_prompt(state)
+    messages = [
+        system_prompt.with_context(summary_context(state)).to_message(cache=True)
+    ] + state.messages
+
+    llm = sonnet_llm(structured_output=IntentIdentificationResponse)
+
+    response = await llm.ainvoke(messages)
+    log_prompt_cache_usage("intent_identification", response["raw"])
+
+    parsed_response = IntentIdentificationResponse.model_validate(response["parsed"])
 
     logger.info(f"Intent identification: {parsed_response.active_node}")
     logger.debug(f"Intent identification thinking: {parsed_response.thinking}")
@@ -74,38 +128,32 @@ def intent_identification_node(state: State):
     return {"active_node": parsed_response.active_node}
 
 
-def appointment_node(state: State, config: RunnableConfig):
+async def appointment_node(state: State, config: RunnableConfig):
     system_prompt = agent_prompt(state)
 
-    messages = [SystemMessage(content=system_prompt)] + state.messages
+    messages = [
+        system_prompt.with_context(summary_context(state)).to_message(cache=True)
+    ] + state.messages
 
-    llm = ChatAnthropic(
-        model_name="claude-sonnet-4-20250514",
-        temperature=0.0,
-        max_retries=2,
-        timeout=10,
-        stop=None,
-    ).bind_tools([*appointment_tools, *authentication_tools])
+    llm = sonnet_llm(tools=[*appointment_tools, *authentication_tools])
 
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
+    log_prompt_cache_usage("appointment_node", response)
 
     return {"messages": [response], "active_node": "appointment_node"}
 
 
-def authentication_node(state: State):
+async def authentication_node(state: State):
     system_prompt = authentication_prompt(state)
 
-    messages = [SystemMessage(content=system_prompt)] + state.messages
+    messages = [
+        system_prompt.with_context(summary_context(state)).to_message(cache=True)
+    ] + state.messages
 
-    llm = ChatAnthropic(
-        model_name="claude-sonnet-4-20250514",
-        temperature=0.0,
-        max_retries=2,
-        timeout=10,
-        stop=None,
-    ).bind_tools(authentication_tools)
+    llm = sonnet_llm(tools=authentication_tools)
 
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
+    log_prompt_cache_usage("auth_node", response)
 
     return {"messages": [response], "active_node": "auth_node"}
 
@@ -117,31 +165,6 @@ def is_authenticate(state: State):
         return "no"
 
 
-def tool_node(state: State):
-    outputs = []
-
-    last_message = state.messages[-1]
-
-    if isinstance(last_message, AIMessage) and last_message.tool_calls:
-        print(f"Tool calls: {last_message.tool_calls}")
-
-        for tool_call in last_message.tool_calls:
-            print(f"Tool call: {tool_call}")
-
-            tool_result = tools_by_name[tool_call["name"]].invoke(tool_call["args"])
-            print(f"Tool result: {tool_result}")
-
-            outputs.append(
-                ToolMessage(
-                    content=json.dumps(tool_result),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-            )
-
-    return {"messages": outputs}
-
-
 # Define the conditional edge that determines whether to continue or not
 def should_continue(state: State):
     messages = state.messages
@@ -161,15 +184,21 @@ def resume_agent(state: State):
     return state.active_node
 
 
-def build_agent(add_checkpoint: bool = False):
+def build_agent(
+    add_checkpoint: bool = False,
+    context_policy: ContextWindowPolicy = ContextWindowPolicy(),
+):
     agent_builder = StateGraph(State, config_schema=Configuration)
 
+    agent_builder.add_node("memory", make_memory_node(context_policy))
+
     agent_builder.add_node("intent_identification", intent_identification_node)
     agent_builder.add_node("appointment_node", appointment_node)
     agent_builder.add_node("auth_node", authentication_node)
-    agent_builder.add_node("tools", ToolNode(tools))
+    agent_builder.add_node("tools", build_tool_node())
 
-    agent_builder.add_edge(START, "intent_identification")
+    agent_builder.add_edge(START, "memory")
+    agent_builder.add_edge("memory", "intent_identification")
 
     agent_builder.add_conditional_edges(
         "intent_identification",
@@ -208,10 +237,17 @@ def build_agent(add_checkpoint: bool = False):
     )
 
     if add_checkpoint:
-        return agent_builder.compile(name="provider_agent", checkpointer=MemorySaver())
+        return agent_builder.compile(name="provider_agent", checkpointer=checkpointer)
     else:
         return agent_builder.compile(name="provider_agent")
 
 
+settings = get_settings()
+checkpointer = create_checkpointer(
+    settings.checkpoint_backend,
+    settings.checkpoint_sqlite_path,
+    ttl_seconds=settings.checkpoint_ttl_seconds,
+    max_bytes=settings.checkpoint_max_bytes,
+)
 appointment_agent = build_agent(add_checkpoint=True)
 langgraph_agent = build_agent(add_checkpoint=False)
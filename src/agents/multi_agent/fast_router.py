@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.state import State
+
+
+"""Rule-based routing for the multi-agent graph.
+
+`intent_identification_node` runs before every agent turn and again after every
+agent reply. Most of those decisions follow directly from the state, so they are
+made here without an LLM call; only genuinely ambiguous turns fall through to
+the intent-identification model.
+"""
+
+
+@dataclass
+class RoutingStats:
+    """How often routing was decided by rules vs by the LLM."""
+
+    fast_path: int = 0
+    llm_fallback: int = 0
+
+    @property
+    def fast_path_ratio(self) -> float:
+        total = self.fast_path + self.llm_fallback
+        return self.fast_path / total if total else 0.0
+
+
+routing_stats = RoutingStats()
+
+
+def fast_route(state: State) -> Optional[str]:
+    """Return the next node if it is decidable from state alone, else None."""
+
+    if not state.messages:
+        return None
+
+    last_message = state.messages[-1]
+
+    # The agent has answered and asked for nothing: wait for the caller.
+    if isinstance(last_message, AIMessage):
+        return None if last_message.tool_calls else "end"
+
+    if not isinstance(last_message, HumanMessage):
+        return None
+
+    # Authentication is finished, only the appointment agent has work left.
+    if state.authentication.is_authorized:
+        return "appointment_node"
+
+    # An OTP is outstanding, so the caller is most likely reading it back.
+    if state.authentication.otp_sent:
+        return "auth_node"
+
+    # Unauthenticated caller with no OTP yet: greeting vs. auth vs. appointment
+    # request needs the model.
+    return None
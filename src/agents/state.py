@@ -22,6 +22,8 @@ class State(BaseModel):
   customer: Customer
   agent_branding: AgentBranding
   authentication: AuthenticationState
+  # Running summary of turns that were folded out of `messages` (see agents/memory.py)
+  summary: str = ""
 
 
 class IntentIdentificationResponse(BaseModel):
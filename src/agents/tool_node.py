@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+import weakref
+from dataclasses import dataclass
+from types import CodeType
+from typing import Any, Dict, Iterable, Literal, Mapping, Optional, Sequence, Set
+
+from langchain_core.messages import ToolCall, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+
+from src.lib.logger import logger
+
+
+"""Tools node shared by both agent graphs.
+
+When the model emits several tool calls in one message they run concurrently
+(`ToolNode` gathers them and keeps results in call order). On top of that this
+node adds:
+
+* a per-tool timeout, reported back to the model as an error `ToolMessage`
+  (write tools are exempt: cancelling a write half way could leave it committed
+  after the model was told it failed),
+* per-tool latency counters, and
+* serialization of calls that write to the same record (e.g. confirming and
+  cancelling one appointment), keyed by a tool argument.
+
+These hook into `ToolNode._arun_one`, which is private to langgraph-prebuilt;
+the package is pinned in pyproject.toml and `_check_tool_node_hook` refuses to
+import against a version whose hook no longer matches.
+"""
+
+_HOOK_PARAMETERS = ("self", "call", "input_type", "config")
+
+
+def _code_names(code: CodeType) -> Set[str]:
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _check_tool_node_hook() -> None:
+    """Fail loudly if `ToolNode` no longer calls `_arun_one` the way we override it."""
+    hook = getattr(ToolNode, "_arun_one", None)
+    afunc = getattr(ToolNode, "_afunc", None)
+
+    if (
+        hook is None
+        or afunc is None
+        or not inspect.iscoroutinefunction(hook)
+        or tuple(inspect.signature(hook).parameters) != _HOOK_PARAMETERS
+        or "_arun_one" not in _code_names(afunc.__code__)
+    ):
+        raise ImportError(
+            "ConcurrentToolNode overrides ToolNode._arun_one"
+            f"{_HOOK_PARAMETERS[1:]}, which this langgraph-prebuilt version does "
+            "not provide or no longer calls; check the pinned version in pyproject.toml"
+        )
+
+
+_check_tool_node_hook()
+
+
+@dataclass
+class ToolLatency:
+    """Latency counters for one tool."""
+
+    calls: int = 0
+    timeouts: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+tool_latency: Dict[str, ToolLatency] = {}
+
+# One lock per record key, shared by every graph in the process and dropped once
+# no call holds it.
+_record_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _record_lock(key: str) -> asyncio.Lock:
+    lock = _record_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _record_locks[key] = lock
+    return lock
+
+
+class ConcurrentToolNode(ToolNode):
+    """`ToolNode` with per-tool timeouts, latency metrics and write serialization."""
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        *,
+        default_timeout: float = 10.0,
+        timeouts: Optional[Mapping[str, float]] = None,
+        serialize_by: Optional[Mapping[str, str]] = None,
+        writes: Optional[Iterable[str]] = None,
+        name: str = "tools",
+    ) -> None:
+        super().__init__(tools, name=name)
+        self.default_timeout = default_timeout
+        self.timeouts = dict(timeouts or {})
+        # tool name -> argument that identifies the record the tool writes to
+        self.serialize_by = dict(serialize_by or {})
+        # tools that change records; these run to completion without a timeout
+        self.writes = frozenset(writes or ())
+
+    async def _arun_one(
+        self,
+        call: ToolCall,
+        input_type: Literal["list", "dict", "tool_calls"],
+        config: RunnableConfig,
+    ) -> Any:
+        tool_name = call["name"]
+        timeout = (
+            None
+            if tool_name in self.writes
+            else self.timeouts.get(tool_name, self.default_timeout)
+        )
+        stats = tool_latency.setdefault(tool_name, ToolLatency())
+
+        started_at = time.perf_counter()
+        try:
+            lock_arg = self.serialize_by.get(tool_name)
+            record = call["args"].get(lock_arg) if lock_arg else None
+
+            if record is None:
+                return await asyncio.wait_for(
+                    super()._arun_one(call, input_type, config), timeout
+                )
+
+            async with _record_lock(f"{lock_arg}:{record}"):
+                return await asyncio.wait_for(
+                    super()._arun_one(call, input_type, config), timeout
+                )
+
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"Tool {tool_name} timed out after {timeout}s")
+            return ToolMessage(
+                content=f"{tool_name} timed out, please try again.",
+                name=tool_name,
+                tool_call_id=call["id"],
+                status="error",
+            )
+
+        finally:
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            logger.debug(
+                f"Tool {tool_name} took {elapsed_ms:.1f}ms "
+                f"(avg {stats.avg_ms:.1f}ms over {stats.calls} calls)"
+            )
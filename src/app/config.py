@@ -1,5 +1,6 @@
 from __future__ import annotations
 from functools import lru_cache
+from typing import Dict
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,6 +33,128 @@ class Settings(BaseSettings):
     # Base host used when constructing public URLs (e.g., ngrok host)
     app_base_host: str = Field("localhost:8000", alias="APP_BASE_HOST")
 
+    # ---------------------------------------------------------------------
+    # Voice streaming
+    # ---------------------------------------------------------------------
+    voice_coalesce_max_bytes: int = Field(
+        256,
+        description="Flush an outbound text frame once its token reaches this size",
+        alias="VOICE_COALESCE_MAX_BYTES",
+    )
+    voice_coalesce_max_delay_ms: int = Field(
+        120,
+        description="Flush buffered tokens at most this long after the first one",
+        alias="VOICE_COALESCE_MAX_DELAY_MS",
+    )
+    voice_coalesce_flush_on_clause: bool = Field(
+        True,
+        description="Flush on clause punctuation (,;:) as well as sentence ends",
+        alias="VOICE_COALESCE_FLUSH_ON_CLAUSE",
+    )
+    voice_interruptible: bool = Field(
+        True,
+        description="Let callers talk over agent speech (barge-in)",
+        alias="VOICE_INTERRUPTIBLE",
+    )
+
+    # ---------------------------------------------------------------------
+    # Caller sessions
+    # ---------------------------------------------------------------------
+    session_idle_ttl_seconds: float = Field(
+        900.0,
+        description="Expire sessions with no connected websocket after this much idle time",
+        alias="SESSION_IDLE_TTL_SECONDS",
+    )
+    session_sweep_interval_seconds: float = Field(
+        30.0,
+        description="How often the session sweeper looks for idle sessions",
+        alias="SESSION_SWEEP_INTERVAL_SECONDS",
+    )
+
+    # ---------------------------------------------------------------------
+    # Conversation checkpoints
+    # ---------------------------------------------------------------------
+    checkpoint_backend: str = Field(
+        "memory",
+        description="Checkpointer for the agent graphs: memory or sqlite",
+        alias="CHECKPOINT_BACKEND",
+    )
+    checkpoint_sqlite_path: str = Field(
+        "data/checkpoints.sqlite",
+        description="Database file used when CHECKPOINT_BACKEND=sqlite",
+        alias="CHECKPOINT_SQLITE_PATH",
+    )
+    checkpoint_ttl_seconds: float = Field(
+        1800.0,
+        description="Evict in-memory checkpoint threads idle for longer than this",
+        alias="CHECKPOINT_TTL_SECONDS",
+    )
+    checkpoint_max_bytes: int = Field(
+        256 * 1024 * 1024,
+        description="Resident size limit of the in-memory checkpoint store (LRU eviction)",
+        alias="CHECKPOINT_MAX_BYTES",
+    )
+
+    # ---------------------------------------------------------------------
+    # Appointment and customer records
+    # ---------------------------------------------------------------------
+    repository_backend: str = Field(
+        "memory",
+        description="Backend for appointments and customers: memory or sqlite",
+        alias="REPOSITORY_BACKEND",
+    )
+    repository_sqlite_path: str = Field(
+        "data/healthcare.sqlite",
+        description="Database file used when REPOSITORY_BACKEND=sqlite",
+        alias="REPOSITORY_SQLITE_PATH",
+    )
+    appointment_cache_max_entries: int = Field(
+        10_000,
+        description="LRU bound of the per-customer appointment listing cache; 0 disables it",
+        alias="APPOINTMENT_CACHE_MAX_ENTRIES",
+    )
+
+    # ---------------------------------------------------------------------
+    # OTP authentication
+    # ---------------------------------------------------------------------
+    otp_ttl_seconds: float = Field(
+        300.0, description="How long a sent OTP stays valid", alias="OTP_TTL_SECONDS"
+    )
+    otp_max_attempts: int = Field(
+        5, description="Wrong guesses allowed per OTP before it is revoked", alias="OTP_MAX_ATTEMPTS"
+    )
+    otp_send_burst: float = Field(
+        3.0,
+        description="OTPs a phone number may request back to back (token bucket size)",
+        alias="OTP_SEND_BURST",
+    )
+    otp_send_refill_seconds: float = Field(
+        60.0,
+        description="Seconds for one more OTP request to become available per phone number",
+        alias="OTP_SEND_REFILL_SECONDS",
+    )
+    sms_dispatcher_workers: int = Field(
+        4, description="Concurrent SMS deliveries per worker process", alias="SMS_DISPATCHER_WORKERS"
+    )
+    clinic_id: str = Field(
+        "appollo", description="Clinic this deployment answers for", alias="CLINIC_ID"
+    )
+    caller_trust_ttl_seconds: float = Field(
+        0.0,
+        description="Skip OTP for callers verified this recently; 0 (default) always requires OTP",
+        alias="CALLER_TRUST_TTL_SECONDS",
+    )
+    caller_trust_clinic_ttl_seconds: Dict[str, float] = Field(
+        default_factory=dict,
+        description='Per-clinic overrides of CALLER_TRUST_TTL_SECONDS, as JSON (e.g. {"appollo": 900})',
+        alias="CALLER_TRUST_CLINIC_TTL_SECONDS",
+    )
+    caller_trust_max_entries: int = Field(
+        100_000,
+        description="Verified callers remembered per worker (oldest dropped first)",
+        alias="CALLER_TRUST_MAX_ENTRIES",
+    )
+
     # ---------------------------------------------------------------------
     # Logging levels
     # ---------------------------------------------------------------------
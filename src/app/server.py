@@ -1,10 +1,42 @@
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+
 from fastapi import FastAPI
 
+from src.agents.appointment_agent.agent import checkpointer, warm_llm_clients
+from src.core.checkpoint import BoundedMemorySaver
+from src.core.repository import CachedAppointmentRepository, get_repositories
+from src.core.llm import llm_registry
+from src.core.otp import get_caller_trust, get_otp_service
+from src.lib.logger import logger
 from src.app.voice import router as voice_router
 from src.mock.customer_sessions import customer_session_store
-from src.app.voice.router import generate_response
+from src.app.voice.router import generate_response, release_session
+from src.app.config import get_settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build LLM clients and open a keep-alive connection before the first call.
+    warm_llm_clients()
+    await llm_registry.preconnect()
+    logger.info(f"LLM clients warmed: {llm_registry.stats}")
+
+    settings = get_settings()
+    customer_session_store.start_sweeper(
+        interval_seconds=settings.session_sweep_interval_seconds,
+        idle_ttl_seconds=settings.session_idle_ttl_seconds,
+        on_expire=release_session,
+    )
+
+    yield
+
+    await customer_session_store.stop_sweeper()
+    await get_otp_service().dispatcher.aclose()
+    await llm_registry.aclose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Health check endpoint
 @app.get("/health", tags=["Health"])
@@ -20,5 +52,31 @@ async def health_check():
     """Simple liveness probe endpoint."""
     return {"status": "ok"}
 
+
+@app.get("/health/checkpoints", tags=["Health"])
+async def checkpoint_stats():
+    """Resident size and eviction counters of the checkpoint store (per worker)."""
+    if not isinstance(checkpointer, BoundedMemorySaver):
+        return {"backend": type(checkpointer).__name__}
+
+    return {"backend": type(checkpointer).__name__, **asdict(checkpointer.stats())}
+
+
+@app.get("/health/appointment-cache", tags=["Health"])
+async def appointment_cache_stats():
+    """Hit ratio and size of the appointment listing cache (per worker)."""
+    appointments = get_repositories().appointments
+    if not isinstance(appointments, CachedAppointmentRepository):
+        return {"enabled": False}
+
+    stats = appointments.stats()
+    return {"enabled": True, **asdict(stats), "hit_ratio": round(stats.hit_ratio, 4)}
+
+@app.get("/health/caller-trust", tags=["Health"])
+async def caller_trust_stats():
+    """Recently verified callers and the OTP round trips they skipped (per worker)."""
+    trust = get_caller_trust()
+    return {"ttl_seconds": trust.ttl_for(get_settings().clinic_id), **asdict(trust.stats())}
+
 # Include routers
 app.include_router(voice_router, prefix="/voice")
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Optional
+
+from src.lib.logger import logger
+
+from .types import CRTextMessage
+
+
+"""Outbound token coalescing for ConversationRelay `text` frames.
+
+The graph streams `AIMessageChunk`s that are often a single character long.
+Sending one websocket frame (and one pydantic dump) per chunk is wasteful, and
+TTS gains nothing from receiving half-words. `TextFrameCoalescer` buffers tokens
+and flushes them as one frame when:
+
+* a sentence or clause boundary is followed by whitespace,
+* the buffer reaches `max_bytes`, or
+* `max_delay_ms` has passed since the first buffered token.
+
+The JSON envelope is rendered once per connection, so the per-token cost is a
+string concatenation and the per-frame cost is a single `json.dumps` of the text.
+"""
+
+_SENTENCE_END = frozenset(".!?")
+_CLAUSE_END = frozenset(",;:")
+
+# Placeholder that survives JSON encoding unchanged and never appears in text.
+_TOKEN_SENTINEL = "\x00"
+_ENCODED_SENTINEL = json.dumps(_TOKEN_SENTINEL)
+
+
+def _envelope(last: bool, interruptible: bool, preemptible: bool) -> tuple[str, str]:
+    """Return the (prefix, suffix) around the JSON-encoded token for a frame."""
+    template = CRTextMessage(
+        token=_TOKEN_SENTINEL,
+        last=last,
+        interruptible=interruptible,
+        preemptible=preemptible,
+    ).model_dump_json(exclude_none=True)
+
+    prefix, suffix = template.split(_ENCODED_SENTINEL)
+    return prefix, suffix
+
+
+class TextFrameCoalescer:
+    """Per-websocket buffer that turns streamed tokens into a few text frames."""
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        max_bytes: int = 256,
+        max_delay_ms: int = 120,
+        flush_on_clause: bool = True,
+        interruptible: bool = False,
+        preemptible: bool = False,
+    ) -> None:
+        self._send = send
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay_ms / 1000
+        self._boundaries = (
+            _SENTENCE_END | _CLAUSE_END if flush_on_clause else _SENTENCE_END
+        )
+
+        self._envelopes = {
+            False: _envelope(False, interruptible, preemptible),
+            True: _envelope(True, interruptible, preemptible),
+        }
+
+        self._buffer = ""
+        self._lock = asyncio.Lock()
+        self._deadline: Optional[asyncio.TimerHandle] = None
+        self._deadline_task: Optional[asyncio.Task[None]] = None
+
+        # Per-turn metrics
+        self._turn_started_at = time.perf_counter()
+        self._first_flush_ms: Optional[float] = None
+        self._frames = 0
+        self._tokens = 0
+
+        # Per-connection totals
+        self.turns = 0
+        self.total_frames = 0
+        self.total_tokens = 0
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+
+    def begin_turn(self) -> None:
+        """Reset per-turn state; any text left from a cancelled turn is dropped."""
+        self.discard()
+        self._turn_started_at = time.perf_counter()
+        self._first_flush_ms = None
+        self._frames = 0
+        self._tokens = 0
+
+    def discard(self) -> None:
+        """Drop buffered text and any pending deadline flush (barge-in)."""
+        self._buffer = ""
+        self._cancel_deadline()
+
+        if self._deadline_task is not None:
+            self._deadline_task.cancel()
+            self._deadline_task = None
+
+    async def write(self, token: str, is_last: bool = False) -> None:
+        """`stream_callback`-compatible entry point used by `generate_response`."""
+        if is_last:
+            await self.finish(token)
+        else:
+            await self.push(token)
+
+    async def push(self, token: str) -> None:
+        """Buffer a streamed token, flushing whatever is ready to be spoken."""
+        if not token:
+            return
+
+        self._tokens += 1
+        self.total_tokens += 1
+        previous_len = len(self._buffer)
+        buffer = self._buffer + token
+
+        cut = self._last_boundary(buffer, max(previous_len - 1, 0))
+
+        if cut:
+            self._buffer = buffer[cut:]
+            await self._flush_text(buffer[:cut], last=False)
+        else:
+            self._buffer = buffer
+
+        if self._buffer and self._exceeds_max_bytes(self._buffer):
+            text, self._buffer = self._buffer, ""
+            await self._flush_text(text, last=False)
+
+        if self._buffer:
+            self._arm_deadline()
+        else:
+            self._cancel_deadline()
+
+    async def finish(self, token: str = "") -> None:
+        """Flush everything and mark the end of the agent's utterance."""
+        if token:
+            self._tokens += 1
+            self.total_tokens += 1
+
+        text, self._buffer = self._buffer + token, ""
+        self._cancel_deadline()
+        await self._flush_text(text, last=True)
+
+        self.turns += 1
+        logger.info(
+            f"Turn streamed {self._tokens} tokens in {self._frames} frames, "
+            f"first flush after {self._first_flush_ms or 0:.1f}ms"
+        )
+
+    @property
+    def frames_per_turn(self) -> float:
+        """Average frames sent per completed turn on this connection."""
+        return self.total_frames / self.turns if self.turns else 0.0
+
+    @property
+    def first_flush_ms(self) -> Optional[float]:
+        """Milliseconds from `begin_turn` to the first frame of the current turn."""
+        return self._first_flush_ms
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+
+    def _last_boundary(self, buffer: str, start: int) -> int:
+        """Return the index just past the last boundary followed by whitespace.
+
+        Boundaries must be followed by whitespace so that "10:30" or "3.5" are
+        not split; a boundary at the very end is decided by the next token.
+        """
+        cut = 0
+        for i in range(start, len(buffer) - 1):
+            if buffer[i] in self._boundaries and buffer[i + 1].isspace():
+                cut = i + 1
+        return cut
+
+    def _exceeds_max_bytes(self, text: str) -> bool:
+        # UTF-8 is at most 4 bytes per char, so skip encoding short buffers.
+        if len(text) * 4 < self.max_bytes:
+            return False
+        return len(text.encode("utf-8")) >= self.max_bytes
+
+    async def _flush_text(self, text: str, last: bool) -> None:
+        if not text and not last:
+            return
+
+        prefix, suffix = self._envelopes[last]
+        frame = prefix + json.dumps(text) + suffix
+
+        async with self._lock:
+            await self._send(frame)
+
+        if self._first_flush_ms is None:
+            self._first_flush_ms = (time.perf_counter() - self._turn_started_at) * 1000
+
+        self._frames += 1
+        self.total_frames += 1
+        logger.trace(f"Sent text frame: {frame}")
+
+    def _arm_deadline(self) -> None:
+        if self._deadline is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._deadline = loop.call_later(self.max_delay, self._on_deadline)
+
+    def _on_deadline(self) -> None:
+        self._deadline = None
+        self._deadline_task = asyncio.create_task(self._flush_on_deadline())
+
+    async def _flush_on_deadline(self) -> None:
+        try:
+            text, self._buffer = self._buffer, ""
+            await self._flush_text(text, last=False)
+        finally:
+            if self._deadline_task is asyncio.current_task():
+                self._deadline_task = None
+
+    def _cancel_deadline(self) -> None:
+        # A deadline flush already in flight is left alone: the send lock keeps
+        # frames in order, and cancelling it mid-send could drop text.
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
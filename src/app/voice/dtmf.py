@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional
+
+
+"""Keypad (DTMF) entry of the OTP.
+
+A spoken code costs speech-to-text, a model turn to read it, the `verify_otp`
+tool and another model turn to answer. Keyed digits are exact, so the websocket
+collects them here while an OTP is outstanding and, once a full code has been
+typed, `verify_keypad_otp` in the router checks it without a model call and
+speaks one of these replies. Keys pressed at any other time are ignored.
+"""
+
+VERIFIED_REPLY = "Thank you, you're verified! How can I help you with your appointments today?"
+INVALID_REPLY = "Hmm, that code didn't match. Please try again, you have {attempts} attempts left."
+RESEND_REPLY = "That code is no longer valid. Would you like me to send you a new one?"
+
+# Stands in for the caller's turn in the history; the code itself is not kept.
+KEYPAD_ENTRY_MESSAGE = "(entered the verification code on the keypad)"
+
+
+def redact_frame(raw_msg: Dict[str, Any]) -> Dict[str, Any]:
+    """A websocket frame safe to log: keypad digits may be an OTP."""
+    if raw_msg.get("type") == "dtmf" and "digit" in raw_msg:
+        return {**raw_msg, "digit": "[redacted]"}
+    return raw_msg
+
+
+class DtmfCodeBuffer:
+    """Collects keypad digits into a code.
+
+    `#` submits early, `*` clears, and a pause longer than
+    `inter_digit_timeout_seconds` starts a new code.
+    """
+
+    def __init__(self, code_length: int, inter_digit_timeout_seconds: float = 5.0):
+        self.code_length = code_length
+        self.inter_digit_timeout_seconds = inter_digit_timeout_seconds
+        self._digits: List[str] = []
+        self._last_digit_at = 0.0
+
+    def feed(self, digit: str) -> Optional[str]:
+        """Add one keypress; returns the code once it is complete."""
+        now = time.monotonic()
+        if self._digits and now - self._last_digit_at > self.inter_digit_timeout_seconds:
+            self._digits.clear()
+        self._last_digit_at = now
+
+        if digit == "*":
+            self._digits.clear()
+            return None
+        if digit == "#":
+            return self._take() if self._digits else None
+        if not digit.isdigit():
+            return None
+
+        self._digits.append(digit)
+        return self._take() if len(self._digits) >= self.code_length else None
+
+    def reset(self) -> None:
+        """Drop any partially typed code."""
+        self._digits.clear()
+
+    def _take(self) -> str:
+        code = "".join(self._digits)
+        self._digits.clear()
+        return code
@@ -7,17 +7,24 @@ from fastapi import (
     HTTPException,
 )
 from fastapi.responses import Response, JSONResponse
-from typing import Any, Dict, Callable
-
-from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import HumanMessage, AIMessageChunk
+from typing import Any, Dict, Callable, List
+
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    AnyMessage,
+    HumanMessage,
+    ToolMessage,
+)
 from twilio.twiml.voice_response import Connect, ConversationRelay
 from pprint import pformat
+import time
 
 from src.agents.appointment_agent.agent import appointment_agent, checkpointer
-from src.agents.state import AgentBranding, State, AuthenticationState
+from src.agents.state import AuthenticationState, State
+from src.core.otp import OtpVerification, get_caller_trust, get_otp_service
+from src.core.repository import get_repositories
 from src.lib.logger import logger
-from src.mock.customer import customer_store
 from src.mock.customer_sessions import customer_session_store, CustomerSession
 
 from .types import (
@@ -25,19 +32,45 @@ from .types import (
     InterruptibleEnum,
     TwilioVoiceWebhook,
     CallStatusCallback,
+    CallStatusEnum,
     ConversationRelayAttributes,
     ConversationRelayMessageTypeEnum,
     CRPromptMessage,
-    CRTextMessage,
+    CRDtmfMessage,
+    CRInterruptMessage,
     CRErrorMessage,
     CREndMessage,
     CRSetupMessage,
 )
+from .coalescer import TextFrameCoalescer
+from .dtmf import (
+    INVALID_REPLY,
+    KEYPAD_ENTRY_MESSAGE,
+    RESEND_REPLY,
+    VERIFIED_REPLY,
+    DtmfCodeBuffer,
+    redact_frame,
+)
+from .turns import TurnManager
+from .warmup import (
+    build_initial_state,
+    conversation_warmer,
+    is_trusted_caller,
+    thread_config,
+)
 
 from src.app.config import Settings, get_settings
 
 router = APIRouter()
 
+_TERMINAL_CALL_STATUSES = {
+    CallStatusEnum.completed,
+    CallStatusEnum.busy,
+    CallStatusEnum.failed,
+    CallStatusEnum.no_answer,
+    CallStatusEnum.canceled,
+}
+
 
 @router.post("", response_class=Response, name="voice-webhook")
 async def inbound_call(
@@ -59,10 +92,15 @@ async def inbound_call(
         VoiceResponse,
     )  # local import avoids cost on cold start
 
-    init_customer_session = customer_session_store.create_session(payload.From, "voice")
+    init_customer_session = customer_session_store.create_session(
+        payload.From, "voice", call_sid=payload.CallSid
+    )
 
     logger.info(f"session created successfully for {payload.From}")
 
+    # Resolve the caller and seed the checkpoint while Twilio sets up the relay.
+    conversation_warmer.start(init_customer_session)
+
     websocket_url = (
         settings.websocket_url + f"?session_id={init_customer_session.session_id}"
     )
@@ -75,6 +113,8 @@ async def inbound_call(
         url=websocket_url,
         welcome_greeting="Welcome to the Appollo Clinic. How can I help you today?",
         welcome_greeting_interruptible=InterruptibleEnum.speech,
+        # Keypad digits arrive as `dtmf` frames, used for OTP entry.
+        dtmf_detection=True,
         # voice="dMyQqiVXTU80dDl2eNK8",
         voice="uYXf8XasLslADfZ2MB4u-flash_v2_5-0.8_0.6_0.8",
     )
@@ -103,6 +143,12 @@ async def call_status_callback(request: Request) -> JSONResponse:
     data = CallStatusCallback(**form)  # type: ignore[arg-type]
     logger.info("Call completed", extra=data.model_dump())
 
+    # Covers calls whose websocket never connected (or never ran its cleanup).
+    if data.CallStatus in _TERMINAL_CALL_STATUSES:
+        session = customer_session_store.get_session_by_call_sid(data.CallSid)
+        if session:
+            await release_session(session.session_id)
+
     # Respond with 204 No Content equivalent -> FastAPI JSONResponse with empty body
     return JSONResponse(status_code=204, content={})
 
@@ -111,6 +157,7 @@ async def call_status_callback(request: Request) -> JSONResponse:
 async def conversation_relay_ws(
     websocket: WebSocket,
     session_id: str | None = None,
+    settings: Settings = Depends(get_settings),
 ):  # noqa: WPS217 – single exit acceptable here
     """WebSocket endpoint that Twilio Conversation Relay connects to.
 
@@ -130,12 +177,26 @@ async def conversation_relay_ws(
         raise HTTPException(status_code=400, detail="Session ID is invalid")
 
     await websocket.accept()
+    customer_session_store.mark_connected(session_id)
     logger.info(f"ConversationRelay session established: {websocket.client}")
 
+    turns = TurnManager(session_id)
+    coalescer = TextFrameCoalescer(
+        websocket.send_text,
+        max_bytes=settings.voice_coalesce_max_bytes,
+        max_delay_ms=settings.voice_coalesce_max_delay_ms,
+        flush_on_clause=settings.voice_coalesce_flush_on_clause,
+        interruptible=settings.voice_interruptible,
+        # A new prompt cancels the running turn, so its queued speech must
+        # give way to the next turn's text as well.
+        preemptible=True,
+    )
+    keypad = DtmfCodeBuffer(get_otp_service().store.code_length)
+
     try:
         while True:
             raw_msg = await websocket.receive_json()
-            logger.debug(f"Received raw message: {raw_msg}")
+            logger.debug(f"Received raw message: {redact_frame(raw_msg)}")
 
             inbound = CRBaseMessage(**raw_msg)
 
@@ -148,30 +209,52 @@ async def conversation_relay_ws(
                 prompt_msg = CRPromptMessage(**raw_msg)
                 logger.debug(f"Prompt received: {prompt_msg.voicePrompt}")
 
-                # Define callback to stream tokens as they arrive
-                async def stream_callback(token: str, is_last: bool = False):
-                    outbound_msg = CRTextMessage(
-                        token=token,
-                        last=is_last,
-                        interruptible=False,
-                        preemptible=False,
-                    )
+                # A new utterance supersedes whatever the agent is still saying.
+                await turns.cancel("new prompt")
 
-                    logger.debug(
-                        f"Streaming token: {outbound_msg.model_dump(mode='json', exclude_none=True)}"
-                    )
+                coalescer.begin_turn()
 
-                    await websocket.send_json(
-                        outbound_msg.model_dump(mode="json", exclude_none=True)
+                # Run the turn in the background so the reader keeps draining
+                # the socket and can react to barge-in.
+                turns.start(
+                    generate_response(
+                        prompt_msg.voicePrompt, session, coalescer.write
                     )
-
-                # Generate response with streaming callback
-                await generate_response(
-                    prompt_msg.voicePrompt, session, stream_callback
                 )
 
                 continue
 
+            elif inbound.type == ConversationRelayMessageTypeEnum.dtmf:
+                dtmf_msg = CRDtmfMessage(**raw_msg)
+
+                # Keys only mean something while the caller owes us an OTP; leave
+                # the agent's current turn alone otherwise.
+                if not await otp_outstanding(session):
+                    keypad.reset()
+                    logger.debug(f"Ignoring keypad input on {session_id}: no OTP outstanding")
+                    continue
+
+                code = keypad.feed(dtmf_msg.digit)
+                if code is None:
+                    continue
+
+                # A complete keyed code is the caller's next turn.
+                await turns.cancel("keypad code")
+                coalescer.begin_turn()
+                turns.start(verify_keypad_otp(code, session, coalescer.write))
+
+                continue
+
+            elif inbound.type == ConversationRelayMessageTypeEnum.interrupt:
+                interrupt_msg = CRInterruptMessage(**raw_msg)
+                logger.info(
+                    f"Caller interrupted after {interrupt_msg.durationUntilInterruptMs}ms: "
+                    f"{interrupt_msg.utteranceUntilInterrupt!r}"
+                )
+
+                await turns.cancel("interrupt")
+                coalescer.discard()
+
             elif inbound.type == ConversationRelayMessageTypeEnum.error:
                 error_msg = CRErrorMessage(**raw_msg)
                 logger.error(
@@ -194,14 +277,32 @@ async def conversation_relay_ws(
     except Exception as exc:  # pragma: no cover
         logger.exception("Error in ConversationRelay session: %s", exc)
     finally:
+        await turns.cancel("connection closed")
+        coalescer.discard()
+
+        if coalescer.turns:
+            logger.info(
+                f"Session {session_id} averaged {coalescer.frames_per_turn:.1f} "
+                f"text frames per turn over {coalescer.turns} turns"
+            )
+
+        await release_session(session_id)
+
         try:
             await websocket.close()
-            customer_session_store.delete_session(session_id)
             logger.debug("ConversationRelay websocket closed")
         except Exception as exc:
             logger.info(f"already closed ConversationRelay websocket: {exc}")
 
 
+async def release_session(session_id: str) -> None:
+    """Free everything held for a finished call: session, warm-up and checkpoints."""
+
+    customer_session_store.delete_session(session_id)
+    conversation_warmer.discard(session_id)
+    await checkpointer.adelete_thread(session_id)
+
+
 async def generate_response(
     text: str, session: CustomerSession, stream_callback: Callable
 ):
@@ -211,79 +312,54 @@ async def generate_response(
     with calls to ElevenLabs (STT/TTS) and your favourite LLM to craft a response.
     """
 
-    try:
-        customer = customer_store.find_customer_by_phone_number(session.phone_number)
-
-        if not customer:
-            raise HTTPException(status_code=400, detail="Customer not found")
-
-        config: RunnableConfig = {
-            "configurable": {
-                "thread_id": session.session_id,
-                "recursion_limit": 10,
-            }
-        }
-
-        get_config = checkpointer.get(config)
-
-        if get_config is None:
-            logger.info(f"No config found for thread {session.session_id}, creating new state")
-            initial_state = State(
-                active_node="",
-                messages=[HumanMessage(content=text)],
-                conversation_channel="voice",
-                welcome_message="Welcome to the Appollo Clinic. How can I help you today?",
-                customer=customer,
-                agent_branding=AgentBranding(
-                    name="Amelia",
-                    persona="Helpful and courteous",
-                    tone="Helpful and Casual",
-                ),
-                authentication=AuthenticationState(
-                    is_authorized=False,
-                    otp_sent=False,
-                ),
-            )
+    # A superseded turn may still be unwinding; never run two on one thread.
+    async with customer_session_store.turn_lock(session.session_id):
+        try:
+            config = thread_config(session.session_id)
 
-            response = ""
+            # The inbound webhook usually seeded this thread already; in that case
+            # there is nothing to look up before the graph starts streaming.
+            warm_context = await conversation_warmer.claim(session.session_id)
+            checkpoint = None if warm_context else await checkpointer.aget(config)
 
-            async for token, metadata in appointment_agent.astream(
-                initial_state.model_dump(), config=config, stream_mode="messages"
-            ):
-                # Pretty-print the streamed LLM token and its accompanying metadata for easier debugging
-                logger.debug(f"Token:\n {pformat(token, indent=2)}")
-                logger.trace(f"Metadata:\n {pformat(metadata)}")
+            if warm_context is not None:
+                get_caller_trust().record_first_turn(warm_context.authorized)
 
-                if isinstance(token, AIMessageChunk) and isinstance(token.content, str):
-                    response += token.content
-                    await stream_callback(token.content, False)
+            if warm_context is None and checkpoint is None:
+                logger.info(f"No config found for thread {session.session_id}, creating new state")
+                conversation_warmer.record_cold_start(session.session_id)
 
-                # if (
-                #     isinstance(token, AIMessageChunk)
-                #     and isinstance(token.content, list)
-                #     and len(token.content) > 0
-                # ):
-                #     if (
-                #         isinstance(token.content[0], dict)
-                #         and token.content[0]["type"] == "text"
-                #     ):
+                customer = await get_repositories().customers.get_by_phone(session.phone_number)
 
-                #         token_text = token.content[0]["text"]
-                #         response += token_text
+                if not customer:
+                    raise HTTPException(status_code=400, detail="Customer not found")
 
-                #         # Call the stream_callback for each new token
-                #         await stream_callback(token_text, False)
+                authorized = is_trusted_caller(session, customer)
+                get_caller_trust().record_first_turn(authorized)
+                initial_state = build_initial_state(customer, session.channel, authorized=authorized)
+                initial_state.messages = [HumanMessage(content=text)]
 
-            # Call the stream_callback to indicate end of stream
-            logger.debug(f"Full response generated {response}")
-            await stream_callback("", True)
+                graph_input: Dict[str, Any] = initial_state.model_dump()
+
+            else:
+                logger.info(f"Config found for thread {session.session_id}, resuming state")
+
+                # A barge-in can cancel the turn after the model asked for tools but
+                # before they ran; close those calls so the history stays valid.
+                interrupted = (
+                    _close_interrupted_tool_calls(
+                        checkpoint["channel_values"].get("messages", [])
+                    )
+                    if checkpoint
+                    else []
+                )
+
+                graph_input = {"messages": [*interrupted, HumanMessage(content=text)]}
 
-        else:
-            logger.info(f"Config found for thread {session.session_id}, resuming state")
             response = ""
 
             async for token, metadata in appointment_agent.astream(
-                {"messages": text}, config=config, stream_mode="messages"
+                graph_input, config=config, stream_mode="messages"
             ):
                 # Pretty-print the streamed LLM token and its accompanying metadata for easier debugging
                 logger.debug(f"Token:\n {pformat(token, indent=2)}")
@@ -313,7 +389,113 @@ async def generate_response(
             logger.debug(f"Full response generated {response}")
             await stream_callback("", True)
 
-    except Exception as e:
-        logger.error(f"Error generating response: {e}")
+        except Exception as e:
+            logger.error(f"Error generating response: {e}")
+
+            raise e
+
+
+async def otp_outstanding(session: CustomerSession) -> bool:
+    """Whether the session's checkpoint has an OTP sent and not yet verified."""
+
+    values = (await appointment_agent.aget_state(thread_config(session.session_id))).values
+    if not values or "authentication" not in values:
+        return False
+
+    authentication = AuthenticationState.model_validate(values["authentication"])
+    return authentication.otp_sent and not authentication.is_authorized
+
+
+async def verify_keypad_otp(
+    code: str, session: CustomerSession, stream_callback: Callable
+) -> bool:
+    """Verify an OTP typed on the keypad and answer the caller, with no model call.
+
+    The outcome is written to the thread's checkpoint as the agent's own turn,
+    so the next prompt sees an ordinary history. Returns False, doing nothing,
+    when the thread has no OTP outstanding.
+    """
+
+    async with customer_session_store.turn_lock(session.session_id):
+        config = thread_config(session.session_id)
+        values = (await appointment_agent.aget_state(config)).values
+        if not values:
+            return False
+
+        state = State.model_validate(values)
+        authentication = state.authentication
+        if not authentication.otp_sent or authentication.is_authorized:
+            logger.debug(f"Ignoring keypad code on {session.session_id}: no OTP outstanding")
+            return False
+
+        started_at = time.perf_counter()
+        phone_number = state.customer.phone_number
+        result = get_otp_service().verify(phone_number, code)
+
+        if result.verified:
+            reply = VERIFIED_REPLY
+            authentication = authentication.model_copy(update={"is_authorized": True})
+            get_caller_trust().remember(phone_number, state.customer.id)
+        elif result.outcome == OtpVerification.INVALID:
+            reply = INVALID_REPLY.format(attempts=result.attempts_left)
+        else:
+            reply = RESEND_REPLY
+            authentication = authentication.model_copy(update={"otp_sent": False})
+            if result.outcome == OtpVerification.TOO_MANY_ATTEMPTS:
+                get_caller_trust().revoke(phone_number)
+
+        # Written as `appointment_node`, whose conditional edge ends the run on a
+        # plain AI message.
+        await appointment_agent.aupdate_state(
+            config,
+            {
+                "messages": [
+                    *_close_interrupted_tool_calls(state.messages),
+                    HumanMessage(content=KEYPAD_ENTRY_MESSAGE),
+                    AIMessage(content=reply),
+                ],
+                "authentication": authentication.model_dump(),
+                "active_node": "appointment_node",
+            },
+            as_node="appointment_node",
+        )
+
+        await stream_callback(reply, False)
+        await stream_callback("", True)
+
+        logger.info(
+            f"Keypad OTP on {session.session_id}: {result.outcome.value} "
+            f"in {(time.perf_counter() - started_at) * 1000:.1f}ms"
+        )
+        return True
+
+
+def _close_interrupted_tool_calls(messages: List[AnyMessage]) -> List[ToolMessage]:
+    """Return placeholder results for tool calls a cancelled turn never ran.
+
+    Anthropic rejects a history where an assistant `tool_use` is not followed by
+    its `tool_result`, so a turn cancelled between the model call and the tools
+    node would poison every later turn on the thread. The tools may already
+    have started, so the placeholder doesn't claim they didn't run.
+    """
 
-        raise e
+    if not messages:
+        return []
+
+    last_message = messages[-1]
+
+    if not isinstance(last_message, AIMessage) or not last_message.tool_calls:
+        return []
+
+    return [
+        ToolMessage(
+            content=(
+                "Interrupted by the caller; result unknown. "
+                "Re-check (e.g. list the appointments) before retrying."
+            ),
+            name=tool_call["name"],
+            tool_call_id=tool_call["id"],
+        )
+        for tool_call in last_message.tool_calls
+        if tool_call.get("id")
+    ]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Coroutine, Optional
+
+from src.lib.logger import logger
+
+
+"""Cancellable agent turns for a single ConversationRelay websocket.
+
+Each caller utterance is handled by its own asyncio task so the websocket reader
+loop keeps draining frames while the graph is streaming. When the caller barges
+in (an ``interrupt`` frame or a fresh ``prompt``) the in-flight task is cancelled,
+which aborts the running graph step and stops any further outbound frames.
+"""
+
+
+class TurnManager:
+    """Owns the (at most one) in-flight agent turn for a websocket connection."""
+
+    def __init__(self, session_id: str, cancel_timeout: float = 0.05) -> None:
+        self.session_id = session_id
+        # How long `cancel` waits for the task to unwind before moving on.
+        self.cancel_timeout = cancel_timeout
+        self._task: Optional[asyncio.Task[Any]] = None
+        self._turn_count = 0
+        self._cancelled_count = 0
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+
+    @property
+    def is_active(self) -> bool:
+        """Return True while a turn is still running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def cancelled_count(self) -> int:
+        """Number of turns cancelled by barge-in on this connection."""
+        return self._cancelled_count
+
+    def start(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task[Any]:
+        """Schedule `coro` as the current turn.
+
+        Callers must `cancel()` any running turn first; starting a turn while
+        another one is active is a programming error.
+        """
+        if self.is_active:
+            coro.close()
+            raise RuntimeError(
+                f"Turn already in flight for session {self.session_id}"
+            )
+
+        self._turn_count += 1
+        task = asyncio.create_task(
+            coro, name=f"turn-{self.session_id}-{self._turn_count}"
+        )
+        task.add_done_callback(self._on_done)
+        self._task = task
+        return task
+
+    async def cancel(self, reason: str) -> bool:
+        """Cancel the in-flight turn, if any. Returns True if one was cancelled."""
+        task = self._task
+        self._task = None
+
+        if task is None or task.done():
+            return False
+
+        task.cancel()
+        self._cancelled_count += 1
+
+        # Give the task a moment to unwind so no frame is written after we return.
+        await asyncio.wait({task}, timeout=self.cancel_timeout)
+
+        logger.info(
+            f"Cancelled in-flight turn for session {self.session_id} ({reason})"
+        )
+        return True
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+
+    def _on_done(self, task: asyncio.Task[Any]) -> None:
+        if task.cancelled():
+            return
+
+        exc = task.exception()
+        if exc is not None:
+            logger.opt(exception=exc).error(
+                f"Agent turn failed for session {self.session_id}: {exc}"
+            )
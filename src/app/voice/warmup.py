@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import START
+
+from src.agents.appointment_agent.agent import appointment_agent
+from src.agents.state import AgentBranding, AuthenticationState, State
+from src.app.config import get_settings
+from src.core.otp import get_caller_trust
+from src.core.repository import get_repositories
+from src.lib.logger import logger
+from src.mock.customer import Customer
+from src.mock.customer_sessions import CustomerSession
+
+
+"""Background conversation warm-up started from the inbound voice webhook.
+
+Twilio fetches our TwiML, dials the caller into ConversationRelay and only then
+opens the websocket, so there is a window of a few hundred milliseconds in which
+nothing is happening for the call. `ConversationWarmer` uses that window to do
+the work the first `prompt` would otherwise pay for on the caller's critical
+path: resolving the customer and seeding the thread checkpoint with the initial
+`State` (already authorized for a recently verified caller).
+"""
+
+WELCOME_MESSAGE = "Welcome to the Appollo Clinic. How can I help you today?"
+
+
+def build_initial_state(
+    customer: Customer, channel: str = "voice", authorized: bool = False
+) -> State:
+    """Return the state every new conversation starts from.
+
+    `authorized` starts the conversation past OTP; see `is_trusted_caller`.
+    """
+
+    return State(
+        active_node="",
+        messages=[],
+        conversation_channel=channel,
+        welcome_message=WELCOME_MESSAGE,
+        customer=customer,
+        agent_branding=AgentBranding(
+            name="Amelia",
+            persona="Helpful and courteous",
+            tone="Helpful and Casual",
+        ),
+        authentication=AuthenticationState(
+            is_authorized=authorized,
+            otp_sent=False,
+        ),
+    )
+
+
+def is_trusted_caller(session: CustomerSession, customer: Customer) -> bool:
+    """Whether the caller verified recently enough for this clinic to skip OTP."""
+
+    trusted = get_caller_trust().is_trusted(
+        session.phone_number, customer.id, get_settings().clinic_id
+    )
+    if trusted:
+        logger.info(f"Caller {session.phone_number} recently verified, skipping OTP")
+    return trusted
+
+
+def thread_config(session_id: str) -> RunnableConfig:
+    """Graph config for the checkpoint thread that belongs to a session."""
+
+    return {
+        "configurable": {
+            "thread_id": session_id,
+            "recursion_limit": 10,
+        }
+    }
+
+
+@dataclass
+class WarmContext:
+    """Everything the warm-up resolved for one session."""
+
+    session_id: str
+    customer: Customer
+    # Whether the seeded state starts past OTP.
+    authorized: bool = False
+    warmed_in_ms: float = 0.0
+
+
+class ConversationWarmer:
+    """Tracks one background warm-up task per session_id."""
+
+    def __init__(self, ttl_seconds: float = 300.0, claim_timeout: float = 2.0) -> None:
+        # Warm-ups whose websocket never arrived are dropped after `ttl_seconds`.
+        self.ttl_seconds = ttl_seconds
+        # How long the first turn waits for a warm-up that is still running.
+        self.claim_timeout = claim_timeout
+        self._tasks: Dict[str, tuple[float, asyncio.Task[Optional[WarmContext]]]] = {}
+
+        self.warm_hits = 0
+        self.cold_starts = 0
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+
+    def start(self, session: CustomerSession) -> None:
+        """Kick off the warm-up for `session` without waiting for it."""
+        self._prune()
+
+        task = asyncio.create_task(
+            self._warm(session), name=f"warmup-{session.session_id}"
+        )
+        task.add_done_callback(self._on_warm_done)
+        self._tasks[session.session_id] = (time.monotonic(), task)
+
+    async def claim(self, session_id: str) -> Optional[WarmContext]:
+        """Return the warmed context for a session's first turn, if any.
+
+        The context is handed out once; later turns already have a checkpoint.
+        """
+        entry = self._tasks.pop(session_id, None)
+        if entry is None:
+            return None
+
+        _, task = entry
+        try:
+            # Shielded: a timeout must not cancel the warm-up half way through
+            # seeding the checkpoint; it finishes in the background instead.
+            context = await asyncio.wait_for(asyncio.shield(task), timeout=self.claim_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up for session {session_id} timed out")
+            return None
+        except Exception:
+            # Already logged by `_on_warm_done`.
+            return None
+
+        if context is not None:
+            self.warm_hits += 1
+            logger.info(
+                f"Warm start for session {session_id} "
+                f"(warmed in {context.warmed_in_ms:.1f}ms, "
+                f"warm={self.warm_hits}, cold={self.cold_starts})"
+            )
+
+        return context
+
+    def record_cold_start(self, session_id: str) -> None:
+        """Count a first turn that had to build its state inline."""
+        self.cold_starts += 1
+        logger.info(
+            f"Cold start for session {session_id} "
+            f"(warm={self.warm_hits}, cold={self.cold_starts})"
+        )
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session's warm-up (e.g. when its websocket closes)."""
+        entry = self._tasks.pop(session_id, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+
+    async def _warm(self, session: CustomerSession) -> Optional[WarmContext]:
+        started_at = time.perf_counter()
+
+        customer = await get_repositories().customers.get_by_phone(session.phone_number)
+        if customer is None:
+            logger.info(f"Warm-up skipped, no customer for {session.phone_number}")
+            return None
+
+        authorized = is_trusted_caller(session, customer)
+        initial_state = build_initial_state(customer, session.channel, authorized=authorized)
+
+        # Seed the thread so the first prompt resumes instead of building state.
+        await appointment_agent.aupdate_state(
+            thread_config(session.session_id),
+            initial_state.model_dump(),
+            as_node=START,
+        )
+
+        context = WarmContext(
+            session_id=session.session_id,
+            customer=customer,
+            authorized=authorized,
+            warmed_in_ms=(time.perf_counter() - started_at) * 1000,
+        )
+        logger.debug(f"Warmed session {session.session_id} in {context.warmed_in_ms:.1f}ms")
+        return context
+
+    @staticmethod
+    def _on_warm_done(task: asyncio.Task[Optional[WarmContext]]) -> None:
+        # Retrieves the exception even when the warm-up is never claimed.
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"{task.get_name()} failed: {task.exception()!r}")
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [
+            session_id
+            for session_id, (created_at, _) in self._tasks.items()
+            if created_at < cutoff
+        ]
+        for session_id in expired:
+            self.discard(session_id)
+
+
+conversation_warmer = ConversationWarmer()
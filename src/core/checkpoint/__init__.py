@@ -0,0 +1,35 @@
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from .bounded import BoundedMemorySaver, CheckpointStoreStats
+from .delta import CodecStats, DeltaCodec
+from .sqlite import SqliteCheckpointSaver
+
+"""Checkpointer selection for the agent graphs (`CHECKPOINT_BACKEND`)."""
+
+
+def create_checkpointer(
+    backend: str = "memory",
+    path: str = "",
+    *,
+    ttl_seconds: float = 1800.0,
+    max_bytes: int = 256 * 1024 * 1024,
+) -> BaseCheckpointSaver:
+    """Build the checkpointer for `backend` (`memory` or `sqlite`).
+
+    `ttl_seconds` and `max_bytes` bound the in-memory store only.
+    """
+    if backend == "memory":
+        return BoundedMemorySaver(ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+    if backend == "sqlite":
+        return SqliteCheckpointSaver(path)
+    raise ValueError(f"Unknown checkpoint backend: {backend!r}")
+
+
+__all__ = [
+    "BoundedMemorySaver",
+    "CheckpointStoreStats",
+    "CodecStats",
+    "DeltaCodec",
+    "SqliteCheckpointSaver",
+    "create_checkpointer",
+]
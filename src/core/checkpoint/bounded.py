@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src.lib.logger import logger
+
+from .delta import DeltaCodec
+
+
+"""Bounded in-memory checkpointer.
+
+`MemorySaver` keeps every thread it has seen until the process exits. This store
+tracks the serialized size of each thread and evicts whole threads in
+least-recently-used order once a thread has been idle for `ttl_seconds` or once
+the resident total exceeds `max_bytes`. Every read and write counts as an access.
+
+Channel blobs go through `DeltaCodec`, so `messages` versions hold only the
+appended messages and large blobs are compressed. Sizes are counted after
+encoding.
+
+The router also deletes a call's thread when its session ends, so eviction is
+only the safety net for calls that never reach that cleanup.
+"""
+
+
+@dataclass
+class _ThreadUsage:
+    size: int = 0
+    last_access: float = 0.0
+    write_keys: Set[Tuple[str, str, str]] = field(default_factory=set)
+    blob_keys: Set[Tuple[str, str, str, Any]] = field(default_factory=set)
+
+
+@dataclass
+class CheckpointStoreStats:
+    """Resident-size gauges and eviction counters."""
+
+    threads: int
+    resident_bytes: int
+    max_bytes: int
+    ttl_seconds: float
+    evicted_idle: int
+    evicted_memory: int
+    deleted: int
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """`InMemorySaver` with idle-TTL and total-size limits and LRU eviction."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 1800.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.codec = DeltaCodec(self.serde)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        # thread_id -> usage, least recently used first
+        self._usage: "OrderedDict[str, _ThreadUsage]" = OrderedDict()
+        self._resident_bytes = 0
+
+        self.evicted_idle = 0
+        self.evicted_memory = 0
+        self.deleted = 0
+
+    # ---------------------------------------------------------------------
+    # BaseCheckpointSaver overrides
+    # ---------------------------------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            # `storage` is a defaultdict; don't let a lookup create an entry.
+            if thread_id not in self.storage:
+                return None
+            usage = self._touch(thread_id)
+            checkpoint_tuple = super().get_tuple(config)
+
+            if checkpoint_tuple is not None:
+                # The read may have created an empty `writes` entry; track it too.
+                configurable = checkpoint_tuple.config["configurable"]
+                usage.write_keys.add(
+                    (
+                        thread_id,
+                        configurable.get("checkpoint_ns", ""),
+                        configurable["checkpoint_id"],
+                    )
+                )
+            return checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        with self._lock:
+            usage = self._touch(thread_id)
+
+            blob_keys = [(thread_id, checkpoint_ns, k, v) for k, v in new_versions.items()]
+            replaced = sum(_typed_size(self.blobs[k]) for k in blob_keys if k in self.blobs)
+
+            c = checkpoint.copy()
+            values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+            for key in blob_keys:
+                _, _, channel, version = key
+                self.blobs[key] = (
+                    self.codec.encode(thread_id, checkpoint_ns, channel, version, values[channel])
+                    if channel in values
+                    else ("empty", b"")
+                )
+
+            serialized = self.serde.dumps_typed(c)
+            serialized_metadata = self.serde.dumps_typed(
+                get_checkpoint_metadata(config, metadata)
+            )
+            self.storage[thread_id][checkpoint_ns][checkpoint["id"]] = (
+                serialized,
+                serialized_metadata,
+                config["configurable"].get("checkpoint_id"),  # parent
+            )
+
+            added = _typed_size(serialized) + _typed_size(serialized_metadata)
+            added += sum(_typed_size(self.blobs[k]) for k in blob_keys) - replaced
+            usage.blob_keys.update(blob_keys)
+
+            self._grow(usage, added)
+            self._evict(keep=thread_id)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        outer_key = (
+            thread_id,
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+        )
+
+        with self._lock:
+            usage = self._touch(thread_id)
+            before = self._writes_size(outer_key)
+
+            super().put_writes(config, writes, task_id, task_path)
+
+            usage.write_keys.add(outer_key)
+            self._grow(usage, self._writes_size(outer_key) - before)
+            self._evict(keep=thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            if self._drop(thread_id):
+                self.deleted += 1
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> Dict[str, Any]:
+        channel_values: Dict[str, Any] = {}
+        for channel, version in versions.items():
+            typed = self.blobs.get((thread_id, checkpoint_ns, channel, version))
+            if typed is None or typed[0] == "empty":
+                continue
+            channel_values[channel] = self.codec.decode(
+                thread_id,
+                checkpoint_ns,
+                channel,
+                version,
+                typed,
+                lambda base, channel=channel: self.blobs.get(
+                    (thread_id, checkpoint_ns, channel, base)
+                ),
+            )
+        return channel_values
+
+    # ---------------------------------------------------------------------
+    # Gauges
+    # ---------------------------------------------------------------------
+
+    @property
+    def resident_bytes(self) -> int:
+        return self._resident_bytes
+
+    def stats(self) -> CheckpointStoreStats:
+        """Current gauges, after expiring idle threads."""
+        with self._lock:
+            self._evict()
+            return CheckpointStoreStats(
+                threads=len(self._usage),
+                resident_bytes=self._resident_bytes,
+                max_bytes=self.max_bytes,
+                ttl_seconds=self.ttl_seconds,
+                evicted_idle=self.evicted_idle,
+                evicted_memory=self.evicted_memory,
+                deleted=self.deleted,
+            )
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+
+    def _touch(self, thread_id: str) -> _ThreadUsage:
+        usage = self._usage.get(thread_id)
+        if usage is None:
+            usage = self._usage[thread_id] = _ThreadUsage()
+        else:
+            self._usage.move_to_end(thread_id)
+        usage.last_access = time.monotonic()
+        return usage
+
+    def _grow(self, usage: _ThreadUsage, delta: int) -> None:
+        usage.size += delta
+        self._resident_bytes += delta
+
+    def _writes_size(self, outer_key: Tuple[str, str, str]) -> int:
+        pending = self.writes.get(outer_key)
+        if not pending:
+            return 0
+        return sum(_typed_size(value) for _, _, value, _ in pending.values())
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drop idle threads, then least recently used ones until under `max_bytes`."""
+        deadline = time.monotonic() - self.ttl_seconds
+
+        while self._usage:
+            thread_id, usage = next(iter(self._usage.items()))
+            if usage.last_access > deadline or thread_id == keep:
+                break
+            self._drop(thread_id)
+            self.evicted_idle += 1
+
+        while self._resident_bytes > self.max_bytes and len(self._usage) > 1:
+            thread_id = next(iter(self._usage))
+            if thread_id == keep:
+                break
+            logger.warning(
+                f"Checkpoint store over {self.max_bytes} bytes, evicting thread {thread_id}"
+            )
+            self._drop(thread_id)
+            self.evicted_memory += 1
+
+    def _drop(self, thread_id: str) -> bool:
+        usage = self._usage.pop(thread_id, None)
+        self.storage.pop(thread_id, None)
+        self.codec.forget(thread_id)
+        if usage is None:
+            return False
+
+        for key in usage.write_keys:
+            self.writes.pop(key, None)
+        for key in usage.blob_keys:
+            self.blobs.pop(key, None)
+
+        self._resident_bytes -= usage.size
+        return True
+
+
+def _typed_size(value: Tuple[str, bytes]) -> int:
+    return len(value[1])
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+
+"""Delta encoding and compression for checkpoint channel blobs.
+
+LangGraph already writes only the channels that changed in a step, but a list
+channel such as `messages` is written whole every time, so a call's checkpoint
+storage grows quadratically with its length. `DeltaCodec` remembers the last
+list it wrote per (thread, namespace, channel). When the next version starts
+with exactly the same message objects, it stores only the appended tail plus a
+pointer to the base version. Anything else (a removed or replaced message, an
+unknown base after a restart, or a chain longer than `max_chain`) is written as
+a full snapshot.
+
+Blobs larger than `compress_min_bytes` are zlib-compressed at level 1.
+
+The encoding lives in the blob's type tag, so untagged blobs written by plain
+`MemorySaver` still decode:
+
+    zlib/<type>                  compressed payload
+    delta/<base version>/<type>  list tail to append to the base version's value
+
+The full value is rebuilt on read by walking the chain back to a snapshot.
+Rebuilding is eager: LangGraph turns every channel value of a checkpoint into a
+channel as soon as it resumes a thread, so deferring the decode would only move
+the same work.
+"""
+
+Typed = Tuple[str, bytes]
+# Loads the stored blob of another version of the same channel.
+BlobLoader = Callable[[str], Optional[Typed]]
+
+_ZLIB = "zlib/"
+_DELTA = "delta/"
+
+
+@dataclass
+class _LastWrite:
+    version: str
+    items: List[Any]
+    chain: int
+
+
+@dataclass
+class CodecStats:
+    """Bytes before and after encoding, for sizing the store."""
+
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+    snapshots: int = 0
+    deltas: int = 0
+
+
+class DeltaCodec:
+    """Encode list channels as appends to their previous version and compress large blobs."""
+
+    def __init__(
+        self,
+        serde: SerializerProtocol,
+        *,
+        compress_min_bytes: int = 1024,
+        max_chain: int = 32,
+        max_tracked: int = 10_000,
+    ) -> None:
+        self.serde = serde
+        self.compress_min_bytes = compress_min_bytes
+        self.max_chain = max_chain
+        self.max_tracked = max_tracked
+        self.stats = CodecStats()
+
+        self._lock = threading.Lock()
+        # (thread_id, checkpoint_ns, channel) -> last list written for it
+        self._last: "OrderedDict[Tuple[str, str, str], _LastWrite]" = OrderedDict()
+
+    def encode(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: Any, value: Any
+    ) -> Typed:
+        """Serialize `value` as the blob for `version` of `channel`."""
+        key = (thread_id, checkpoint_ns, channel)
+        version = str(version)
+
+        with self._lock:
+            last = self._last.get(key)
+            tail = _appended(last.items, value) if last else None
+
+            if tail is not None and last.chain < self.max_chain:
+                type_, blob = self.serde.dumps_typed(tail)
+                type_ = f"{_DELTA}{last.version}/{type_}"
+                chain = last.chain + 1
+                self.stats.deltas += 1
+            else:
+                type_, blob = self.serde.dumps_typed(value)
+                chain = 0
+                self.stats.snapshots += 1
+
+            if isinstance(value, list):
+                self._remember(key, _LastWrite(version, value, chain))
+            else:
+                self._last.pop(key, None)
+
+        self.stats.raw_bytes += len(blob)
+        if len(blob) >= self.compress_min_bytes:
+            type_, blob = _ZLIB + type_, zlib.compress(blob, 1)
+        self.stats.stored_bytes += len(blob)
+
+        return type_, blob
+
+    def decode(
+        self,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel: str,
+        version: Any,
+        typed: Typed,
+        load: BlobLoader,
+    ) -> Any:
+        """Rebuild the full value of a blob, loading delta bases through `load`.
+
+        A rebuilt list becomes the base for the channel's next write, so a graph
+        run that resumes from this checkpoint keeps writing deltas.
+        """
+        tails: List[List[Any]] = []
+
+        while True:
+            type_, blob = typed
+            if type_.startswith(_ZLIB):
+                type_, blob = type_[len(_ZLIB):], zlib.decompress(blob)
+
+            if not type_.startswith(_DELTA):
+                value = self.serde.loads_typed((type_, blob))
+                break
+
+            base, inner = type_[len(_DELTA):].split("/", 1)
+            tails.append(self.serde.loads_typed((inner, blob)))
+
+            base_typed = load(base)
+            if base_typed is None:
+                raise KeyError(f"Checkpoint blob version {base} is missing")
+            typed = base_typed
+
+        if tails:
+            value = list(value)
+            for tail in reversed(tails):
+                value.extend(tail)
+
+        if isinstance(value, list):
+            key = (thread_id, checkpoint_ns, channel)
+            with self._lock:
+                self._remember(key, _LastWrite(str(version), value, len(tails)))
+
+        return value
+
+    def forget(self, thread_id: str) -> None:
+        """Drop the write history of a thread (deleted, or whose last write failed).
+
+        `encode` takes each list it writes as the next delta base before the
+        blob is stored, so a failed write must be followed by this call.
+        """
+        with self._lock:
+            for key in [k for k in self._last if k[0] == thread_id]:
+                del self._last[key]
+
+    def _remember(self, key: Tuple[str, str, str], last: _LastWrite) -> None:
+        self._last[key] = last
+        self._last.move_to_end(key)
+        while len(self._last) > self.max_tracked:
+            self._last.popitem(last=False)
+
+
+def _appended(previous: List[Any], value: Any) -> Optional[List[Any]]:
+    """Items appended to `previous`, if `value` extends it with the same objects."""
+    if not isinstance(value, list) or len(value) < len(previous):
+        return None
+
+    for old, new in zip(previous, value):
+        if old is not new:
+            return None
+
+    return value[len(previous):]
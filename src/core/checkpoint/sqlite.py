@@ -0,0 +1,594 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+from src.lib.logger import logger
+
+from .delta import DeltaCodec
+
+
+"""SQLite-backed LangGraph checkpointer.
+
+Unlike `MemorySaver`, checkpoints survive a uvicorn reload or crash, and several
+worker processes on one host can share the same database file.
+
+* The database runs in WAL mode, so readers never block the writer.
+* Reads use a small pool of connections and run in worker threads, so the event
+  loop never blocks on disk.
+* Async writes go through a group-commit queue. Everything queued while the
+  previous commit was in flight (the `put_writes` of every task in a super-step,
+  the step's `put`, and concurrent threads) is committed in one transaction.
+
+Channel values are stored as per-version blobs, as in `MemorySaver`, so channels
+that did not change in a step are not rewritten. Blobs go through `DeltaCodec`,
+so a `messages` version stores only the messages appended since the previous one.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+_INSERT_CHECKPOINT = (
+    "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, "
+    "parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_BLOB = (
+    "INSERT OR IGNORE INTO blobs (thread_id, checkpoint_ns, channel, version, type, blob) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+# Regular writes are idempotent per (task, idx); special writes (errors,
+# interrupts) always replace.
+_INSERT_WRITE = (
+    "INSERT OR IGNORE INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, "
+    "idx, channel, type, value, task_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_REPLACE_WRITE = _INSERT_WRITE.replace("INSERT OR IGNORE", "INSERT OR REPLACE")
+
+_SELECT_CHECKPOINT = (
+    "SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata "
+    "FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+)
+
+# A batch is a list of (sql, rows) pairs run with executemany.
+Statements = List[Tuple[str, List[Tuple[Any, ...]]]]
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """File-backed checkpointer using SQLite in WAL mode."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        pool_size: int = 4,
+        max_batch: int = 512,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.codec = DeltaCodec(self.serde)
+        self.path = path
+        self.max_batch = max_batch
+
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._write_conn = self._connect()
+        self._write_conn.executescript(_SCHEMA)
+        self._write_lock = threading.Lock()
+
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(pool_size):
+            self._readers.put(self._connect())
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task[None]] = None
+
+        self.commits = 0
+        self.batched_statements = 0
+
+    # ---------------------------------------------------------------------
+    # Sync API
+    # ---------------------------------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self._reader() as conn:
+            return self._get_tuple(conn, config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._reader() as conn:
+            tuples = self._list(conn, config, filter=filter, before=before, limit=limit)
+        yield from tuples
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        statements, next_config = self._put_statements(
+            config, checkpoint, metadata, new_versions
+        )
+        try:
+            self._execute(statements)
+        except Exception:
+            self._forget_deltas(statements)
+            raise
+        return next_config
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._execute(self._write_statements(config, writes, task_id, task_path))
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.codec.forget(thread_id)
+        self._execute(self._delete_statements(thread_id))
+
+    # ---------------------------------------------------------------------
+    # Async API
+    # ---------------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        def _load() -> List[CheckpointTuple]:
+            with self._reader() as conn:
+                return self._list(conn, config, filter=filter, before=before, limit=limit)
+
+        for checkpoint_tuple in await asyncio.to_thread(_load):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        statements, next_config = self._put_statements(
+            config, checkpoint, metadata, new_versions
+        )
+        await self._submit(statements)
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await self._submit(self._write_statements(config, writes, task_id, task_path))
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.codec.forget(thread_id)
+        await self._submit(self._delete_statements(thread_id))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        next_v = current_v + 1
+        next_h = random.random()
+        return f"{next_v:032}.{next_h:016}"
+
+    def close(self) -> None:
+        """Close all connections (the saver cannot be used afterwards)."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        with self._write_lock:
+            self._write_conn.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    # ---------------------------------------------------------------------
+    # Statement builders
+    # ---------------------------------------------------------------------
+
+    def _put_statements(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> Tuple[Statements, RunnableConfig]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")  # type: ignore[misc]
+
+        blob_rows = []
+        for channel, version in new_versions.items():
+            if channel in values:
+                type_, blob = self.codec.encode(
+                    thread_id, checkpoint_ns, channel, version, values[channel]
+                )
+            else:
+                type_, blob = "empty", b""
+            blob_rows.append(
+                (thread_id, checkpoint_ns, channel, str(version), type_, blob)
+            )
+
+        type_, serialized = self.serde.dumps_typed(c)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        checkpoint_row = (
+            thread_id,
+            checkpoint_ns,
+            checkpoint["id"],
+            config["configurable"].get("checkpoint_id"),
+            type_,
+            serialized,
+            metadata_type,
+            serialized_metadata,
+        )
+
+        statements: Statements = [(_INSERT_CHECKPOINT, [checkpoint_row])]
+        if blob_rows:
+            statements.append((_INSERT_BLOB, blob_rows))
+
+        return statements, {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _write_statements(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str,
+    ) -> Statements:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    blob,
+                    task_path,
+                )
+            )
+
+        sql = _REPLACE_WRITE if all(w[0] in WRITES_IDX_MAP for w in writes) else _INSERT_WRITE
+        return [(sql, rows)] if rows else []
+
+    @staticmethod
+    def _delete_statements(thread_id: str) -> Statements:
+        return [
+            (f"DELETE FROM {table} WHERE thread_id = ?", [(thread_id,)])
+            for table in ("checkpoints", "blobs", "writes")
+        ]
+
+    # ---------------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------------
+
+    def _get_tuple(
+        self, conn: sqlite3.Connection, config: RunnableConfig
+    ) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        if checkpoint_id := get_checkpoint_id(config):
+            row = conn.execute(
+                _SELECT_CHECKPOINT + " AND checkpoint_id = ?",
+                (thread_id, checkpoint_ns, checkpoint_id),
+            ).fetchone()
+        else:
+            row = conn.execute(
+                _SELECT_CHECKPOINT + " ORDER BY checkpoint_id DESC LIMIT 1",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return self._load_tuple(conn, thread_id, checkpoint_ns, row)
+
+    def _list(
+        self,
+        conn: sqlite3.Connection,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]],
+        before: Optional[RunnableConfig],
+        limit: Optional[int],
+    ) -> List[CheckpointTuple]:
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = conn.execute(
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            f"type, checkpoint, metadata_type, metadata FROM checkpoints {where} "
+            "ORDER BY checkpoint_id DESC",
+            params,
+        )
+
+        results: List[CheckpointTuple] = []
+        for thread_id, checkpoint_ns, *row in rows:
+            if filter:
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if not all(metadata.get(k) == v for k, v in filter.items()):
+                    continue
+
+            results.append(self._load_tuple(conn, thread_id, checkpoint_ns, tuple(row)))
+            if limit is not None and len(results) >= limit:
+                break
+
+        return results
+
+    def _load_tuple(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        row: Tuple[Any, ...],
+    ) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, blob, metadata_type, metadata = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, blob))
+
+        writes = conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(
+                    conn, thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+        )
+
+    def _load_blobs(
+        self,
+        conn: sqlite3.Connection,
+        thread_id: str,
+        checkpoint_ns: str,
+        versions: ChannelVersions,
+    ) -> Dict[str, Any]:
+        if not versions:
+            return {}
+
+        # One round trip for all channels of the checkpoint.
+        match = " OR ".join("(channel = ? AND version = ?)" for _ in versions)
+        params: List[Any] = [thread_id, checkpoint_ns]
+        for channel, version in versions.items():
+            params.extend((channel, str(version)))
+
+        rows = conn.execute(
+            "SELECT channel, version, type, blob FROM blobs "
+            f"WHERE thread_id = ? AND checkpoint_ns = ? AND ({match})",
+            params,
+        )
+        def load_base(channel: str, version: str) -> Optional[Tuple[str, bytes]]:
+            return conn.execute(
+                "SELECT type, blob FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+                "AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, version),
+            ).fetchone()
+
+        return {
+            channel: self.codec.decode(
+                thread_id,
+                checkpoint_ns,
+                channel,
+                version,
+                (type_, blob),
+                lambda base, channel=channel: load_base(channel, base),
+            )
+            for channel, version, type_, blob in rows
+            if type_ != "empty"
+        }
+
+    # ---------------------------------------------------------------------
+    # Connections and the group-commit writer
+    # ---------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=5.0
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _execute(self, statements: Statements) -> None:
+        if not statements:
+            return
+
+        with self._write_lock:
+            conn = self._write_conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, rows in statements:
+                    conn.executemany(sql, rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        self.commits += 1
+        self.batched_statements += len(statements)
+
+    def _forget_deltas(self, statements: Statements) -> None:
+        # The codec took these blobs as delta bases when encoding them; they were
+        # never committed, so the next write of each thread must be a snapshot.
+        for thread_id in {row[0] for _, rows in statements for row in rows}:
+            self.codec.forget(thread_id)
+
+    async def _submit(self, statements: Statements) -> None:
+        if not statements:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._writer_task is None or self._writer_task.done():
+            self._queue = asyncio.Queue()
+            self._writer_task = loop.create_task(self._writer_loop(self._queue))
+
+        future: asyncio.Future[None] = loop.create_future()
+        self._queue.put_nowait((statements, future))
+        await future
+
+    async def _writer_loop(self, pending: asyncio.Queue) -> None:
+        while True:
+            batch = [await pending.get()]
+            while len(batch) < self.max_batch and not pending.empty():
+                batch.append(pending.get_nowait())
+
+            statements: Statements = [s for item, _ in batch for s in item]
+            try:
+                await asyncio.to_thread(self._execute, statements)
+            except Exception as exc:
+                logger.error(f"Checkpoint batch of {len(batch)} failed: {exc}")
+                self._forget_deltas(statements)
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
@@ -0,0 +1,3 @@
+from .registry import LLMRegistry, PoolStats, llm_registry
+
+__all__ = ["LLMRegistry", "PoolStats", "llm_registry"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.messages import BaseMessage, SystemMessage
+
+from src.lib.logger import logger
+
+
+"""Helpers for Anthropic prompt caching.
+
+Anthropic caches the request prefix (tools, then system, then messages) up to a
+`cache_control` breakpoint, but only if that prefix is byte-identical between
+calls. System prompts are therefore split into a static part, which never
+interpolates anything, and a short dynamic suffix with the per-call values
+(branding, channel, active node, current time). The breakpoint sits on the
+static block, so tool schemas plus the static instructions are served from cache.
+"""
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+
+@dataclass(frozen=True)
+class SystemPrompt:
+    """A system prompt split into a cacheable prefix and a per-call suffix."""
+
+    static: str
+    dynamic: str
+
+    def to_message(self, cache: bool = True) -> SystemMessage:
+        """Build the system message, with a cache breakpoint after the static prefix."""
+        if not cache:
+            return SystemMessage(content=str(self))
+
+        return SystemMessage(
+            content=[
+                {"type": "text", "text": self.static, "cache_control": _EPHEMERAL},
+                {"type": "text", "text": self.dynamic},
+            ]
+        )
+
+    def with_context(self, context: str) -> "SystemPrompt":
+        """Return a copy with `context` appended to the dynamic suffix."""
+        if not context:
+            return self
+        return SystemPrompt(static=self.static, dynamic=self.dynamic + context)
+
+    def __str__(self) -> str:
+        return self.static + self.dynamic
+
+
+def log_prompt_cache_usage(node: str, message: Any) -> None:
+    """Log cache read/write token counts reported for an LLM response."""
+    if not isinstance(message, BaseMessage):
+        return
+
+    usage = getattr(message, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+
+    logger.info(
+        f"[{node}] input_tokens={usage.get('input_tokens', 0)} "
+        f"cache_read={details.get('cache_read') or 0} "
+        f"cache_write={details.get('cache_creation') or 0}"
+    )
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import httpx
+from langchain.chat_models import init_chat_model
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+
+from src.core.prebuilt.types.llm_provider import LLMModel, LLMProvider
+from src.lib.logger import logger
+
+
+"""Process-wide registry of chat model clients and pre-bound runnables.
+
+Building a chat model, `bind_tools` and `with_structured_output` on every node
+invocation re-generates tool JSON schemas and, for Anthropic, a fresh SDK client
+with its own HTTP connection pool. The registry builds each combination once and
+hands out the same runnable afterwards.
+
+All Anthropic clients share one keep-alive `httpx` pool (sync and async), so a
+warm TLS connection opened by one node is reused by every other node.
+"""
+
+_NEW_CONNECTION_EVENT = "connection.connect_tcp.complete"
+_REQUEST_EVENT = "http11.send_request_headers.complete"
+_REQUEST_EVENT_H2 = "http2.send_request_headers.complete"
+
+
+@dataclass
+class PoolStats:
+    """Counters for the shared HTTP pool and the registry caches."""
+
+    requests: int = 0
+    new_connections: int = 0
+    clients_built: int = 0
+    runnables_built: int = 0
+    runnable_hits: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        """Requests that went out over an already-open keep-alive connection."""
+        return max(self.requests - self.new_connections, 0)
+
+
+ModelKey = Tuple[LLMProvider, LLMModel, Tuple[Tuple[str, Hashable], ...]]
+RunnableKey = Tuple[ModelKey, Tuple[str, ...], Optional[type], bool]
+
+
+class LLMRegistry:
+    """Caches chat models per (provider, model, params) and bound runnables per tool set."""
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 60.0,
+    ) -> None:
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._models: Dict[ModelKey, BaseChatModel] = {}
+        self._runnables: Dict[RunnableKey, Runnable] = {}
+        self._lock = threading.Lock()
+        self._http_client: Optional[httpx.Client] = None
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+
+        self.stats = PoolStats()
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+
+    def get(
+        self,
+        provider: LLMProvider,
+        model: LLMModel,
+        *,
+        tools: Optional[Sequence[BaseTool]] = None,
+        structured_output: Optional[type] = None,
+        include_raw: bool = False,
+        **params: Hashable,
+    ) -> Runnable:
+        """Return a cached runnable for the model, optionally bound to tools or a schema.
+
+        With `include_raw`, structured output returns ``{"raw", "parsed",
+        "parsing_error"}`` so callers can still read usage metadata.
+        """
+        model_key: ModelKey = (provider, model, tuple(sorted(params.items())))
+        tool_names = tuple(tool.name for tool in tools or ())
+        key: RunnableKey = (model_key, tool_names, structured_output, include_raw)
+
+        runnable = self._runnables.get(key)
+        if runnable is not None:
+            self.stats.runnable_hits += 1
+            return runnable
+
+        with self._lock:
+            runnable = self._runnables.get(key)
+            if runnable is not None:
+                self.stats.runnable_hits += 1
+                return runnable
+
+            llm = self._chat_model(model_key)
+
+            if structured_output is not None:
+                runnable = llm.with_structured_output(
+                    structured_output, include_raw=include_raw
+                )
+            elif tools:
+                runnable = llm.bind_tools(list(tools))
+            else:
+                runnable = llm
+
+            self._runnables[key] = runnable
+            self.stats.runnables_built += 1
+            logger.debug(
+                f"Built {model.value} runnable (tools={list(tool_names)}, "
+                f"schema={getattr(structured_output, '__name__', None)})"
+            )
+            return runnable
+
+    async def preconnect(self) -> None:
+        """Open a keep-alive connection per Anthropic endpoint so the first call skips TLS setup."""
+        base_urls = {
+            getattr(llm, "_client_params")["base_url"]
+            for (provider, _, _), llm in self._models.items()
+            if provider == LLMProvider.ANTHROPIC
+        }
+
+        for url in base_urls:
+            try:
+                await self.async_http_client.head(url)
+            except httpx.HTTPError as exc:
+                logger.warning(f"LLM preconnect to {url} failed: {exc}")
+
+    @property
+    def http_client(self) -> httpx.Client:
+        """Shared synchronous HTTP client used by every Anthropic client."""
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                limits=self._limits,
+                event_hooks={"request": [self._trace_request]},
+            )
+        return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        """Shared asynchronous HTTP client used by every Anthropic client."""
+        if self._async_http_client is None:
+            self._async_http_client = httpx.AsyncClient(
+                limits=self._limits,
+                event_hooks={"request": [self._atrace_request]},
+            )
+        return self._async_http_client
+
+    async def aclose(self) -> None:
+        """Close the shared connection pools (application shutdown)."""
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+            self._async_http_client = None
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+
+    def _chat_model(self, model_key: ModelKey) -> BaseChatModel:
+        llm = self._models.get(model_key)
+        if llm is not None:
+            return llm
+
+        provider, model, params = model_key
+        llm = init_chat_model(
+            model=model.value, model_provider=provider.value, **dict(params)
+        )
+
+        if provider == LLMProvider.ANTHROPIC:
+            self._share_anthropic_pool(llm)
+
+        self._models[model_key] = llm
+        self.stats.clients_built += 1
+        return llm
+
+    def _share_anthropic_pool(self, llm: BaseChatModel) -> None:
+        # ChatAnthropic lazily builds its SDK clients in cached properties and
+        # offers no `http_client` option, so pre-populate them with clients that
+        # ride on the shared pool.
+        import anthropic
+
+        client_params = getattr(llm, "_client_params")
+        llm.__dict__["_client"] = anthropic.Client(
+            **client_params, http_client=self.http_client
+        )
+        llm.__dict__["_async_client"] = anthropic.AsyncClient(
+            **client_params, http_client=self.async_http_client
+        )
+
+    def _on_trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == _NEW_CONNECTION_EVENT:
+            self.stats.new_connections += 1
+        elif event in (_REQUEST_EVENT, _REQUEST_EVENT_H2):
+            self.stats.requests += 1
+
+    def _trace_request(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self._on_trace
+
+    async def _atrace_request(self, request: httpx.Request) -> None:
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            self._on_trace(event, info)
+
+        request.extensions["trace"] = trace
+
+
+llm_registry = LLMRegistry()
@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+from src.app.config import get_settings
+
+from .rate_limit import TokenBucketLimiter
+from .service import OtpCheckResult, OtpSendResult, OtpService
+from .sms import LocalSmsSink, SmsDispatcher, SmsDispatcherStats, SmsSink
+from .store import OtpStore, OtpVerification
+from .trust import CallerTrustStats, VerifiedCallerCache
+
+"""OTP issuing, verification, SMS delivery and the verified-caller trust window."""
+
+
+@lru_cache
+def get_otp_service() -> OtpService:
+    settings = get_settings()
+    return OtpService(
+        store=OtpStore(
+            ttl_seconds=settings.otp_ttl_seconds,
+            max_attempts=settings.otp_max_attempts,
+        ),
+        limiter=TokenBucketLimiter(
+            capacity=settings.otp_send_burst,
+            refill_per_second=1.0 / settings.otp_send_refill_seconds,
+        ),
+        dispatcher=SmsDispatcher(LocalSmsSink(), workers=settings.sms_dispatcher_workers),
+    )
+
+
+@lru_cache
+def get_caller_trust() -> VerifiedCallerCache:
+    settings = get_settings()
+    return VerifiedCallerCache(
+        ttl_seconds=settings.caller_trust_ttl_seconds,
+        clinic_ttl_seconds=settings.caller_trust_clinic_ttl_seconds,
+        max_entries=settings.caller_trust_max_entries,
+    )
+
+
+__all__ = [
+    "CallerTrustStats",
+    "LocalSmsSink",
+    "OtpCheckResult",
+    "OtpSendResult",
+    "OtpService",
+    "OtpStore",
+    "OtpVerification",
+    "SmsDispatcher",
+    "SmsDispatcherStats",
+    "SmsSink",
+    "TokenBucketLimiter",
+    "VerifiedCallerCache",
+    "get_caller_trust",
+    "get_otp_service",
+]
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+"""Per-key token-bucket rate limiting.
+
+Each key gets a bucket of `capacity` tokens that refills continuously at
+`refill_per_second`. Buckets are created on first use and dropped once they
+have been idle long enough to be full again, since a full bucket is the same
+as no bucket.
+"""
+
+
+class TokenBucketLimiter:
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        *,
+        prune_every: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._prune_every = prune_every
+        self._clock = clock
+
+        # key -> [tokens, updated_at]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def try_acquire(self, key: str, tokens: float = 1.0) -> Optional[float]:
+        """Take `tokens` from `key`'s bucket.
+
+        Returns None if allowed, otherwise the seconds until enough tokens refill.
+        """
+        now = self._clock()
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.capacity, now]
+            else:
+                bucket[0] = min(
+                    self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second
+                )
+                bucket[1] = now
+
+            self._calls += 1
+            if self._calls % self._prune_every == 0:
+                self._prune(now)
+
+            if bucket[0] >= tokens:
+                bucket[0] -= tokens
+                return None
+            return (tokens - bucket[0]) / self.refill_per_second
+
+    def _prune(self, now: float) -> None:
+        full_after = self.capacity / self.refill_per_second
+        idle = [key for key, (_, updated_at) in self._buckets.items() if now - updated_at >= full_after]
+        for key in idle:
+            del self._buckets[key]
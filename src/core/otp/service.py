@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .rate_limit import TokenBucketLimiter
+from .sms import SmsDispatcher
+from .store import OtpStore, OtpVerification
+
+
+"""Issue and check one-time codes for a phone number.
+
+Sending is rate limited per number (token bucket) and hands the SMS to the
+dispatcher without awaiting delivery, so `send` costs the turn a hash and a
+queue put. Verification attempts are limited per code by the store.
+"""
+
+OTP_MESSAGE = "Your Appollo Clinic verification code is {code}. It expires in {minutes} minutes."
+
+
+@dataclass(frozen=True)
+class OtpSendResult:
+    sent: bool
+    # Seconds until another code may be sent, when `sent` is False.
+    retry_after: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class OtpCheckResult:
+    outcome: OtpVerification
+    attempts_left: int = 0
+
+    @property
+    def verified(self) -> bool:
+        return self.outcome == OtpVerification.VERIFIED
+
+
+class OtpService:
+    def __init__(self, store: OtpStore, limiter: TokenBucketLimiter, dispatcher: SmsDispatcher):
+        self.store = store
+        self.limiter = limiter
+        self.dispatcher = dispatcher
+
+    def send(self, phone_number: str) -> OtpSendResult:
+        retry_after = self.limiter.try_acquire(phone_number)
+        if retry_after is not None:
+            return OtpSendResult(sent=False, retry_after=retry_after)
+
+        code = self.store.issue(phone_number)
+        body = OTP_MESSAGE.format(code=code, minutes=max(1, int(self.store.ttl_seconds // 60)))
+        if not self.dispatcher.submit(phone_number, body):
+            self.store.revoke(phone_number)
+            return OtpSendResult(sent=False)
+
+        return OtpSendResult(sent=True)
+
+    def verify(self, phone_number: str, code: str) -> OtpCheckResult:
+        outcome, attempts_left = self.store.verify(phone_number, code)
+        return OtpCheckResult(outcome=outcome, attempts_left=attempts_left)
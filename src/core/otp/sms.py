@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+from src.lib.logger import logger
+
+
+"""Fire-and-forget SMS delivery off the conversation's critical path.
+
+`SmsDispatcher.submit` only enqueues; a few worker tasks drain the queue into
+an `SmsSink`. A slow or failing gateway therefore never adds latency to the
+turn that asked for the message. When the queue is full, new messages are
+dropped and counted rather than applying back-pressure to the graph; the
+caller can ask for another code.
+"""
+
+# Codes never reach the logs; they are only kept in `LocalSmsSink.sent`.
+_CODE_LIKE = re.compile(r"\b\d{4,8}\b")
+
+
+class SmsSink(ABC):
+    """Where messages are actually delivered (a gateway, or the local stand-in)."""
+
+    @abstractmethod
+    async def send(self, to: str, body: str) -> None: ...
+
+
+class LocalSmsSink(SmsSink):
+    """Stand-in gateway: logs each message (codes masked) and keeps the most recent ones."""
+
+    def __init__(self, keep: int = 1000):
+        self.sent: Deque[Tuple[str, str]] = deque(maxlen=keep)
+
+    async def send(self, to: str, body: str) -> None:
+        self.sent.append((to, body))
+        logger.debug(f"[sms → {_masked(to)}] {_CODE_LIKE.sub('[redacted]', body)}")
+
+    def last_to(self, to: str) -> Optional[str]:
+        """Body of the most recent message kept for `to`."""
+        for recipient, body in reversed(self.sent):
+            if recipient == to:
+                return body
+        return None
+
+
+@dataclass(frozen=True)
+class SmsDispatcherStats:
+    queued: int
+    delivered: int
+    failed: int
+    dropped: int
+
+
+class SmsDispatcher:
+    def __init__(self, sink: SmsSink, *, queue_size: int = 10_000, workers: int = 4):
+        self.sink = sink
+        self.queue_size = queue_size
+        self.workers = workers
+
+        self._queue: Optional[asyncio.Queue[Tuple[str, str]]] = None
+        self._tasks: List[asyncio.Task] = []
+
+        self._delivered = 0
+        self._failed = 0
+        self._dropped = 0
+
+    def submit(self, to: str, body: str) -> bool:
+        """Queue a message without waiting; False if it was dropped.
+
+        Must be called from the event loop; workers start on first use.
+        """
+        if self._queue is None:
+            self._start()
+
+        try:
+            self._queue.put_nowait((to, body))
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(f"SMS queue full, dropped message to {_masked(to)}")
+            return False
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued message has been handed to the sink."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        """Deliver what is queued, then stop the workers."""
+        if self._queue is None:
+            return
+
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    def stats(self) -> SmsDispatcherStats:
+        return SmsDispatcherStats(
+            queued=self._queue.qsize() if self._queue is not None else 0,
+            delivered=self._delivered,
+            failed=self._failed,
+            dropped=self._dropped,
+        )
+
+    def _start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.get_running_loop().create_task(self._worker(), name=f"sms-dispatcher-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            to, body = await queue.get()
+            try:
+                await self.sink.send(to, body)
+                self._delivered += 1
+            except Exception as exc:
+                self._failed += 1
+                logger.error(f"SMS to {_masked(to)} failed: {exc}")
+            finally:
+                queue.task_done()
+
+
+def _masked(to: str) -> str:
+    return f"...{to[-4:]}"
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Callable, Tuple
+
+
+"""One-time codes kept as keyed hashes with a TTL and an attempt limit.
+
+Only an HMAC of (phone number, code) is stored, under a key that lives in
+process memory, so a dump of the store doesn't reveal live codes. Every code
+has the same TTL, so insertion order is expiry order: expired entries are
+trimmed from the front of an OrderedDict on each issue, with no timer or heap.
+"""
+
+
+class OtpVerification(str, Enum):
+    VERIFIED = "verified"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    NOT_FOUND = "not_found"
+    TOO_MANY_ATTEMPTS = "too_many_attempts"
+
+
+class _PendingCode:
+    __slots__ = ("digest", "expires_at", "attempts")
+
+    def __init__(self, digest: bytes, expires_at: float):
+        self.digest = digest
+        self.expires_at = expires_at
+        self.attempts = 0
+
+
+class OtpStore:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 300.0,
+        max_attempts: int = 5,
+        code_length: int = 6,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max_attempts
+        self.code_length = code_length
+        self._clock = clock
+
+        self._key = secrets.token_bytes(32)
+        self._pending: "OrderedDict[str, _PendingCode]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def issue(self, phone_number: str) -> str:
+        """Generate a code for `phone_number`, replacing any pending one."""
+        code = f"{secrets.randbelow(10 ** self.code_length):0{self.code_length}d}"
+        now = self._clock()
+
+        with self._lock:
+            self._pending.pop(phone_number, None)
+            self._pending[phone_number] = _PendingCode(
+                self._digest(phone_number, code), now + self.ttl_seconds
+            )
+            self._purge_expired(now)
+
+        return code
+
+    def verify(self, phone_number: str, code: str) -> Tuple[OtpVerification, int]:
+        """Check `code`; returns the outcome and the attempts left for this code.
+
+        A verified, expired or exhausted code is removed, so it can't be reused.
+        """
+        digest = self._digest(phone_number, code.strip())
+        now = self._clock()
+
+        with self._lock:
+            pending = self._pending.get(phone_number)
+            if pending is None:
+                return OtpVerification.NOT_FOUND, 0
+
+            if pending.expires_at <= now:
+                del self._pending[phone_number]
+                return OtpVerification.EXPIRED, 0
+
+            if hmac.compare_digest(pending.digest, digest):
+                del self._pending[phone_number]
+                return OtpVerification.VERIFIED, 0
+
+            pending.attempts += 1
+            remaining = self.max_attempts - pending.attempts
+            if remaining <= 0:
+                del self._pending[phone_number]
+                return OtpVerification.TOO_MANY_ATTEMPTS, 0
+            return OtpVerification.INVALID, remaining
+
+    def has_pending(self, phone_number: str) -> bool:
+        pending = self._pending.get(phone_number)
+        return pending is not None and pending.expires_at > self._clock()
+
+    def revoke(self, phone_number: str) -> None:
+        with self._lock:
+            self._pending.pop(phone_number, None)
+
+    def _digest(self, phone_number: str, code: str) -> bytes:
+        return hmac.new(self._key, f"{phone_number}:{code}".encode(), hashlib.sha256).digest()
+
+    def _purge_expired(self, now: float) -> None:
+        while self._pending:
+            phone_number, oldest = next(iter(self._pending.items()))
+            if oldest.expires_at > now:
+                return
+            del self._pending[phone_number]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from src.utils.phone import try_normalize_phone_number
+
+
+"""Trust window for callers who recently passed OTP verification.
+
+A caller who verified a few minutes ago and calls back would otherwise repeat
+`send_otp`/`verify_otp`: an SMS and at least two model turns. When a call's
+initial state is seeded, `VerifiedCallerCache.is_trusted` is checked, and a
+hit starts the conversation already authorized. The call's first turn then
+reports whether it actually started authorized through `record_first_turn`;
+only those are counted, since a seeded call may never take a turn.
+
+Entries are keyed by (E.164 caller number, customer ID), so trust never moves
+to another customer on a shared number. The window is per clinic: each clinic's
+TTL is applied when trust is checked. Trust is opt-in: the default TTL is 0,
+which always requires OTP, and clinics enable it with their own TTL.
+"""
+
+_Key = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class CallerTrustStats:
+    trusted_callers: int
+    otp_round_trips_avoided: int
+    otp_required: int
+    revocations: int
+
+
+class VerifiedCallerCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 0.0,
+        clinic_ttl_seconds: Optional[Mapping[str, float]] = None,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.clinic_ttl_seconds: Dict[str, float] = dict(clinic_ttl_seconds or {})
+        self.max_entries = max_entries
+        self._clock = clock
+
+        # (phone, customer_id) -> verified_at, oldest first
+        self._verified: "OrderedDict[_Key, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._avoided = 0
+        self._required = 0
+        self._revocations = 0
+
+    def ttl_for(self, clinic_id: str) -> float:
+        return self.clinic_ttl_seconds.get(clinic_id, self.ttl_seconds)
+
+    def remember(self, phone_number: str, customer_id: str) -> None:
+        """Record a successful OTP verification."""
+        key = _key(phone_number, customer_id)
+        if key is None:
+            return
+
+        now = self._clock()
+        longest_ttl = max([self.ttl_seconds, *self.clinic_ttl_seconds.values()])
+
+        with self._lock:
+            self._verified.pop(key, None)
+            self._verified[key] = now
+
+            # Oldest first: drop what no clinic would trust any more, then cap the size.
+            while self._verified and (
+                len(self._verified) > self.max_entries
+                or now - next(iter(self._verified.values())) >= longest_ttl
+            ):
+                self._verified.popitem(last=False)
+
+    def is_trusted(self, phone_number: str, customer_id: str, clinic_id: str) -> bool:
+        """Whether this caller verified within `clinic_id`'s trust window."""
+        key = _key(phone_number, customer_id)
+        ttl = self.ttl_for(clinic_id)
+
+        with self._lock:
+            verified_at = self._verified.get(key) if key else None
+            return verified_at is not None and ttl > 0 and self._clock() - verified_at < ttl
+
+    def record_first_turn(self, authorized: bool) -> None:
+        """Count a call's first turn as an avoided OTP round trip or a required one."""
+        with self._lock:
+            if authorized:
+                self._avoided += 1
+            else:
+                self._required += 1
+
+    def revoke(self, phone_number: Optional[str] = None, customer_id: Optional[str] = None) -> int:
+        """Forget trust for a number, a customer, or one (number, customer) pair.
+
+        Returns how many entries were removed.
+        """
+        phone = try_normalize_phone_number(phone_number) if phone_number else None
+        if phone is None and customer_id is None:
+            return 0
+
+        with self._lock:
+            doomed = [
+                key
+                for key in self._verified
+                if (phone is None or key[0] == phone)
+                and (customer_id is None or key[1] == customer_id)
+            ]
+            for key in doomed:
+                del self._verified[key]
+            self._revocations += len(doomed)
+            return len(doomed)
+
+    def stats(self) -> CallerTrustStats:
+        with self._lock:
+            return CallerTrustStats(
+                trusted_callers=len(self._verified),
+                otp_round_trips_avoided=self._avoided,
+                otp_required=self._required,
+                revocations=self._revocations,
+            )
+
+
+def _key(phone_number: str, customer_id: str) -> Optional[_Key]:
+    phone = try_normalize_phone_number(phone_number)
+    return (phone, customer_id) if phone and customer_id else None
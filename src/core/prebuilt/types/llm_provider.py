@@ -16,4 +16,5 @@ class LLMModel(Enum):
     CLAUDE_3_5_SONNET_LATEST = "claude-3-5-sonnet-latest"
     CLAUDE_3_5_SONNET_20241022 = "claude-3-5-sonnet-20241022"
     CLAUDE_3_HAIKU_20240307 = "claude-3-haiku-20240307"
+    CLAUDE_SONNET_4_20250514 = "claude-sonnet-4-20250514"
     
\ No newline at end of file
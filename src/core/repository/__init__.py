@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+from src.app.config import get_settings
+from src.mock.customer import customer_store
+from src.mock.provider import providerStore
+
+from .base import AppointmentRepository, CustomerRepository
+from .cache import AppointmentCacheStats, CachedAppointmentRepository
+from .memory import InMemoryAppointmentRepository, InMemoryCustomerRepository
+from .sqlite import (
+    SqliteAppointmentRepository,
+    SqliteCustomerRepository,
+    SqlitePool,
+    open_sqlite_repositories,
+)
+
+"""Repository selection for the tools, router and warm-up (`REPOSITORY_BACKEND`)."""
+
+
+@dataclass(frozen=True)
+class Repositories:
+    appointments: AppointmentRepository
+    customers: CustomerRepository
+
+
+def create_repositories(
+    backend: str = "memory", path: str = "", *, cache_max_entries: int = 10_000
+) -> Repositories:
+    """Build the repositories for `backend` (`memory` or `sqlite`).
+
+    The memory backend wraps the process-wide mock stores. Appointment listings
+    are cached per customer unless `cache_max_entries` is 0.
+    """
+    appointments: AppointmentRepository
+    customers: CustomerRepository
+
+    if backend == "memory":
+        appointments = InMemoryAppointmentRepository(providerStore)
+        customers = InMemoryCustomerRepository(customer_store)
+    elif backend == "sqlite":
+        appointments, customers = open_sqlite_repositories(path)
+    else:
+        raise ValueError(f"Unknown repository backend: {backend!r}")
+
+    if cache_max_entries > 0:
+        appointments = CachedAppointmentRepository(appointments, cache_max_entries)
+    return Repositories(appointments=appointments, customers=customers)
+
+
+@lru_cache
+def get_repositories() -> Repositories:
+    settings = get_settings()
+    return create_repositories(
+        settings.repository_backend,
+        settings.repository_sqlite_path,
+        cache_max_entries=settings.appointment_cache_max_entries,
+    )
+
+
+__all__ = [
+    "AppointmentCacheStats",
+    "AppointmentRepository",
+    "CachedAppointmentRepository",
+    "CustomerRepository",
+    "InMemoryAppointmentRepository",
+    "InMemoryCustomerRepository",
+    "Repositories",
+    "SqliteAppointmentRepository",
+    "SqliteCustomerRepository",
+    "SqlitePool",
+    "create_repositories",
+    "get_repositories",
+]
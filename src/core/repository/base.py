@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from src.mock.availability import Slot
+from src.mock.customer import Customer
+from src.mock.provider import Appointment, AppointmentStatus
+
+
+"""Repository interfaces the tools, router and warm-up depend on.
+
+Every method is async, so a backend that does I/O never blocks the event loop
+the graph runs on. Backends return the same domain records (`Customer`,
+`Appointment`) as the in-memory stores.
+"""
+
+
+class AppointmentRepository(ABC):
+    """Appointments and provider slot availability."""
+
+    @abstractmethod
+    async def get(self, appointment_id: str) -> Optional[Appointment]:
+        """The appointment with `appointment_id`, or None."""
+
+    @abstractmethod
+    async def list_for_customer(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Appointment]:
+        """A customer's appointments in start order, filtered like `ProviderStore.iter_appointments`."""
+
+    async def list_for_customer_json(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> str:
+        """`list_for_customer` serialized as a JSON array of `Appointment.to_json()`."""
+        appointments = await self.list_for_customer(customer_id, status, start, end, limit)
+        return json.dumps([appointment.to_json() for appointment in appointments])
+
+    @abstractmethod
+    async def add(self, appointment: Appointment) -> Optional[Appointment]:
+        """Store a new appointment under a fresh ID; None if its slot can't be held."""
+
+    @abstractmethod
+    async def update_status(
+        self,
+        appointment_id: str,
+        status: AppointmentStatus,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Appointment]:
+        """Change an appointment's status; returns it (unchanged if the slot is gone) or None.
+
+        With `expected_version` this is a compare-and-set: it raises
+        `AppointmentVersionConflict` if the appointment has moved on since it was read.
+        """
+
+    @abstractmethod
+    async def find_free_slots(
+        self, after: datetime, count: int = 3, provider_id: Optional[str] = None
+    ) -> List[Slot]:
+        """The next `count` bookable slots at or after `after`."""
+
+    @abstractmethod
+    async def is_slot_free(self, start: datetime, provider_id: Optional[str] = None) -> bool:
+        """Whether the slot at `start` can be booked."""
+
+
+class CustomerRepository(ABC):
+    """Customer records."""
+
+    @abstractmethod
+    async def get_by_id(self, customer_id: str) -> Optional[Customer]:
+        """The customer with `customer_id`, or None."""
+
+    @abstractmethod
+    async def get_by_phone(self, phone_number: str) -> Optional[Customer]:
+        """The customer registered with `phone_number`, or None."""
+
+    @abstractmethod
+    async def add(self, customer: Customer) -> bool:
+        """Add a customer; False if the phone number is already registered."""
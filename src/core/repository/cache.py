@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from src.mock.availability import Slot
+from src.mock.provider import Appointment, AppointmentStatus, to_epoch
+
+from .base import AppointmentRepository
+
+
+"""Per-customer read cache for appointment listings.
+
+Within one call the model tends to list the same customer's appointments
+several times: before confirming, after cancelling, and whenever the caller
+asks again. `CachedAppointmentRepository` wraps a backend and keeps each
+listing's JSON text, so a repeated listing costs one dict lookup instead of a
+store scan plus `json.dumps`.
+
+Every customer has a version number. A write through the wrapper (`add`,
+`update_status`) is applied to the backend first, then gives that customer a
+new version from one counter shared by all customers. Cache keys include the
+version, so a listing computed before the write is never served after it, even
+if its read was still in flight when the write landed. Stale entries are not
+searched for; they age out of the LRU.
+
+Versions are themselves kept in an LRU of `max_entries` customers. Customers
+without one share a floor version; evicting a customer raises the floor to its
+version, which is newer than any listing computed before that customer's
+last write, so forgetting a version can never revive a stale listing.
+
+Writes made by other processes on a shared SQLite file are not seen. Each
+worker only invalidates what it wrote itself.
+"""
+
+_FilterKey = Tuple[Optional[str], Optional[int], Optional[int], Optional[int]]
+_CacheKey = Tuple[str, int, _FilterKey]
+
+
+@dataclass(frozen=True)
+class AppointmentCacheStats:
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    invalidations: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CachedAppointmentRepository(AppointmentRepository):
+    def __init__(self, backend: AppointmentRepository, max_entries: int = 10_000):
+        self.backend = backend
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[_CacheKey, str]" = OrderedDict()
+        # customer_id -> version of its last write, least recently written first
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._version_counter = itertools.count(1)
+        self._version_floor = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    # ---------------------------------------------------------------------
+    # Cached reads
+    # ---------------------------------------------------------------------
+
+    async def list_for_customer_json(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> str:
+        filters: _FilterKey = (
+            status.value if status else None,
+            to_epoch(start) if start else None,
+            to_epoch(end) if end else None,
+            limit,
+        )
+
+        with self._lock:
+            key = (customer_id, self._versions.get(customer_id, self._version_floor), filters)
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        listing = await self.backend.list_for_customer_json(customer_id, status, start, end, limit)
+
+        with self._lock:
+            self._entries[key] = listing
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return listing
+
+    def stats(self) -> AppointmentCacheStats:
+        with self._lock:
+            return AppointmentCacheStats(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                evictions=self._evictions,
+            )
+
+    # ---------------------------------------------------------------------
+    # Write-through
+    # ---------------------------------------------------------------------
+
+    async def add(self, appointment: Appointment) -> Optional[Appointment]:
+        added = await self.backend.add(appointment)
+        if added is not None:
+            self._invalidate(added.customer_id)
+        return added
+
+    async def update_status(
+        self,
+        appointment_id: str,
+        status: AppointmentStatus,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Appointment]:
+        updated = await self.backend.update_status(appointment_id, status, expected_version)
+        if updated is not None:
+            self._invalidate(updated.customer_id)
+        return updated
+
+    def _invalidate(self, customer_id: str) -> None:
+        with self._lock:
+            self._versions.pop(customer_id, None)
+            self._versions[customer_id] = next(self._version_counter)
+            self._invalidations += 1
+
+            while len(self._versions) > self.max_entries:
+                _, version = self._versions.popitem(last=False)
+                self._version_floor = max(self._version_floor, version)
+
+    # ---------------------------------------------------------------------
+    # Pass-through
+    # ---------------------------------------------------------------------
+
+    async def get(self, appointment_id: str) -> Optional[Appointment]:
+        return await self.backend.get(appointment_id)
+
+    async def list_for_customer(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Appointment]:
+        return await self.backend.list_for_customer(customer_id, status, start, end, limit)
+
+    async def find_free_slots(
+        self, after: datetime, count: int = 3, provider_id: Optional[str] = None
+    ) -> List[Slot]:
+        return await self.backend.find_free_slots(after, count, provider_id)
+
+    async def is_slot_free(self, start: datetime, provider_id: Optional[str] = None) -> bool:
+        return await self.backend.is_slot_free(start, provider_id)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from src.mock.availability import Slot
+from src.mock.customer import Customer, CustomerStore
+from src.mock.provider import Appointment, AppointmentStatus, ProviderStore
+
+from .base import AppointmentRepository, CustomerRepository
+
+
+"""In-memory repository backend over the stores in `src/mock/`.
+
+Store operations are dict and bisect lookups, so they run inline on the event
+loop with no thread hop.
+"""
+
+
+class InMemoryAppointmentRepository(AppointmentRepository):
+    def __init__(self, store: ProviderStore):
+        self.store = store
+
+    async def get(self, appointment_id: str) -> Optional[Appointment]:
+        return self.store.get_appointment(appointment_id)
+
+    async def list_for_customer(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Appointment]:
+        return list(self.store.iter_appointments(customer_id, status, start, end, limit))
+
+    async def add(self, appointment: Appointment) -> Optional[Appointment]:
+        return self.store.add_appointment(appointment)
+
+    async def update_status(
+        self,
+        appointment_id: str,
+        status: AppointmentStatus,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Appointment]:
+        return self.store.update_appointment(appointment_id, status, expected_version)
+
+    async def find_free_slots(
+        self, after: datetime, count: int = 3, provider_id: Optional[str] = None
+    ) -> List[Slot]:
+        return self.store.find_free_slots(after, count, provider_id)
+
+    async def is_slot_free(self, start: datetime, provider_id: Optional[str] = None) -> bool:
+        return self.store.is_slot_free(start, provider_id)
+
+
+class InMemoryCustomerRepository(CustomerRepository):
+    def __init__(self, store: CustomerStore):
+        self.store = store
+
+    async def get_by_id(self, customer_id: str) -> Optional[Customer]:
+        return self.store.get_customer_by_id(customer_id)
+
+    async def get_by_phone(self, phone_number: str) -> Optional[Customer]:
+        return self.store.find_customer_by_phone_number(phone_number)
+
+    async def add(self, customer: Customer) -> bool:
+        return self.store.add_customer(customer)
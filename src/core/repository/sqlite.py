@@ -0,0 +1,506 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Sequence, Set, TypeVar
+
+from src.lib.logger import logger
+from src.mock.availability import AvailabilityEngine, ClinicHours, Slot
+from src.mock.customer import Customer, CustomerStore
+from src.mock.provider import (
+    ACTIVE_STATUSES,
+    PROVIDER_IDS,
+    Appointment,
+    AppointmentStatus,
+    AppointmentVersionConflict,
+    ProviderStore,
+    clinic_datetime,
+    to_epoch,
+)
+from src.utils.phone import normalize_phone_number, try_normalize_phone_number
+
+from .base import AppointmentRepository, CustomerRepository
+
+
+"""SQLite repository backend.
+
+One database file is shared by every worker process on the host.
+
+* The database runs in WAL mode, so readers never wait for the writer.
+* Reads use a pool of connections. Each connection keeps a prepared-statement
+  cache, and all SQL here is constant text, so statements are compiled once per
+  connection.
+* All work runs in worker threads (`asyncio.to_thread`), so the graph's event
+  loop never blocks on disk.
+* Point lookups issued concurrently (e.g. parallel tool calls, or warm-ups for
+  calls arriving together) are coalesced into one `IN (...)` query per thread hop.
+* Writes run in `BEGIN IMMEDIATE` transactions. That serializes slot checks
+  across processes, and a partial unique index on (provider_id, starts_at) for
+  active appointments backs them up.
+
+Empty tables are seeded from the mock stores.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone_number TEXT NOT NULL UNIQUE,
+    dob TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS appointments (
+    id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL UNIQUE,
+    customer_id TEXT NOT NULL,
+    starts_at INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    provider_id TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS appointments_by_customer
+    ON appointments (customer_id, starts_at);
+CREATE UNIQUE INDEX IF NOT EXISTS appointments_active_slot
+    ON appointments (provider_id, starts_at)
+    WHERE status IN ('pending', 'confirmed') AND provider_id IS NOT NULL;
+"""
+
+_ACTIVE = "('pending', 'confirmed')"
+
+_APPOINTMENT_COLUMNS = "id, customer_id, starts_at, status, provider_id, version"
+_SELECT_BUSY_PROVIDERS = (
+    f"SELECT provider_id FROM appointments WHERE starts_at = ? AND status IN {_ACTIVE}"
+)
+_INSERT_APPOINTMENT = (
+    "INSERT INTO appointments (id, seq, customer_id, starts_at, status, provider_id) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_INSERT_CUSTOMER = "INSERT INTO customers (id, name, phone_number, dob) VALUES (?, ?, ?, ?)"
+
+# SQLite's default limit on bound parameters is 999.
+_MAX_BATCH = 500
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class SqlitePool:
+    """Pooled reader connections plus one writer connection for a database file."""
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._writer = self._connect()
+        self._write_lock = threading.Lock()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(size):
+            self._readers.put(self._connect())
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def executescript(self, script: str) -> None:
+        with self._write_lock:
+            self._writer.executescript(script)
+
+    def close(self) -> None:
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=5.0,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+
+class _BatchedLookup(Generic[K, V]):
+    """Coalesces concurrent single-key lookups into one `fetch_many` call per thread hop."""
+
+    def __init__(self, fetch_many: Callable[[List[K]], Dict[K, V]]):
+        self._fetch_many = fetch_many
+        self._pending: Dict[K, List[asyncio.Future]] = {}
+        self._scheduled = False
+        # The loop only keeps weak references to tasks; in-flight flushes live here.
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def get(self, key: K) -> Optional[V]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+
+        if not self._scheduled:
+            self._scheduled = True
+            # Let every lookup issued in this loop iteration join the batch.
+            loop.call_soon(self._start_flush, loop)
+
+        return await future
+
+    def _start_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        task = loop.create_task(self._flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._on_flush_done)
+
+    def _on_flush_done(self, task: asyncio.Task) -> None:
+        self._flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Batched lookup flush failed: {task.exception()!r}")
+
+    async def _flush(self) -> None:
+        pending, self._pending, self._scheduled = self._pending, {}, False
+        keys = list(pending)
+
+        try:
+            found: Dict[K, V] = {}
+            for i in range(0, len(keys), _MAX_BATCH):
+                found.update(await asyncio.to_thread(self._fetch_many, keys[i : i + _MAX_BATCH]))
+        except Exception as exc:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exc)
+            return
+        except BaseException:
+            # Cancelled (e.g. loop shutdown): never leave a waiting lookup hanging.
+            for futures in pending.values():
+                for future in futures:
+                    future.cancel()
+            raise
+
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(found.get(key))
+
+
+class SqliteAppointmentRepository(AppointmentRepository):
+    def __init__(self, pool: SqlitePool, hours: ClinicHours = ClinicHours()):
+        self.pool = pool
+        self.hours = hours
+        # Used only for slot arithmetic; bookings live in the database.
+        self._slots = AvailabilityEngine(PROVIDER_IDS, hours)
+        self._lookup: _BatchedLookup[str, Appointment] = _BatchedLookup(self._get_many)
+
+    # ---------------------------------------------------------------------
+    # AppointmentRepository
+    # ---------------------------------------------------------------------
+
+    async def get(self, appointment_id: str) -> Optional[Appointment]:
+        return await self._lookup.get(appointment_id)
+
+    async def list_for_customer(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[Appointment]:
+        return await asyncio.to_thread(
+            self._list_for_customer, customer_id, status, start, end, limit
+        )
+
+    async def add(self, appointment: Appointment) -> Optional[Appointment]:
+        return await asyncio.to_thread(self._add, appointment)
+
+    async def update_status(
+        self,
+        appointment_id: str,
+        status: AppointmentStatus,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Appointment]:
+        return await asyncio.to_thread(
+            self._update_status, appointment_id, status, expected_version
+        )
+
+    async def find_free_slots(
+        self, after: datetime, count: int = 3, provider_id: Optional[str] = None
+    ) -> List[Slot]:
+        return await asyncio.to_thread(self._find_free_slots, after, count, provider_id)
+
+    async def is_slot_free(self, start: datetime, provider_id: Optional[str] = None) -> bool:
+        return await asyncio.to_thread(self._is_slot_free, start, provider_id)
+
+    # ---------------------------------------------------------------------
+    # Blocking implementations (run in worker threads)
+    # ---------------------------------------------------------------------
+
+    def _get_many(self, appointment_ids: List[str]) -> Dict[str, Appointment]:
+        placeholders = ", ".join("?" * len(appointment_ids))
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                f"SELECT {_APPOINTMENT_COLUMNS} FROM appointments WHERE id IN ({placeholders})",
+                appointment_ids,
+            ).fetchall()
+        return {row[0]: _appointment(row) for row in rows}
+
+    def _list_for_customer(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        limit: Optional[int],
+    ) -> List[Appointment]:
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                f"SELECT {_APPOINTMENT_COLUMNS} FROM appointments "
+                "WHERE customer_id = ? AND starts_at >= ? AND starts_at < ? "
+                "AND (? IS NULL OR status = ?) ORDER BY starts_at, id LIMIT ?",
+                (
+                    customer_id,
+                    to_epoch(start) if start else -(2**62),
+                    to_epoch(end) if end else 2**62,
+                    status.value if status else None,
+                    status.value if status else None,
+                    limit if limit is not None else -1,
+                ),
+            ).fetchall()
+        return [_appointment(row) for row in rows]
+
+    def _add(self, appointment: Appointment) -> Optional[Appointment]:
+        active = appointment.status in ACTIVE_STATUSES
+        if active and self._slots.slot_index(appointment.start) is None:
+            return None
+
+        with self.pool.transaction() as conn:
+            if active:
+                busy = {row[0] for row in conn.execute(_SELECT_BUSY_PROVIDERS, (appointment.starts_at,))}
+                provider_id = appointment.provider_id or next(
+                    (pid for pid in PROVIDER_IDS if pid not in busy), None
+                )
+                if provider_id is None or provider_id in busy:
+                    return None
+                appointment.provider_id = provider_id
+
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM appointments").fetchone()[0]
+            appointment.id = f"APT-{datetime.now().year}-{seq:03d}"
+            conn.execute(
+                _INSERT_APPOINTMENT,
+                (
+                    appointment.id,
+                    seq,
+                    appointment.customer_id,
+                    appointment.starts_at,
+                    appointment.status.value,
+                    appointment.provider_id,
+                ),
+            )
+
+        return appointment
+
+    def _update_status(
+        self,
+        appointment_id: str,
+        status: AppointmentStatus,
+        expected_version: Optional[int],
+    ) -> Optional[Appointment]:
+        with self.pool.transaction() as conn:
+            row = conn.execute(
+                f"SELECT {_APPOINTMENT_COLUMNS} FROM appointments WHERE id = ?",
+                (appointment_id,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            appointment = _appointment(row)
+            if expected_version is not None and appointment.version != expected_version:
+                raise AppointmentVersionConflict(
+                    appointment_id, expected_version, appointment.version
+                )
+            if appointment.status == status:
+                return appointment
+
+            if status in ACTIVE_STATUSES and appointment.status not in ACTIVE_STATUSES:
+                # Reactivating needs the slot back; leave the status as is if it's gone.
+                busy = {r[0] for r in conn.execute(_SELECT_BUSY_PROVIDERS, (appointment.starts_at,))}
+                if appointment.provider_id is None or appointment.provider_id in busy:
+                    return appointment
+
+            conn.execute(
+                "UPDATE appointments SET status = ?, version = version + 1 WHERE id = ?",
+                (status.value, appointment_id),
+            )
+            appointment.status = status
+            appointment.version += 1
+
+        return appointment
+
+    def _find_free_slots(
+        self, after: datetime, count: int, provider_id: Optional[str]
+    ) -> List[Slot]:
+        free: List[Slot] = []
+        # Load one window of bookings into a scratch engine; widen it if the
+        # first week is too full to answer.
+        for horizon_days in (7, 60):
+            window_start = datetime.combine(after.date(), self.hours.opens_at)
+            window_end = window_start + timedelta(days=horizon_days)
+
+            engine = AvailabilityEngine(PROVIDER_IDS, self.hours)
+            with self.pool.reader() as conn:
+                rows = conn.execute(
+                    "SELECT starts_at, provider_id FROM appointments "
+                    f"WHERE starts_at >= ? AND starts_at < ? AND status IN {_ACTIVE} "
+                    "AND provider_id IS NOT NULL",
+                    (to_epoch(window_start), to_epoch(window_end)),
+                ).fetchall()
+            for starts_at, booked_provider in rows:
+                engine.reserve(clinic_datetime(starts_at), booked_provider)
+
+            free = engine.next_free(after, count, provider_id, horizon_days=horizon_days)
+            if len(free) == count:
+                break
+
+        return free
+
+    def _is_slot_free(self, start: datetime, provider_id: Optional[str]) -> bool:
+        if self._slots.slot_index(start) is None:
+            return False
+
+        with self.pool.reader() as conn:
+            busy = {row[0] for row in conn.execute(_SELECT_BUSY_PROVIDERS, (to_epoch(start),))}
+
+        if provider_id is not None:
+            return provider_id not in busy
+        return len(busy) < len(PROVIDER_IDS)
+
+    def seed(self, appointments: Sequence[Appointment]) -> None:
+        """Insert `appointments` as-is if the table is empty."""
+        with self.pool.transaction() as conn:
+            if conn.execute("SELECT 1 FROM appointments LIMIT 1").fetchone():
+                return
+            conn.executemany(
+                _INSERT_APPOINTMENT,
+                [
+                    (
+                        a.id,
+                        int(a.id.rsplit("-", 1)[1]),
+                        a.customer_id,
+                        a.starts_at,
+                        a.status.value,
+                        a.provider_id,
+                    )
+                    for a in appointments
+                ],
+            )
+        logger.info(f"Seeded {len(appointments)} appointments into {self.pool.path}")
+
+
+class SqliteCustomerRepository(CustomerRepository):
+    def __init__(self, pool: SqlitePool):
+        self.pool = pool
+        self._by_id: _BatchedLookup[str, Customer] = _BatchedLookup(
+            lambda ids: self._get_many("id", ids)
+        )
+        self._by_phone: _BatchedLookup[str, Customer] = _BatchedLookup(
+            lambda phones: self._get_many("phone_number", phones)
+        )
+
+    async def get_by_id(self, customer_id: str) -> Optional[Customer]:
+        return await self._by_id.get(customer_id)
+
+    async def get_by_phone(self, phone_number: str) -> Optional[Customer]:
+        key = try_normalize_phone_number(phone_number)
+        return await self._by_phone.get(key) if key else None
+
+    async def add(self, customer: Customer) -> bool:
+        customer.phone_number = normalize_phone_number(customer.phone_number)
+        return await asyncio.to_thread(self._add, customer)
+
+    def _get_many(self, column: str, keys: List[str]) -> Dict[str, Customer]:
+        placeholders = ", ".join("?" * len(keys))
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                f"SELECT id, name, phone_number, dob FROM customers WHERE {column} IN ({placeholders})",
+                keys,
+            ).fetchall()
+
+        key_index = 0 if column == "id" else 2
+        return {row[key_index]: Customer(*row) for row in rows}
+
+    def _add(self, customer: Customer) -> bool:
+        try:
+            with self.pool.transaction() as conn:
+                conn.execute(
+                    _INSERT_CUSTOMER,
+                    (customer.id, customer.name, customer.phone_number, customer.dob),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def seed(self, customers: Sequence[Customer]) -> None:
+        """Insert `customers` if the table is empty."""
+        with self.pool.transaction() as conn:
+            if conn.execute("SELECT 1 FROM customers LIMIT 1").fetchone():
+                return
+            conn.executemany(
+                _INSERT_CUSTOMER, [(c.id, c.name, c.phone_number, c.dob) for c in customers]
+            )
+        logger.info(f"Seeded {len(customers)} customers into {self.pool.path}")
+
+
+def open_sqlite_repositories(
+    path: str, pool_size: int = 4
+) -> "tuple[SqliteAppointmentRepository, SqliteCustomerRepository]":
+    """Open (creating and seeding if needed) the SQLite repositories at `path`."""
+    pool = SqlitePool(path, pool_size)
+    pool.executescript(_SCHEMA)
+    _migrate(pool)
+
+    appointments = SqliteAppointmentRepository(pool)
+    customers = SqliteCustomerRepository(pool)
+
+    appointments.seed(ProviderStore().appointments)
+    customers.seed(CustomerStore().get_all_customers())
+
+    return appointments, customers
+
+
+def _migrate(pool: SqlitePool) -> None:
+    """Bring databases created by earlier versions up to `_SCHEMA`."""
+    with pool.reader() as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(appointments)")}
+    if "version" not in columns:
+        pool.executescript(
+            "ALTER TABLE appointments ADD COLUMN version INTEGER NOT NULL DEFAULT 1;"
+        )
+
+
+def _appointment(row: Sequence[Any]) -> Appointment:
+    appointment_id, customer_id, starts_at, status, provider_id, version = row
+    return Appointment.from_epoch(
+        appointment_id, customer_id, starts_at, AppointmentStatus(status), provider_id, version
+    )
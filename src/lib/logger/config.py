@@ -8,7 +8,7 @@ from pathlib import Path
 from datetime import timedelta
 
 # Log directory configuration
-LOGS_DIR = Path("src/logs")
+LOGS_DIR = Path(os.getenv("LOG_DIR", "src/logs"))
 
 # Console logging format
 CONSOLE_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+
+"""Slot availability for the clinic's providers.
+
+The clinic day is cut into fixed-length slots (`ClinicHours`). For every day that
+has bookings the engine keeps one integer per slot, used as a bitset over
+providers: bit `i` is set when provider `i` is booked in that slot. Days with no
+bookings are not stored at all.
+
+* "Is slot X free for provider P" is a single bit test.
+* "Is slot X free for anyone" compares the bitset with the all-booked mask.
+* "Next N free slots after T" walks slots in time order from T, and the lowest
+  free provider of a slot comes from `~booked & (booked + 1)`.
+
+Every query is independent of how many appointments exist. A full day across all
+providers costs `slots_per_day` integer operations.
+"""
+
+
+@dataclass(frozen=True)
+class ClinicHours:
+    """Opening hours and slot length, in clinic local time."""
+
+    opens_at: time = time(9, 0)
+    closes_at: time = time(17, 0)
+    slot_minutes: int = 30
+    # Monday is 0, as in `date.weekday()`.
+    closed_weekdays: FrozenSet[int] = frozenset({6})
+
+    @property
+    def slots_per_day(self) -> int:
+        return (_minutes(self.closes_at) - _minutes(self.opens_at)) // self.slot_minutes
+
+
+@dataclass(frozen=True)
+class Slot:
+    """A free slot and the provider it would be booked with."""
+
+    provider_id: str
+    start: datetime
+
+    def to_json(self):
+        return {
+            "provider_id": self.provider_id,
+            "date": self.start.strftime("%Y-%m-%d"),
+            "time": self.start.strftime("%H:%M"),
+        }
+
+
+class AvailabilityEngine:
+    """Per-day, per-slot provider bitsets with O(1) checks and ordered free-slot search."""
+
+    def __init__(self, provider_ids: Sequence[str], hours: ClinicHours = ClinicHours()):
+        if not provider_ids:
+            raise ValueError("At least one provider is required")
+
+        self.hours = hours
+        self.provider_ids = list(provider_ids)
+        self._provider_index = {pid: i for i, pid in enumerate(self.provider_ids)}
+        self._all_booked = (1 << len(self.provider_ids)) - 1
+
+        # day -> booked-provider bitset per slot
+        self._days: Dict[date, List[int]] = {}
+        self._lock = threading.Lock()
+
+    # ---------------------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------------------
+
+    def slot_index(self, start: datetime) -> Optional[int]:
+        """Index of the slot starting exactly at `start`, or None if it isn't one."""
+        if start.weekday() in self.hours.closed_weekdays:
+            return None
+
+        offset = _minutes(start.time()) - _minutes(self.hours.opens_at)
+        if offset < 0 or offset % self.hours.slot_minutes or start.second or start.microsecond:
+            return None
+
+        index = offset // self.hours.slot_minutes
+        return index if index < self.hours.slots_per_day else None
+
+    def is_free(self, start: datetime, provider_id: Optional[str] = None) -> bool:
+        """Whether the slot at `start` is open (for `provider_id`, or for anyone)."""
+        index = self.slot_index(start)
+        if index is None:
+            return False
+
+        booked = self._booked(start.date(), index)
+        if provider_id is None:
+            return booked != self._all_booked
+        return not booked >> self._provider_index[provider_id] & 1
+
+    def next_free(
+        self,
+        after: datetime,
+        count: int = 3,
+        provider_id: Optional[str] = None,
+        horizon_days: int = 60,
+    ) -> List[Slot]:
+        """The first `count` free slots starting at or after `after`, in time order."""
+        hours = self.hours
+        slot_delta = timedelta(minutes=hours.slot_minutes)
+        provider_bit = (
+            1 << self._provider_index[provider_id] if provider_id is not None else None
+        )
+
+        # First slot that starts at or after `after`.
+        offset = _minutes(after.time()) - _minutes(hours.opens_at)
+        if after.second or after.microsecond:
+            offset += 1
+        first = max(0, -(-offset // hours.slot_minutes))
+
+        free: List[Slot] = []
+        for day_offset in range(horizon_days):
+            day = after.date() + timedelta(days=day_offset)
+            if day.weekday() in hours.closed_weekdays:
+                continue
+
+            row = self._days.get(day)
+            opens = datetime.combine(day, hours.opens_at)
+
+            for index in range(first if day_offset == 0 else 0, hours.slots_per_day):
+                booked = row[index] if row else 0
+
+                if provider_bit is not None:
+                    if booked & provider_bit:
+                        continue
+                    provider = provider_id
+                else:
+                    if booked == self._all_booked:
+                        continue
+                    # Lowest unset bit = first free provider.
+                    provider = self.provider_ids[(~booked & (booked + 1)).bit_length() - 1]
+
+                free.append(Slot(provider_id=provider, start=opens + index * slot_delta))
+                if len(free) == count:
+                    return free
+
+        return free
+
+    # ---------------------------------------------------------------------
+    # Bookings
+    # ---------------------------------------------------------------------
+
+    def reserve(self, start: datetime, provider_id: Optional[str] = None) -> Optional[str]:
+        """Book the slot at `start`; returns the provider booked, or None if unavailable."""
+        index = self.slot_index(start)
+        if index is None:
+            return None
+
+        with self._lock:
+            row = self._days.get(start.date())
+            booked = row[index] if row else 0
+
+            if provider_id is None:
+                if booked == self._all_booked:
+                    return None
+                bit = ~booked & (booked + 1)
+                provider_id = self.provider_ids[bit.bit_length() - 1]
+            else:
+                bit = 1 << self._provider_index[provider_id]
+                if booked & bit:
+                    return None
+
+            if row is None:
+                row = self._days[start.date()] = [0] * self.hours.slots_per_day
+            row[index] = booked | bit
+
+        return provider_id
+
+    def release(self, start: datetime, provider_id: str) -> None:
+        """Free `provider_id`'s slot at `start` (no-op if it wasn't booked)."""
+        index = self.slot_index(start)
+        if index is None:
+            return
+
+        with self._lock:
+            row = self._days.get(start.date())
+            if row is None:
+                return
+            row[index] &= ~(1 << self._provider_index[provider_id])
+            if not any(row):
+                del self._days[start.date()]
+
+    def _booked(self, day: date, index: int) -> int:
+        row = self._days.get(day)
+        return row[index] if row else 0
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
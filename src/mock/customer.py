@@ -1,21 +1,40 @@
-from typing import List, Optional
+import csv
+import json
+import sys
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Union
 
+from src.lib.logger import logger
+from src.utils.phone import normalize_phone_number, try_normalize_phone_number
 
-@dataclass
+
+@dataclass(slots=True)
 class Customer:
     """Customer data model with required attributes"""
     id: str
     name: str
-    phone_number: str  # Format: +1XXXXXXXXXX
+    phone_number: str  # E.164, e.g. +1XXXXXXXXXX
     dob: str  # Format: YYYY-MM-DD
 
 
+@dataclass
+class BulkLoadResult:
+    """Outcome of `CustomerStore.load_file`."""
+    loaded: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+
+_CUSTOMER_FIELDS = ("id", "name", "phone_number", "dob")
+
+
 class CustomerStore:
-    """Store for managing customer data with search functionality"""
+    """Store for managing customer data, indexed by ID and normalized phone number"""
     
     def __init__(self):
-        self.customers: List[Customer] = []
+        self._by_id: Dict[str, Customer] = {}
+        self._by_phone: Dict[str, Customer] = {}
         self._initialize_mock_data()
     
     def _initialize_mock_data(self):
@@ -40,41 +59,99 @@ class CustomerStore:
                 dob="1992-08-22"
             ),
         ]
-        self.customers.extend(mock_customers)
+        for customer in mock_customers:
+            self.add_customer(customer)
+
+    @property
+    def customers(self) -> List[Customer]:
+        """All customers in insertion order (a copy)."""
+        return list(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
     
     def find_customer_by_phone_number(self, phone_number: str) -> Optional[Customer]:
         """
         Find a customer by their phone number
         
         Args:
-            phone_number (str): Phone number to search for (format: +1XXXXXXXXXX)
+            phone_number (str): Phone number to search for, in any common format
             
         Returns:
             Optional[Customer]: Customer object if found, None otherwise
         """
-        for customer in self.customers:
-            if customer.phone_number == phone_number:
-                return customer
-        return None
+        key = try_normalize_phone_number(phone_number)
+        return self._by_phone.get(key) if key else None
     
     def add_customer(self, customer: Customer) -> bool:
         """
-        Add a new customer to the store
+        Add a new customer to the store, normalizing its phone number to E.164
         
         Args:
             customer (Customer): Customer object to add
             
         Returns:
-            bool: True if customer was added successfully, False if customer with same phone already exists
+            bool: True if customer was added successfully, False if a customer with
+            the same phone number or ID already exists
+        
+        Raises:
+            ValueError: If the phone number is not a valid phone number
         """
-        # Check if customer with same phone number already exists
-        if customer.phone_number and self.find_customer_by_phone_number(
-            customer.phone_number
-        ):
+        customer.phone_number = normalize_phone_number(customer.phone_number)
+
+        if customer.phone_number in self._by_phone or customer.id in self._by_id:
             return False
-        
-        self.customers.append(customer)
+
+        # Birth dates repeat heavily across millions of rows.
+        customer.dob = sys.intern(customer.dob)
+        self._by_id[customer.id] = customer
+        self._by_phone[customer.phone_number] = customer
         return True
+
+    def load_file(self, path: Union[str, Path]) -> BulkLoadResult:
+        """
+        Stream customers from a CSV or JSONL file into the store
+        
+        Rows are read and inserted one at a time, so memory grows only by the
+        stored records. Rows with missing fields or unusable phone numbers are
+        counted as invalid and skipped.
+        
+        Args:
+            path: `.csv` file with an `id,name,phone_number,dob` header, or a
+                `.jsonl` file with one customer object per line
+            
+        Returns:
+            BulkLoadResult: How many rows were loaded, duplicated or invalid
+        """
+        return self.load_rows(iter_customer_rows(path))
+
+    def load_rows(self, rows: Iterable[Mapping[str, Any]]) -> BulkLoadResult:
+        """
+        Insert customers from an iterable of `id/name/phone_number/dob` mappings
+        
+        Returns:
+            BulkLoadResult: How many rows were loaded, duplicated or invalid
+        """
+        result = BulkLoadResult()
+
+        for row in rows:
+            try:
+                customer = Customer(*(str(row[field]).strip() for field in _CUSTOMER_FIELDS))
+                added = self.add_customer(customer)
+            except (KeyError, ValueError):
+                result.invalid += 1
+                continue
+
+            if added:
+                result.loaded += 1
+            else:
+                result.duplicates += 1
+
+        logger.info(
+            f"Loaded {result.loaded} customers "
+            f"({result.duplicates} duplicates, {result.invalid} invalid rows skipped)"
+        )
+        return result
     
     def get_all_customers(self) -> List[Customer]:
         """
@@ -83,7 +160,7 @@ class CustomerStore:
         Returns:
             List[Customer]: List of all customers
         """
-        return self.customers.copy()
+        return list(self._by_id.values())
     
     def get_customer_by_id(self, customer_id: str) -> Optional[Customer]:
         """
@@ -95,10 +172,27 @@ class CustomerStore:
         Returns:
             Optional[Customer]: Customer object if found, None otherwise
         """
-        for customer in self.customers:
-            if customer.id == customer_id:
-                return customer
-        return None
+        return self._by_id.get(customer_id)
+
+
+def iter_customer_rows(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read customer rows from a `.csv` or `.jsonl` file
+    
+    Yields one dict per row; blank JSONL lines are skipped.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    with path.open(newline="", encoding="utf-8") as file:
+        if suffix == ".csv":
+            yield from csv.DictReader(file)
+        elif suffix in (".jsonl", ".ndjson"):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"Unsupported customer file type: {path.suffix!r}")
 
 
 # Create a global instance for easy access
@@ -1,17 +1,29 @@
 from __future__ import annotations
-from typing import Dict, Optional
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 import uuid
 
 from pydantic import BaseModel, Field
 
+from src.lib.logger import logger
+from src.utils.phone import try_normalize_phone_number
+
 
 """Light-weight in-memory store for caller sessions used in mock/testing.
 
 This module intentionally keeps state in-process only. In production you would
 back this with Redis or a database, or replace the store with an adapter that
 handles multi-instance deployments.
-"""
 
+Every lookup is a dict hit: sessions are indexed by id, by (normalized phone,
+channel) and by Twilio CallSid. Sessions that go idle without a connected
+websocket (a webhook whose call never reached the relay) are expired by a
+background sweeper. Each session also has an asyncio lock that serializes its
+turns, so two prompts never run the graph on the same checkpoint thread at once.
+"""
 
 
 class CustomerSession(BaseModel):
@@ -20,18 +32,42 @@ class CustomerSession(BaseModel):
     session_id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     phone_number: str
     channel: str
+    call_sid: Optional[str] = None
 
     model_config = {
         "populate_by_name": True,
     }
 
 
+ExpiryCallback = Callable[[str], Awaitable[None]]
+
+
+def _phone_key(phone_number: str) -> str:
+    """Index key for a phone number: its E.164 form, or the raw string if it has none."""
+    return try_normalize_phone_number(phone_number) or phone_number.strip()
+
+
 class _CustomerSessionStore:
-    """In-memory, *NOT* thread-safe store mapping session_id → sessions."""
+    """In-memory, thread-safe store mapping session_id → sessions."""
+
+    def __init__(self, idle_ttl_seconds: float = 900.0) -> None:
+        self.idle_ttl_seconds = idle_ttl_seconds
+
+        # Guards the maps below; asyncio code never holds it across an await.
+        self._guard = threading.RLock()
 
-    def __init__(self) -> None:
         # Keyed by session_id for unique identification
         self._sessions: Dict[str, CustomerSession] = {}
+        self._by_phone_channel: Dict[Tuple[str, str], str] = {}
+        self._by_call_sid: Dict[str, str] = {}
+
+        # session_id -> last activity, least recently active first
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+        self._connected: Set[str] = set()
+        self._turn_locks: Dict[str, asyncio.Lock] = {}
+
+        self._sweeper: Optional[asyncio.Task[None]] = None
+        self.expired = 0
 
     # ---------------------------------------------------------------------
     # Public API
@@ -39,20 +75,50 @@ class _CustomerSessionStore:
 
     def get_session(self, session_id: str) -> Optional[CustomerSession]:
         """Fetch an existing session by session_id or None."""
-        return self._sessions.get(session_id)
-
-    def create_session(self, phone_number: str, channel: str) -> CustomerSession:
+        with self._guard:
+            session = self._sessions.get(session_id)
+            if session:
+                self._touch(session_id)
+            return session
+
+    def create_session(
+        self, phone_number: str, channel: str, call_sid: Optional[str] = None
+    ) -> CustomerSession:
         """Create a new session and return it."""
-        session = CustomerSession(phone_number=phone_number, channel=channel.lower())
-        self._sessions[session.session_id] = session
+        session = CustomerSession(
+            phone_number=phone_number, channel=channel.lower(), call_sid=call_sid
+        )
+
+        with self._guard:
+            self._sessions[session.session_id] = session
+            # The newest session wins the phone index if a caller has two.
+            self._by_phone_channel[(_phone_key(phone_number), session.channel)] = (
+                session.session_id
+            )
+            if call_sid:
+                self._by_call_sid[call_sid] = session.session_id
+            self._turn_locks[session.session_id] = asyncio.Lock()
+            self._touch(session.session_id)
+
         return session
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session by session_id. Returns True if session existed, False otherwise."""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        with self._guard:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+
+            phone_key = (_phone_key(session.phone_number), session.channel)
+            if self._by_phone_channel.get(phone_key) == session_id:
+                del self._by_phone_channel[phone_key]
+            if session.call_sid and self._by_call_sid.get(session.call_sid) == session_id:
+                del self._by_call_sid[session.call_sid]
+
+            self._last_seen.pop(session_id, None)
+            self._connected.discard(session_id)
+            self._turn_locks.pop(session_id, None)
             return True
-        return False
 
     def check_session(self, session_id: str) -> bool:
         """Return True iff there is an active session for the given session_id."""
@@ -60,11 +126,114 @@ class _CustomerSessionStore:
 
     def get_session_by_phone_and_channel(self, phone_number: str, channel: str) -> Optional[CustomerSession]:
         """Find a session by phone_number and channel. Returns None if not found."""
-        channel_lower = channel.lower()
-        for session in self._sessions.values():
-            if session.phone_number == phone_number and session.channel == channel_lower:
-                return session
-        return None
+        with self._guard:
+            session_id = self._by_phone_channel.get((_phone_key(phone_number), channel.lower()))
+            return self.get_session(session_id) if session_id else None
+
+    def get_session_by_call_sid(self, call_sid: str) -> Optional[CustomerSession]:
+        """Find the session created for a Twilio call. Returns None if not found."""
+        with self._guard:
+            session_id = self._by_call_sid.get(call_sid)
+            return self.get_session(session_id) if session_id else None
+
+    def mark_connected(self, session_id: str) -> None:
+        """Exempt a session from idle expiry while its websocket is open."""
+        with self._guard:
+            if session_id in self._sessions:
+                self._connected.add(session_id)
+                self._touch(session_id)
+
+    def turn_lock(self, session_id: str) -> asyncio.Lock:
+        """Lock that serializes graph turns for one session."""
+        with self._guard:
+            lock = self._turn_locks.get(session_id)
+            if lock is None:
+                # Unknown or already deleted session: nothing to serialize against.
+                return asyncio.Lock()
+            self._touch(session_id)
+            return lock
+
+    # ---------------------------------------------------------------------
+    # Expiry
+    # ---------------------------------------------------------------------
+
+    def sweep(self) -> List[CustomerSession]:
+        """Remove and return sessions idle longer than the TTL and not connected."""
+        deadline = time.monotonic() - self.idle_ttl_seconds
+        expired: List[CustomerSession] = []
+
+        with self._guard:
+            while self._last_seen:
+                session_id, last_seen = next(iter(self._last_seen.items()))
+                if last_seen > deadline:
+                    break
+
+                if session_id in self._connected:
+                    # Live calls are cleaned up by their websocket; check again later.
+                    self._touch(session_id)
+                    continue
+
+                expired.append(self._sessions[session_id])
+                self.delete_session(session_id)
+
+            self.expired += len(expired)
+
+        return expired
+
+    def start_sweeper(
+        self,
+        *,
+        interval_seconds: float = 30.0,
+        idle_ttl_seconds: Optional[float] = None,
+        on_expire: Optional[ExpiryCallback] = None,
+    ) -> None:
+        """Run `sweep` every `interval_seconds` on the running loop.
+
+        `on_expire` is awaited with the id of each expired session, to release
+        whatever else was held for it.
+        """
+        if idle_ttl_seconds is not None:
+            self.idle_ttl_seconds = idle_ttl_seconds
+        if self._sweeper and not self._sweeper.done():
+            return
+
+        self._sweeper = asyncio.get_running_loop().create_task(
+            self._sweep_forever(interval_seconds, on_expire), name="session-sweeper"
+        )
+
+    async def stop_sweeper(self) -> None:
+        """Cancel the background sweeper, if running."""
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+
+    def _touch(self, session_id: str) -> None:
+        self._last_seen[session_id] = time.monotonic()
+        self._last_seen.move_to_end(session_id)
+
+    async def _sweep_forever(
+        self, interval_seconds: float, on_expire: Optional[ExpiryCallback]
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+
+            for session in self.sweep():
+                logger.info(f"Session {session.session_id} expired after being idle")
+                if on_expire is None:
+                    continue
+                try:
+                    await on_expire(session.session_id)
+                except Exception as exc:
+                    logger.error(f"Releasing expired session {session.session_id} failed: {exc}")
 
 
 customer_session_store = _CustomerSessionStore()
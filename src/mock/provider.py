@@ -1,4 +1,11 @@
+import itertools
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .availability import AvailabilityEngine, ClinicHours, Slot
 
 
 class AppointmentStatus(Enum):
@@ -8,41 +15,176 @@ class AppointmentStatus(Enum):
     COMPLETED = "completed"
 
 
+# Statuses that hold a provider's slot.
+ACTIVE_STATUSES = frozenset({AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED})
+
+PROVIDER_IDS = ["PRV-001", "PRV-002", "PRV-003"]
+
+# Appointment times are clinic-local wall times; the clinic runs on IST (no DST).
+CLINIC_TZ = timezone(timedelta(hours=5, minutes=30), "IST")
+
+
 class Appointment:
+    """One appointment, stored compactly.
+
+    The start is kept as epoch seconds (`starts_at`) so records sort and range
+    queries compare integers; `date` and `time` are derived from it in ISO form.
+    `version` starts at 1 and goes up by one with every status change, for
+    compare-and-set updates.
+    """
+
+    __slots__ = ("id", "customer_id", "starts_at", "status", "provider_id", "version")
+
     id: str
     customer_id: str
-    date: str
-    time: str
+    starts_at: int
     status: AppointmentStatus
+    provider_id: Optional[str]
+    version: int
 
     def __init__(
-        self, id: str, customer_id: str, date: str, time: str, status: AppointmentStatus
+        self,
+        id: str,
+        customer_id: str,
+        date: str,
+        time: str,
+        status: AppointmentStatus,
+        provider_id: Optional[str] = None,
     ):
         self.id = id
         self.customer_id = customer_id
-        self.date = date
-        self.time = time
+        self.starts_at = to_epoch(parse_clinic_datetime(date, time))
         self.status = status
+        self.provider_id = provider_id
+        self.version = 1
+
+    @classmethod
+    def at(
+        cls,
+        id: str,
+        customer_id: str,
+        start: datetime,
+        status: AppointmentStatus,
+        provider_id: Optional[str] = None,
+    ) -> "Appointment":
+        """Build an appointment from a naive clinic-local start datetime."""
+        appointment = cls.__new__(cls)
+        appointment.id = id
+        appointment.customer_id = customer_id
+        appointment.starts_at = to_epoch(start)
+        appointment.status = status
+        appointment.provider_id = provider_id
+        appointment.version = 1
+        return appointment
+
+    @classmethod
+    def from_epoch(
+        cls,
+        id: str,
+        customer_id: str,
+        starts_at: int,
+        status: AppointmentStatus,
+        provider_id: Optional[str] = None,
+        version: int = 1,
+    ) -> "Appointment":
+        """Build an appointment from a stored epoch-seconds start."""
+        appointment = cls.__new__(cls)
+        appointment.id = id
+        appointment.customer_id = customer_id
+        appointment.starts_at = starts_at
+        appointment.status = status
+        appointment.provider_id = provider_id
+        appointment.version = version
+        return appointment
+
+    @property
+    def start(self) -> datetime:
+        """Start as a naive clinic-local datetime."""
+        return clinic_datetime(self.starts_at)
+
+    @property
+    def date(self) -> str:
+        return self.start.strftime("%Y-%m-%d")
+
+    @property
+    def time(self) -> str:
+        return self.start.strftime("%H:%M")
 
     def to_json(self):
+        start = self.start
         return {
             "id": self.id,
             "customer_id": self.customer_id,
-            "date": self.date,
-            "time": self.time,
+            "date": start.strftime("%Y-%m-%d"),
+            "time": start.strftime("%H:%M"),
             "status": self.status.value,
+            "provider_id": self.provider_id,
         }
 
 
+class AppointmentVersionConflict(Exception):
+    """A compare-and-set update found the appointment changed since it was read."""
+
+    def __init__(self, appointment_id: str, expected_version: int, current_version: int):
+        super().__init__(
+            f"Appointment {appointment_id} is at version {current_version}, "
+            f"expected {expected_version}"
+        )
+        self.appointment_id = appointment_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+def parse_clinic_datetime(date: str, time: str) -> datetime:
+    """Parse `YYYY-MM-DD` or `MM-DD-YYYY` plus `HH:MM` into a naive clinic-local datetime."""
+    for date_format in ("%Y-%m-%d", "%m-%d-%Y"):
+        try:
+            return datetime.strptime(f"{date.strip()} {time.strip()}", f"{date_format} %H:%M")
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised appointment date/time: {date!r} {time!r}")
+
+
+def to_epoch(start: datetime) -> int:
+    """Epoch seconds of a naive clinic-local datetime."""
+    return int(start.replace(tzinfo=CLINIC_TZ).timestamp())
+
+
+def clinic_datetime(starts_at: int) -> datetime:
+    """Naive clinic-local datetime of epoch seconds; the inverse of `to_epoch`."""
+    return datetime.fromtimestamp(starts_at, CLINIC_TZ).replace(tzinfo=None)
+
+
 class ProviderStore:
-    appointments: list[Appointment] = []
+    """In-memory appointment repository.
+
+    Appointments are indexed by id, by customer and by status, so lookups from
+    the provider tools cost the same at any store size. Each customer's
+    appointments are kept sorted by start time, so date-range and "next N"
+    queries bisect to the first match instead of walking the history. IDs come
+    from a monotonic counter and are never reused.
+
+    Pending and confirmed appointments hold a provider slot in `availability`;
+    booking into a taken slot fails and cancelling frees the slot.
+    """
+
+    def __init__(self, hours: ClinicHours = ClinicHours()):
+        self.availability = AvailabilityEngine(PROVIDER_IDS, hours)
+        self._by_id: Dict[str, Appointment] = {}
+        # customer_id -> (starts_at, id) sorted ascending
+        self._by_customer: Dict[str, List[Tuple[int, str]]] = {}
+        self._by_status: Dict[AppointmentStatus, Dict[str, Appointment]] = {
+            status: {} for status in AppointmentStatus
+        }
+        # Guards index updates; the GIL alone doesn't make the multi-step
+        # update atomic for callers on worker threads.
+        self._lock = threading.Lock()
+        self._id_counter = itertools.count(1)
 
-    def __init__(self):
-        self.appointments = []
         self._initialize_mock_data()
 
     def _initialize_mock_data(self):
-        self.appointments = [
+        for appointment in [
             Appointment(
                 "APT-2025-001",
                 "CUST-1001",
@@ -67,7 +209,7 @@ class ProviderStore:
             Appointment(
                 "APT-2025-004",
                 "CUST-1002",
-                "2025-07-20",
+                "2025-07-21",
                 "10:30",
                 AppointmentStatus.CONFIRMED,
             ),
@@ -81,7 +223,7 @@ class ProviderStore:
             Appointment(
                 "APT-2025-006",
                 "CUST-1003",
-                "2025-07-20",
+                "2025-07-21",
                 "14:00",
                 AppointmentStatus.PENDING,
             ),
@@ -92,35 +234,170 @@ class ProviderStore:
                 "11:30",
                 AppointmentStatus.PENDING,
             ),
-        ]
-        self.appointments.extend(self.appointments)
+        ]:
+            if not self._hold_slot(appointment):
+                raise ValueError(
+                    f"Seed appointment {appointment.id} has no free slot at "
+                    f"{appointment.date} {appointment.time}"
+                )
+            self._index(appointment)
+
+        # Allocate new IDs after the highest seeded sequence number.
+        seeded = max(int(appointment_id.rsplit("-", 1)[1]) for appointment_id in self._by_id)
+        self._id_counter = itertools.count(seeded + 1)
+
+    @property
+    def appointments(self) -> List[Appointment]:
+        """All appointments in insertion order (a copy)."""
+        return list(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def add_appointment(self, appointment: Appointment) -> Optional[Appointment]:
+        """Store `appointment` under a newly allocated, never reused ID.
 
-    def add_appointment(self, appointment: Appointment):
-        appointment.id = f"APT-2025-00{len(self.appointments) + 1}"
-        self.appointments.append(appointment)
+        Returns None, storing nothing, when an active appointment's slot is
+        outside clinic hours or already taken.
+        """
+        with self._lock:
+            if not self._hold_slot(appointment):
+                return None
+            appointment.id = self._next_id()
+            self._index(appointment)
+        return appointment
 
-    def get_appointments(self, customer_id: str):
+    def find_free_slots(
+        self, after: datetime, count: int = 3, provider_id: Optional[str] = None
+    ) -> List[Slot]:
+        """The next `count` bookable slots at or after `after`."""
+        return self.availability.next_free(after, count, provider_id)
+
+    def is_slot_free(self, start: datetime, provider_id: Optional[str] = None) -> bool:
+        return self.availability.is_free(start, provider_id)
+
+    def get_appointments(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
         return [
             appointment.to_json()
-            for appointment in self.appointments
-            if appointment.customer_id == customer_id
+            for appointment in self.iter_appointments(customer_id, status, start, end, limit)
         ]
 
-    def get_appointment(self, appointment_id: str):
-        appointment = next(
-            (
+    def iter_appointments(
+        self,
+        customer_id: str,
+        status: Optional[AppointmentStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Appointment]:
+        """One customer's appointments in start order.
+
+        Optionally only those with `status`, starting in `[start, end)`, and at
+        most `limit` of them.
+        """
+        keys = self._by_customer.get(customer_id)
+        if not keys:
+            return iter(())
+
+        lo = bisect_left(keys, (to_epoch(start),)) if start else 0
+        hi = bisect_left(keys, (to_epoch(end),)) if end else len(keys)
+        return self._scan(keys[lo:hi], status, limit)
+
+    def get_appointments_by_status(self, status: AppointmentStatus) -> List[Appointment]:
+        return list(self._by_status[status].values())
+
+    def get_appointment(self, appointment_id: str) -> Optional[Appointment]:
+        return self._by_id.get(appointment_id)
+
+    def update_appointment(
+        self,
+        appointment_id: str,
+        status: AppointmentStatus,
+        expected_version: Optional[int] = None,
+    ) -> Optional[Appointment]:
+        """Set an appointment's status, bumping its version if it changed.
+
+        With `expected_version`, the update only applies if the appointment is
+        still at that version; otherwise AppointmentVersionConflict is raised.
+        """
+        with self._lock:
+            appointment = self._by_id.get(appointment_id)
+            if (
                 appointment
-                for appointment in self.appointments
-                if appointment.id == appointment_id
-            ),
-            None,
+                and expected_version is not None
+                and appointment.version != expected_version
+            ):
+                raise AppointmentVersionConflict(
+                    appointment_id, expected_version, appointment.version
+                )
+
+            if appointment and appointment.status != status:
+                was_active = appointment.status in ACTIVE_STATUSES
+                if status in ACTIVE_STATUSES and not was_active:
+                    # Reactivating needs the slot back; leave the status as is if it's gone.
+                    if not self._hold_slot(appointment, status):
+                        return appointment
+                elif was_active and status not in ACTIVE_STATUSES:
+                    self._free_slot(appointment)
+
+                del self._by_status[appointment.status][appointment_id]
+                appointment.status = status
+                appointment.version += 1
+                self._by_status[status][appointment_id] = appointment
+            return appointment
+
+    def _index(self, appointment: Appointment) -> None:
+        if appointment.id in self._by_id:
+            raise ValueError(f"Duplicate appointment id {appointment.id}")
+
+        self._by_id[appointment.id] = appointment
+        insort(
+            self._by_customer.setdefault(appointment.customer_id, []),
+            (appointment.starts_at, appointment.id),
         )
-        return appointment if appointment else None
+        self._by_status[appointment.status][appointment.id] = appointment
+
+    def _scan(
+        self,
+        keys: List[Tuple[int, str]],
+        status: Optional[AppointmentStatus],
+        limit: Optional[int],
+    ) -> Iterator[Appointment]:
+        found = 0
+        for _, appointment_id in keys:
+            if limit is not None and found >= limit:
+                return
+            appointment = self._by_id[appointment_id]
+            if status is None or appointment.status == status:
+                found += 1
+                yield appointment
+
+    def _hold_slot(
+        self, appointment: Appointment, status: Optional[AppointmentStatus] = None
+    ) -> bool:
+        if (status or appointment.status) not in ACTIVE_STATUSES:
+            return True
+
+        provider_id = self.availability.reserve(appointment.start, appointment.provider_id)
+        if provider_id is None:
+            return False
+
+        appointment.provider_id = provider_id
+        return True
+
+    def _free_slot(self, appointment: Appointment) -> None:
+        if appointment.provider_id:
+            self.availability.release(appointment.start, appointment.provider_id)
 
-    def update_appointment(self, appointment_id: str, status: AppointmentStatus):
-        appointment = self.get_appointment(appointment_id)
-        if appointment:
-            appointment.status = status
+    def _next_id(self) -> str:
+        return f"APT-{datetime.now().year}-{next(self._id_counter):03d}"
 
 
 # Initialize the provider store
@@ -1,5 +1,240 @@
-from datetime import datetime
+import re
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
 import pytz
 
+
+"""Clinic time helpers and a resolver for spoken dates and times.
+
+Callers say "tomorrow" "at 3" or "next friday" "in the morning", not
+`06-08-2025 15:00`. `resolve_appointment_start` turns such a date phrase and
+time phrase into a clinic-local datetime
+deterministically against a given "now", so the booking tool can take them
+as-is and the model doesn't have to do calendar arithmetic.
+"""
+
+# Looked up once; `pytz.timezone` is a registry lookup plus a lock per call.
+IST = pytz.timezone("Asia/Kolkata")
+
+_WEEKDAYS = {
+    name: index
+    for index, names in enumerate(
+        (
+            ("monday", "mon"),
+            ("tuesday", "tue", "tues"),
+            ("wednesday", "wed"),
+            ("thursday", "thu", "thur", "thurs"),
+            ("friday", "fri"),
+            ("saturday", "sat"),
+            ("sunday", "sun"),
+        )
+    )
+    for name in names
+}
+
+_MONTHS = {
+    name: index
+    for index, names in enumerate(
+        (
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may",),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sep", "sept"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+
+_NAMED_TIMES = {
+    "noon": time(12, 0),
+    "midday": time(12, 0),
+    "morning": time(9, 0),
+    "afternoon": time(14, 0),
+    "evening": time(16, 0),
+}
+
+_NUMERIC_DATE = re.compile(r"^(\d{1,4})[-/.](\d{1,2})(?:[-/.](\d{2,4}))?$")
+_RELATIVE_OFFSET = re.compile(r"^in (\d+|a|an|one|two|three) (day|week)s?$")
+_MONTH_DAY = re.compile(r"^([a-z]+) (\d{1,2})(?:st|nd|rd|th)?(?: (\d{4}))?$")
+_DAY_MONTH = re.compile(r"^(\d{1,2})(?:st|nd|rd|th)? (?:of )?([a-z]+)(?: (\d{4}))?$")
+_CLOCK_TIME = re.compile(r"^(\d{1,2})(?:[:.](\d{2}))? ?(am|pm|a\.m\.|p\.m\.)?$")
+
+_SMALL_NUMBERS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3}
+
+
+class DateResolutionError(ValueError):
+    """A date/time phrase that can't be booked, with a machine-readable `code`.
+
+    Codes: `unrecognized_date`, `unrecognized_time`, `in_past`, `too_soon`.
+    """
+
+    def __init__(self, code: str, message: str, earliest_allowed: Optional[datetime] = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.earliest_allowed = earliest_allowed
+
+    def to_json(self):
+        payload = {"error": self.code, "message": self.message}
+        if self.earliest_allowed is not None:
+            payload["earliest_allowed"] = self.earliest_allowed.strftime("%m-%d-%Y %H:%M")
+        return payload
+
+
 def get_current_datetime_in_ist():
-  return datetime.now(pytz.timezone('Asia/Kolkata'))
\ No newline at end of file
+  return datetime.now(IST)
+
+
+def resolve_date(text: str, today: date) -> date:
+    """Resolve a spoken or written date relative to `today`.
+
+    Accepts `MM-DD-YYYY`, `YYYY-MM-DD`, `MM/DD` (next occurrence), `today`,
+    `yesterday`, `tomorrow`, `day after tomorrow`, weekdays (`friday`, `this friday`,
+    `next friday`: the next one after today, or today for `this <today>`),
+    `in 3 days` / `in 2 weeks`, and month names (`june 8`, `8th of june 2026`).
+    """
+    phrase = _normalize(text)
+    if not phrase:
+        raise DateResolutionError("unrecognized_date", "No date given")
+
+    if phrase == "today":
+        return today
+    if phrase == "yesterday":
+        return today - timedelta(days=1)
+    if phrase == "tomorrow":
+        return today + timedelta(days=1)
+    if phrase in ("day after tomorrow", "the day after tomorrow"):
+        return today + timedelta(days=2)
+
+    offset = _RELATIVE_OFFSET.match(phrase)
+    if offset:
+        amount = _SMALL_NUMBERS.get(offset.group(1)) or int(offset.group(1))
+        return today + timedelta(days=amount * (7 if offset.group(2) == "week" else 1))
+
+    words = phrase.split()
+    if words[-1] in _WEEKDAYS and len(words) <= 2 and words[0] in ("this", "next", "coming", words[-1]):
+        ahead = (_WEEKDAYS[words[-1]] - today.weekday()) % 7
+        if ahead == 0 and words[0] != "this":
+            ahead = 7
+        return today + timedelta(days=ahead)
+
+    numeric = _NUMERIC_DATE.match(phrase)
+    if numeric:
+        first, second, third = numeric.groups()
+        if len(first) == 4:
+            return _date_or_error(int(first), int(second), int(third or 0), text)
+        if third is None:
+            return _next_occurrence(int(first), int(second), today, text)
+        return _date_or_error(_full_year(third), int(first), int(second), text)
+
+    for pattern, month_group, day_group in ((_MONTH_DAY, 1, 2), (_DAY_MONTH, 2, 1)):
+        named = pattern.match(phrase)
+        if named and named.group(month_group) in _MONTHS:
+            month = _MONTHS[named.group(month_group)]
+            day = int(named.group(day_group))
+            if named.group(3):
+                return _date_or_error(int(named.group(3)), month, day, text)
+            return _next_occurrence(month, day, today, text)
+
+    raise DateResolutionError("unrecognized_date", f"Could not understand the date {text!r}")
+
+
+def resolve_time(text: str) -> time:
+    """Resolve a spoken or written time of day.
+
+    Accepts `HH:MM` (24-hour), `3pm`, `3:30 p.m.`, `noon`, `in the morning`, etc.
+    A single-digit hour from 1 to 7 with no am/pm is taken as afternoon, with or
+    without minutes, since that is what callers mean for a daytime appointment
+    ("at 3", "3:30"); a zero-padded hour ("07:30") is read as 24-hour.
+    """
+    phrase = _normalize(text)
+    for prefix in ("at ", "around ", "in the "):
+        if phrase.startswith(prefix):
+            phrase = phrase[len(prefix):]
+
+    if phrase in _NAMED_TIMES:
+        return _NAMED_TIMES[phrase]
+
+    clock = _CLOCK_TIME.match(phrase)
+    if clock:
+        hour, minute = int(clock.group(1)), int(clock.group(2) or 0)
+        meridiem = (clock.group(3) or "").replace(".", "")
+        if meridiem and not 1 <= hour <= 12:
+            hour = -1
+        elif meridiem == "pm" and hour != 12:
+            hour += 12
+        elif meridiem == "am" and hour == 12:
+            hour = 0
+        elif not meridiem and len(clock.group(1)) == 1 and 1 <= hour <= 7:
+            hour += 12
+        if 0 <= hour <= 23 and 0 <= minute <= 59:
+            return time(hour, minute)
+
+    raise DateResolutionError("unrecognized_time", f"Could not understand the time {text!r}")
+
+
+def resolve_appointment_start(
+    date_text: str,
+    time_text: str,
+    now: datetime,
+    min_lead: timedelta = timedelta(minutes=10),
+) -> datetime:
+    """Resolve `date_text` + `time_text` to a naive datetime in `now`'s local time.
+
+    `now` is a naive local datetime. Raises DateResolutionError for phrases
+    that can't be parsed, dates in the past, and starts less than `min_lead`
+    after `now`.
+    """
+    start = datetime.combine(resolve_date(date_text, now.date()), resolve_time(time_text))
+    earliest = now + min_lead
+
+    if start < now:
+        raise DateResolutionError(
+            "in_past", f"{start:%m-%d-%Y %H:%M} is in the past", earliest_allowed=earliest
+        )
+    if start < earliest:
+        raise DateResolutionError(
+            "too_soon",
+            f"{start:%m-%d-%Y %H:%M} is less than {int(min_lead.total_seconds() // 60)} "
+            "minutes from now",
+            earliest_allowed=earliest,
+        )
+    return start
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace(",", " ").split())
+
+
+def _full_year(text: str) -> int:
+    year = int(text)
+    return year + 2000 if year < 100 else year
+
+
+def _date_or_error(year: int, month: int, day: int, text: str) -> date:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        raise DateResolutionError("unrecognized_date", f"{text!r} is not a valid date") from None
+
+
+def _next_occurrence(month: int, day: int, today: date, text: str) -> date:
+    """The first `month`/`day` on or after `today` (Feb 29 may be years ahead)."""
+    for year in range(today.year, today.year + 5):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue
+        if candidate >= today:
+            return candidate
+    raise DateResolutionError("unrecognized_date", f"{text!r} is not a valid date")
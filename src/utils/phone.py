@@ -0,0 +1,51 @@
+from typing import Optional
+
+
+"""Phone number normalization.
+
+Twilio sends caller IDs in E.164 (`+14803828571`), but numbers typed into
+customer files or other channels arrive as `(480) 382-8571`, `480.382.8571`,
+`001 480 382 8571` and so on. Everything that stores or looks up a phone number
+uses `normalize_phone_number` so the two forms meet.
+"""
+
+DEFAULT_COUNTRY_CODE = "1"
+
+# E.164 allows at most 15 digits including the country code.
+_MAX_DIGITS = 15
+_MIN_DIGITS = 8
+
+
+def normalize_phone_number(phone_number: str, default_country_code: str = DEFAULT_COUNTRY_CODE) -> str:
+    """Return `phone_number` in E.164 form, e.g. `+14803828571`.
+
+    Numbers without an international prefix (`+` or `00`) are taken as national
+    numbers in `default_country_code`; a leading trunk `0` is dropped.
+    Raises ValueError if the result cannot be an E.164 number.
+    """
+    raw = phone_number.strip()
+    digits = "".join(ch for ch in raw if ch.isdigit())
+
+    if raw.startswith("+"):
+        number = digits
+    elif digits.startswith("00"):
+        number = digits[2:]
+    elif default_country_code == "1" and len(digits) == 11 and digits.startswith("1"):
+        # NANP numbers are commonly written with the country code but no '+'.
+        number = digits
+    else:
+        number = default_country_code + digits.lstrip("0")
+
+    if not _MIN_DIGITS <= len(number) <= _MAX_DIGITS or number.startswith("0"):
+        raise ValueError(f"Not a valid phone number: {phone_number!r}")
+    return f"+{number}"
+
+
+def try_normalize_phone_number(phone_number: Optional[str]) -> Optional[str]:
+    """`normalize_phone_number`, or None for empty or invalid input."""
+    if not phone_number:
+        return None
+    try:
+        return normalize_phone_number(phone_number)
+    except ValueError:
+        return None
@@ -1,13 +1,8 @@
 from src.agents.state import State
+from src.core.llm.prompt_cache import SystemPrompt
 
-def authentication_prompt(state: State) -> str:
-
-    agent_branding = state.agent_branding
-
-    system_prompt = f"""
-    You are {agent_branding.name} having tone {agent_branding.tone}
-    You are talking to the user on {state.conversation_channel} channel, keep the message look like real human is interacting with the user.
 
+AUTHENTICATION_PROMPT_STATIC = """
     **Core Task: User Authentication**
     You are an expert in managing authentication. Help user to authneticate so they can continue with other services by using the following tools:
     - **Send OTP**: if send otp is not sent, send an OTP to the user's phone number.
@@ -23,4 +18,14 @@ def authentication_prompt(state: State) -> str:
     7.  Clean Responses: Keep the response short and concise. Do not include your internal monologue, reasoning, or function/tool names in the response.
 """
 
-    return system_prompt
+
+def authentication_prompt(state: State) -> SystemPrompt:
+
+    agent_branding = state.agent_branding
+
+    dynamic_prompt = f"""
+    You are {agent_branding.name} having tone {agent_branding.tone}
+    You are talking to the user on {state.conversation_channel} channel, keep the message look like real human is interacting with the user.
+"""
+
+    return SystemPrompt(static=AUTHENTICATION_PROMPT_STATIC, dynamic=dynamic_prompt)
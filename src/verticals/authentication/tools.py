@@ -1,112 +1,107 @@
 from langchain_core.tools import tool, InjectedToolCallId
-from langchain_core.messages import ToolMessage, AIMessage
+from langchain_core.messages import AIMessage
 from src.agents.state import State
 from langgraph.types import Command
 from langgraph.prebuilt import InjectedState
 from typing import Annotated, Union
-
-MOCK_OTP = "123456"
+import math
+from src.core.otp import OtpVerification, get_caller_trust, get_otp_service
+from src.lib.logger import logger
+from src.verticals.tool_results import tool_result
 
 @tool("send_otp", description="Send an OTP to the user")
-def send_otp(state: Annotated[State, InjectedState], tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
+async def send_otp(state: Annotated[State, InjectedState], tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
     try:
         phone_number = state.customer.phone_number
-        # In a real implementation, this would actually send an SMS
-        print(f"Sending OTP: {MOCK_OTP} to phone number: {phone_number}")
-        
-        msg_list = list(state.messages)
-        msg_list.append(ToolMessage(
-            name="send_otp",
-            content=f"OTP sent successfully to {phone_number}",
-            tool_call_id=tool_call_id
-        ))
+        logger.debug(f"Sending OTP to phone number: {phone_number}")
 
-        msg_list.append(AIMessage(content=f"OTP sent successfully to {phone_number}"))
+        result = get_otp_service().send(phone_number)
 
-        return Command(
-            update={
-                "messages": msg_list,
-                "authentication": {
-                    **state.authentication.model_dump(),
-                    "otp_sent": True
-                }
+        if not result.sent:
+            if result.retry_after is not None:
+                return tool_result(
+                    f"Too many OTP requests for {phone_number}, "
+                    f"a new OTP can be sent in {math.ceil(result.retry_after)} seconds",
+                    tool_call_id,
+                    name="send_otp",
+                    status="error",
+                )
+            return tool_result(
+                "OTP could not be sent right now, please try again",
+                tool_call_id,
+                name="send_otp",
+                status="error",
+            )
+
+        return tool_result(
+            f"OTP sent successfully to {phone_number}",
+            tool_call_id,
+            name="send_otp",
+            extra_messages=[AIMessage(content=f"OTP sent successfully to {phone_number}")],
+            authentication={
+                **state.authentication.model_dump(),
+                "otp_sent": True
             },
         )
     
     except Exception as e:
-        return Command(
-            update={
-                "messages": [f"Failed to send OTP: {str(e)}"],
-                "otp_sent": False
-            },
-        )
+        return tool_result(f"Failed to send OTP: {str(e)}", tool_call_id, name="send_otp", status="error")
 
 @tool("verify_otp", description="Verify the OTP provided by the user")
-def verify_otp(otp: str, state: Annotated[State, InjectedState], tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
+async def verify_otp(otp: str, state: Annotated[State, InjectedState], tool_call_id: Annotated[str, InjectedToolCallId]) -> Command:
     try:
-        stored_otp = MOCK_OTP
-        
-        if not stored_otp:
-            tool_message = ToolMessage(content="No OTP found for this phone number", tool_call_id=tool_call_id)
-            return Command(
-                update={
-                    "messages": [tool_message]
-                }
-            )
-        
-        if stored_otp == otp:
-            msg_list = list(state.messages)
-            msg_list.append(ToolMessage(
-                name="verify_otp",
-                content="OTP verified successfully",
-                tool_call_id=tool_call_id
-            ))
+        phone_number = state.customer.phone_number
+        result = get_otp_service().verify(phone_number, otp)
 
-            return Command(
-                update={ 
-                    "authentication": {
-                        **state.authentication.model_dump(),
-                        "is_authorized": True,
-                    },
-                    "messages": msg_list
+        if result.verified:
+            # Lets a call back from this number within the trust window skip OTP.
+            get_caller_trust().remember(phone_number, state.customer.id)
+            return tool_result(
+                "OTP verified successfully",
+                tool_call_id,
+                name="verify_otp",
+                authentication={
+                    **state.authentication.model_dump(),
+                    "is_authorized": True,
                 },
             )
-        
-        tool_message = ToolMessage(content="Invalid OTP, Please enter the correct OTP", tool_call_id=tool_call_id)
-        
-        return Command(
-            update={
-                "messages": [tool_message]
-            }
+
+        if result.outcome == OtpVerification.INVALID:
+            return tool_result(
+                f"Invalid OTP, Please enter the correct OTP ({result.attempts_left} attempts left)",
+                tool_call_id,
+            )
+
+        # The code is gone (never sent, expired or too many guesses): a new one is needed.
+        if result.outcome == OtpVerification.TOO_MANY_ATTEMPTS:
+            get_caller_trust().revoke(phone_number)
+        reason = {
+            OtpVerification.NOT_FOUND: "No OTP found for this phone number",
+            OtpVerification.EXPIRED: "The OTP has expired",
+            OtpVerification.TOO_MANY_ATTEMPTS: "Too many incorrect attempts, the OTP has been revoked",
+        }[result.outcome]
+        return tool_result(
+            f"{reason}, send a new OTP",
+            tool_call_id,
+            authentication={
+                **state.authentication.model_dump(),
+                "otp_sent": False,
+            },
         )
     
     except Exception as e:
-        tool_message = ToolMessage(content=f"OTP verification failed: {str(e)}", tool_call_id=tool_call_id)
-        
-        return Command(
-            update={
-                "messages": [tool_message]
-            }
-        )
+        return tool_result(f"OTP verification failed: {str(e)}", tool_call_id, status="error")
 
 
 def validate_authorization(state: State, tool_call_id: str) -> tuple[bool, Union[None, Command]]:
     if  not state.authentication.is_authorized:
 
-        msg_list = list(state.messages)
-        msg_list.append(ToolMessage(
+        return False, tool_result(
+            "You are not authorized to use this service, authenticating the user",
+            tool_call_id,
             name="validate_authorization",
-            content="You are not authorized to use this service, authenticating the user",
-            tool_call_id=tool_call_id
-        ))
-
-        return False, Command(
-            update={
-                "active_node": "auth_node",
-                "messages": msg_list
-            }
+            active_node="auth_node",
         )
 
 
     return True, None
-    
\ No newline at end of file
@@ -1,16 +1,13 @@
 from src.agents.state import State
+from src.core.llm.prompt_cache import SystemPrompt
 
 
-def intent_identification_prompt(state: State) -> str:
-  prompt = f"""
+INTENT_IDENTIFICATION_PROMPT_STATIC = """
     You are an expert at identifying user intent based on the full conversation history.
 
     You are not a chatbot. Do not reply to the user.  
     Your job is to select the correct node (agent) that should handle the current state of the conversation.
 
-    Conversation channel: {state.conversation_channel}  
-    Current active agent: {state.active_node}
-
     Nodes available:
     - auth_node: Handles authentication and authorization queries.
     - appointment_node: Handles appointment andgreeting-related queries.
@@ -22,10 +19,10 @@ def intent_identification_prompt(state: State) -> str:
     3. Respond with one of: "auth_node", "appointment_node", or "end".
 
     Respond **only** in this JSON format:
-    {{
+    {
       "active_node": "appointment_node",  // or "auth_node", or "end"
       "thinking": "Explain briefly why this node is the right one at this point."
-    }}
+    }
 
     **Important Rules:**
     - If the user has just sent a message that requires a response from an agent, return the responsible agent node.
@@ -34,5 +31,10 @@ def intent_identification_prompt(state: State) -> str:
     """
 
 
-  return prompt
+def intent_identification_prompt(state: State) -> SystemPrompt:
+  dynamic_prompt = f"""
+    Conversation channel: {state.conversation_channel}
+    Current active agent: {state.active_node}
+    """
 
+  return SystemPrompt(static=INTENT_IDENTIFICATION_PROMPT_STATIC, dynamic=dynamic_prompt)
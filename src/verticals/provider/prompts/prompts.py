@@ -1,18 +1,16 @@
 from src.agents.state import State
+from src.core.llm.prompt_cache import SystemPrompt
+from src.utils.datetime import get_current_datetime_in_ist
 
 
-def agent_prompt(state: State) -> str:
-
-    agent_branding = state.agent_branding
-
-    system_prompt = f"""
-    You are {agent_branding.name} having tone {agent_branding.tone}
-    You are talking to the user on {state.conversation_channel} channel, keep the message look like real human is interacting with the user.
-
+# Kept free of any interpolation so it is byte-identical across calls and can be
+# served from the Anthropic prompt cache.
+AGENT_PROMPT_STATIC = """
     **Core Task: Appointment Management**
     You are an expert in managing medical appointments. Your sole function is to help users with the following tasks by using your available tools:
     - **List Appointments**: Retrieve and display a user's upcoming or past appointments.
     - **Book Appointment**: Schedule a new appointment for a user with a healthcare provider.
+    - **Find Available Slots**: Look up the next free appointment slots, to offer times or alternatives.
     - **Reschedule Appointment**: Change the date or time of an existing appointment.
     - **Cancel Appointment**: Cancel an existing appointment.
     - **Confirm Appointment**: Confirm an upcoming appointment.
@@ -32,4 +30,15 @@ def agent_prompt(state: State) -> str:
         Do not end your message with a filler if you're not performing an action. Always either take action, ask a clarifying question, or inform the user why action cannot be taken.
 """
 
-    return system_prompt
+
+def agent_prompt(state: State) -> SystemPrompt:
+
+    agent_branding = state.agent_branding
+
+    dynamic_prompt = f"""
+    You are {agent_branding.name} having tone {agent_branding.tone}
+    You are talking to the user on {state.conversation_channel} channel, keep the message look like real human is interacting with the user.
+    Current date and time (IST): {get_current_datetime_in_ist().strftime("%A, %m-%d-%Y %H:%M")}
+"""
+
+    return SystemPrompt(static=AGENT_PROMPT_STATIC, dynamic=dynamic_prompt)
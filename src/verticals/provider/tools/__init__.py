@@ -4,6 +4,7 @@ from .tools import (
     book_appointment,
     confirm_appointment,
     cancel_appointment,
+    find_available_slots,
 )
 from .tool_types import (
     ToolName,
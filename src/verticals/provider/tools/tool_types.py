@@ -9,6 +9,7 @@ class ToolName(str, Enum):
     CONFIRM_APPOINTMENT = 'confirm_appointment'
     CANCEL_APPOINTMENT = 'cancel_appointment'
     RESCHEDULE_APPOINTMENT = 'reschedule_appointment'
+    FIND_AVAILABLE_SLOTS = 'find_available_slots'
 
 class ProviderToolsJson(TypedDict):
     welcome_message: ToolDefinition
@@ -1,16 +1,33 @@
-from typing import Annotated
+from datetime import datetime, time as dt_time, timedelta
+from typing import Annotated, Callable, Optional, Tuple
 from langgraph.prebuilt import InjectedState
-from langgraph.types import Command
 import json
-from langchain_core.messages import ToolMessage
 from langchain_core.tools import InjectedToolCallId
 from src.agents.state import State
 from langchain_core.tools import tool
-from src.mock.provider import providerStore, Appointment, AppointmentStatus
+from langgraph.types import Command
+from src.core.repository import get_repositories
+from src.mock.provider import (
+    Appointment,
+    AppointmentStatus,
+    AppointmentVersionConflict,
+    parse_clinic_datetime,
+)
 import uuid
 from .tool_types import ToolName
-from src.utils.datetime import get_current_datetime_in_ist
 from src.verticals.authentication.tools import validate_authorization
+from src.verticals.tool_results import tool_result
+from src.lib.logger import logger
+from src.utils.datetime import (
+    DateResolutionError,
+    get_current_datetime_in_ist,
+    resolve_appointment_start,
+    resolve_date,
+    resolve_time,
+)
+
+# Compare-and-set attempts for confirm/cancel before reporting a conflict.
+_STATUS_UPDATE_ATTEMPTS = 3
 
 @tool(
     ToolName.WELCOME_MESSAGE.value,
@@ -18,7 +35,7 @@ from src.verticals.authentication.tools import validate_authorization
    It is used to send the welcome message to the user.
    """,
 )
-def welcome_message(
+async def welcome_message(
     state: Annotated[State, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
 ):
@@ -26,18 +43,30 @@ def welcome_message(
         state.welcome_message
         or "Hello, I am your Ai assistant. I can help you with your appointment related queries."
     )
-    tool_message = ToolMessage(content=welcome_message, tool_call_id=tool_call_id)
-
-    return Command(update={"messages": state.messages + [tool_message]})  # type: ignore
+    return tool_result(welcome_message, tool_call_id)
 
 
 @tool(
     ToolName.LIST_APPOINTMENTS.value,
-    description="""It is used to list all the appointments of the customer""",
+    description="""
+  Lists the customer's appointments in date order.
+  Narrow the listing to what the user asked about instead of fetching the full history.
+
+  Input Requirements (all optional):
+    - upcoming_only: only appointments from now on (use for "my next/upcoming appointment")
+    - status: one of pending, confirmed, cancelled, completed
+    - from_date / to_date: date range in `MM-DD-YYYY` format, both inclusive
+    - limit: return at most this many appointments (e.g. 1 for "my next appointment")
+  """,
 )
-def list_appointments(
+async def list_appointments(
     state: Annotated[State, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
+    upcoming_only: bool = False,
+    status: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    limit: Optional[int] = None,
 ):
 
     auth_result = validate_authorization(state, tool_call_id)
@@ -46,63 +75,59 @@ def list_appointments(
         return auth_result[1]
 
     
-    print(f"Looking up appointment for customer {state.customer.id}")
+    logger.debug(f"Looking up appointment for customer {state.customer.id}")
     customer_id = state.customer.id
 
     if customer_id is None or customer_id == "":
-        return Command(
-            update={
-                "messages": state.messages
-                + [
-                    ToolMessage(
-                        content="Customer ID is required to get appointments",
-                        tool_call_id=tool_call_id,
-                    )
-                ]  # type: ignore
-            }
+        return tool_result("Customer ID is required to get appointments", tool_call_id)
+
+    try:
+        status_filter = AppointmentStatus(status.lower()) if status else None
+        start = parse_clinic_datetime(from_date, "00:00") if from_date else None
+        end = (
+            parse_clinic_datetime(to_date, "00:00") + timedelta(days=1) if to_date else None
         )
+    except ValueError as exc:
+        return tool_result(f"Invalid filter: {exc}", tool_call_id, status="error")
 
-    appointments = providerStore.get_appointments(customer_id=customer_id)
-
-    return Command(
-        update={
-            "messages": state.messages
-            + [
-                ToolMessage(
-                    content=f"Here are the appointments: {json.dumps(appointments)}",
-                    tool_call_id=tool_call_id,
-                )
-            ]  # type: ignore
-        }
+    if upcoming_only:
+        start = max(start, _clinic_now()) if start else _clinic_now()
+
+    appointments = await get_repositories().appointments.list_for_customer_json(
+        customer_id=customer_id,
+        status=status_filter,
+        start=start,
+        end=end,
+        limit=limit if limit and limit > 0 else None,
     )
 
+    if appointments == "[]":
+        return tool_result("No matching appointments found", tool_call_id)
+
+    return tool_result(f"Here are the appointments: {appointments}", tool_call_id)
+
 
 @tool(
     ToolName.BOOK_APPOINTMENT.value,
-    description=f"""
+    description="""
     Tool Description: Appointment Booking
 
-      Books an appointment for the customer using a valid future date and time.
+      Books an appointment for the customer. Pass the date and time the way the
+      user said them; the tool resolves them against the current IST time itself.
       ---
       Input Requirements
-      - Date: Must be in `MM-DD-YYYY` format  
-      - Time: Must be in `HH:MM` (24-hour format)
+      - date: `MM-DD-YYYY`, or a phrase such as "today", "tomorrow", "next Sunday",
+        "in 3 days", "June 8"
+      - time: `HH:MM` (24-hour), or a phrase such as "3pm", "10:30 am", "noon", "at 3"
       ---
-      Current Date and Time  
-      (Current IST): `{get_current_datetime_in_ist()}`
-      ---
-
-      Parsing & Validation Rules
-      1. Date must be today or a future date.  
-      2. Time must be at least 10 minutes ahead of the current IST time.
-      3. Only future appointments are allowed. No backdating.
-      4. Relative expressions like `"tomorrow"` or `"next Sunday"` are allowed and will be resolved using the current IST datetime (`{get_current_datetime_in_ist()}`).
-      5. The system will auto-resolve to the correct year, e.g., if today is June 6, 2025, then “next Sunday” is resolved as June 8, 2025.
-      6. All times and dates are validated in India Standard Time (IST) only.
-
+      Validation (done by the tool)
+      - The appointment must be at least 10 minutes from now, in IST. No backdating.
+      - On failure the tool returns a JSON error with `error` (unrecognized_date,
+        unrecognized_time, in_past, too_soon) and, where relevant,
+        `earliest_allowed`; ask the user for another time using it.
   """,
 )
-def book_appointment(
+async def book_appointment(
     date: str,
     time: str,
     state: Annotated[State, InjectedState],
@@ -114,42 +139,77 @@ def book_appointment(
     if not auth_result[0]:
         return auth_result[1]
 
-    print(f"Booking appointment for customer {state.customer.id}")
+    logger.debug(f"Booking appointment for customer {state.customer.id}")
     customer_id = state.customer.id
 
     if customer_id is None or customer_id == "":
-        return Command(
-            update={
-                "messages": state.messages
-                + [
-                    ToolMessage(
-                        content="Customer ID is required to book appointment",
-                        tool_call_id=tool_call_id,
-                    )
-                ]  # type: ignore
-            }
-        )
+        return tool_result("Customer ID is required to book appointment", tool_call_id)
 
-    appointment = Appointment(
+    try:
+        start = resolve_appointment_start(date, time, _clinic_now())
+    except DateResolutionError as exc:
+        return tool_result(json.dumps(exc.to_json()), tool_call_id, status="error")
+
+    appointment = Appointment.at(
         id=str(uuid.uuid4()),
         customer_id=customer_id,
-        date=date,
-        time=time,
+        start=start,
         status=AppointmentStatus.PENDING,
     )
 
-    providerStore.add_appointment(appointment=appointment)
-
-    return Command(
-        update={
-            "messages": state.messages
-            + [
-                ToolMessage(
-                    content=f"Appointment booked successfully for {date} at {time}",
-                    tool_call_id=tool_call_id,
-                )
-            ]  # type: ignore
-        }
+    repository = get_repositories().appointments
+
+    if await repository.add(appointment) is None:
+        # Offer alternatives right away instead of another round trip.
+        alternatives = await repository.find_free_slots(after=max(start, _clinic_now()))
+        return tool_result(
+            f"The slot on {start:%A, %m-%d-%Y} at {start:%H:%M} is not available. "
+            f"Nearest free slots: {json.dumps([slot.to_json() for slot in alternatives])}",
+            tool_call_id,
+            status="error",
+        )
+
+    return tool_result(
+        f"Appointment {appointment.id} booked successfully for {start:%A, %m-%d-%Y} "
+        f"at {start:%H:%M} with provider {appointment.provider_id}",
+        tool_call_id,
+    )
+
+
+@tool(
+    ToolName.FIND_AVAILABLE_SLOTS.value,
+    description="""
+  Finds the next free appointment slots with any provider.
+  Use it before booking when the user has no exact time in mind, or to offer alternatives.
+
+  Input Requirements:
+    - date (optional): earliest date, `MM-DD-YYYY` or a phrase like "tomorrow" or "next Monday"; defaults to now
+    - time (optional): earliest time, `HH:MM` (24-hour) or a phrase like "3pm"; defaults to opening time
+    - count (optional): how many slots to return, defaults to 3
+  """,
+)
+async def find_available_slots(
+    tool_call_id: Annotated[str, InjectedToolCallId],
+    date: Optional[str] = None,
+    time: Optional[str] = None,
+    count: int = 3,
+):
+    after = _clinic_now()
+    if date:
+        try:
+            requested = datetime.combine(
+                resolve_date(date, after.date()), resolve_time(time) if time else dt_time(0, 0)
+            )
+        except DateResolutionError as exc:
+            return tool_result(json.dumps(exc.to_json()), tool_call_id, status="error")
+        after = max(after, requested)
+
+    slots = await get_repositories().appointments.find_free_slots(
+        after=after, count=max(1, min(count, 10))
+    )
+
+    return tool_result(
+        f"Free slots: {json.dumps([slot.to_json() for slot in slots])}", tool_call_id
     )
 
 
@@ -166,7 +226,7 @@ def book_appointment(
     - Appointment ID must be a valid appointment id.
   """,
 )
-def confirm_appointment(
+async def confirm_appointment(
     appointment_id: str,
     state: Annotated[State, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
@@ -177,54 +237,36 @@ def confirm_appointment(
     if not auth_result[0]:
         return auth_result[1]
 
-    print(f"Confirming appointment for customer {state.customer.id}")
+    logger.debug(f"Confirming appointment for customer {state.customer.id}")
     customer_id = state.customer.id
 
     if customer_id is None or customer_id == "":
-        return Command(
-            update={
-                "messages": state.messages
-                + [
-                    ToolMessage(
-                        content="Customer ID is required to confirm appointment",
-                        tool_call_id=tool_call_id,
-                    )
-                ]  # type: ignore
-            }
-        )
-
-    appointment = providerStore.get_appointment(appointment_id=appointment_id)
-
-    if appointment is None:
-        return Command(
-            update={
-                "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} not found", tool_call_id=tool_call_id)]  # type: ignore
-            }
-        )
-
-    if appointment.status == AppointmentStatus.CONFIRMED:
-        return Command(
-            update={
-                "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} is already confirmed", tool_call_id=tool_call_id)]  # type: ignore
-            }
-        )
-
-    if appointment.status == AppointmentStatus.COMPLETED:
-        return Command(
-            update={
-                "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} is already completed", tool_call_id=tool_call_id)]  # type: ignore
-            }
+        return tool_result("Customer ID is required to confirm appointment", tool_call_id)
+
+    def refuse(appointment: Appointment) -> Optional[str]:
+        # Same answer as a missing id, so other customers' ids aren't revealed.
+        if appointment.customer_id != customer_id:
+            return f"Appointment {appointment_id} not found"
+        if appointment.status == AppointmentStatus.CONFIRMED:
+            return f"Appointment {appointment_id} is already confirmed"
+        if appointment.status == AppointmentStatus.COMPLETED:
+            return f"Appointment {appointment_id} is already completed"
+        return None
+
+    updated, refusal = await _change_status(
+        appointment_id, AppointmentStatus.CONFIRMED, refuse, tool_call_id
+    )
+    if refusal is not None:
+        return refusal
+
+    if updated is None or updated.status != AppointmentStatus.CONFIRMED:
+        return tool_result(
+            f"Appointment {appointment_id} cannot be confirmed, its slot has been taken",
+            tool_call_id,
+            status="error",
         )
 
-    providerStore.update_appointment(
-        appointment_id=appointment_id, status=AppointmentStatus.CONFIRMED
-    )
-
-    return Command(
-        update={
-            "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} confirmed successfully", tool_call_id=tool_call_id)]  # type: ignore
-        }
-    )
+    return tool_result(f"Appointment {appointment_id} confirmed successfully", tool_call_id)
 
 
 @tool(
@@ -239,7 +281,7 @@ def confirm_appointment(
     - Appointment ID must be a valid appointment id.
   """,
 )
-def cancel_appointment(
+async def cancel_appointment(
     appointment_id: str,
     state: Annotated[State, InjectedState],
     tool_call_id: Annotated[str, InjectedToolCallId],
@@ -250,38 +292,73 @@ def cancel_appointment(
     if not auth_result[0]:
         return auth_result[1]
 
-    print(f"Cancelling appointment for customer {state.customer.id}")
+    logger.debug(f"Cancelling appointment for customer {state.customer.id}")
     customer_id = state.customer.id
 
     if customer_id is None or customer_id == "":
-        return Command(
-            update={
-                "messages": state.messages + [ToolMessage(content="Customer ID is required to cancel appointment", tool_call_id=tool_call_id)]  # type: ignore
-            }
-        )
-
-    appointment = providerStore.get_appointment(appointment_id=appointment_id)
+        return tool_result("Customer ID is required to cancel appointment", tool_call_id)
+
+    def refuse(appointment: Appointment) -> Optional[str]:
+        # Same answer as a missing id, so other customers' ids aren't revealed.
+        if appointment.customer_id != customer_id:
+            return f"Appointment {appointment_id} not found"
+        if appointment.status == AppointmentStatus.COMPLETED:
+            return f"Appointment {appointment_id} is already completed, cannot be cancelled"
+        if appointment.status == AppointmentStatus.CANCELLED:
+            return f"Appointment {appointment_id} is already cancelled"
+        return None
+
+    _, refusal = await _change_status(
+        appointment_id, AppointmentStatus.CANCELLED, refuse, tool_call_id
+    )
+    if refusal is not None:
+        return refusal
 
-    if appointment is None:
-        return Command(
-            update={
-                "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} not found", tool_call_id=tool_call_id)]  # type: ignore
-            }
-        )
+    return tool_result(f"Appointment {appointment_id} cancelled successfully", tool_call_id)
 
-    if appointment.status == AppointmentStatus.COMPLETED:
-        return Command(
-            update={
-                "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} is already completed, cannot be cancelled", tool_call_id=tool_call_id)]  # type: ignore
-            }
-        )
 
-    providerStore.update_appointment(
-        appointment_id=appointment_id, status=AppointmentStatus.CANCELLED
+async def _change_status(
+    appointment_id: str,
+    status: AppointmentStatus,
+    refuse: Callable[[Appointment], Optional[str]],
+    tool_call_id: str,
+) -> Tuple[Optional[Appointment], Optional[Command]]:
+    """Compare-and-set `status` onto an appointment, re-reading it after a conflict.
+
+    `refuse` says why the change isn't allowed in the appointment's current
+    state (or None); it is re-checked on every attempt, so a caller that loses
+    a race is told what the winner did. Returns the updated appointment, or the
+    tool result to give the model instead.
+    """
+    repository = get_repositories().appointments
+
+    for _ in range(_STATUS_UPDATE_ATTEMPTS):
+        appointment = await repository.get(appointment_id)
+        if appointment is None:
+            return None, tool_result(f"Appointment {appointment_id} not found", tool_call_id)
+
+        reason = refuse(appointment)
+        if reason is not None:
+            return None, tool_result(reason, tool_call_id)
+
+        try:
+            updated = await repository.update_status(
+                appointment_id, status, expected_version=appointment.version
+            )
+        except AppointmentVersionConflict as conflict:
+            logger.debug(f"Retrying {status.value} of {appointment_id}: {conflict}")
+            continue
+
+        return updated, None
+
+    return None, tool_result(
+        f"Appointment {appointment_id} is being changed by another request right now "
+        f"and was not {status.value}; list the appointment again before retrying",
+        tool_call_id,
+        status="error",
     )
 
-    return Command(
-        update={
-            "messages": state.messages + [ToolMessage(content=f"Appointment {appointment_id} cancelled successfully", tool_call_id=tool_call_id)]  # type: ignore
-        }
-    )
+
+def _clinic_now() -> datetime:
+    """Current clinic-local (IST) time as a naive datetime, like stored appointments."""
+    return get_current_datetime_in_ist().replace(tzinfo=None, second=0, microsecond=0)
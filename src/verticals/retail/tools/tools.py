@@ -4,8 +4,7 @@ from agent.state import MainState
 from langgraph.prebuilt import InjectedState
 from langchain_core.tools import InjectedToolCallId
 from mock.retail import retailStore
-from langgraph.types import Command
-from langchain_core.messages import ToolMessage
+from src.verticals.tool_results import tool_result
 import json
 
 @tool('get_orders', 
@@ -18,20 +17,8 @@ def get_orders(
   customer_id = state['customer_id']
   
   if customer_id is None or customer_id == "":
-    return Command(
-        update={
-          "messages": state['messages'] + [
-              ToolMessage(content="Customer ID is required to get orders", tool_call_id=tool_call_id)
-          ]
-        }
-    )
+    return tool_result("Customer ID is required to get orders", tool_call_id)
   
   orders = retailStore.get_orders(customer_id=customer_id)
   
-  return Command(
-    update={
-      "messages": state['messages'] + [
-        ToolMessage(content=json.dumps(orders), tool_call_id=tool_call_id)
-      ]
-    }
-  )
\ No newline at end of file
+  return tool_result(json.dumps(orders), tool_call_id)
\ No newline at end of file
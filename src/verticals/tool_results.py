@@ -0,0 +1,47 @@
+from typing import Any, Optional, Sequence
+
+from langchain_core.messages import AnyMessage, ToolMessage
+from langgraph.types import Command
+
+
+"""Shared constructor for tool `Command` results.
+
+`messages` is reduced with `add_messages`, so a tool only ever needs to return the
+messages it produced. Returning `state.messages + [...]` copies the full history
+and forces the reducer to re-merge it by id on every tool call, which makes a
+long call quadratic. Every tool in `src/verticals/` builds its result here, and
+the helper has no way to pass prior history through.
+"""
+
+
+def tool_result(
+    content: str,
+    tool_call_id: str,
+    *,
+    name: Optional[str] = None,
+    status: str = "success",
+    extra_messages: Sequence[AnyMessage] = (),
+    **state_updates: Any,
+) -> Command:
+    """Return a `Command` appending one `ToolMessage` (plus `extra_messages`).
+
+    `state_updates` are merged into the update as-is (e.g. `authentication=...`
+    or `active_node=...`); they must not include `messages`.
+    """
+
+    if "messages" in state_updates:
+        raise ValueError("tool_result appends messages itself; pass extra_messages instead")
+
+    tool_message = ToolMessage(
+        content=content,
+        tool_call_id=tool_call_id,
+        name=name,
+        status=status,
+    )
+
+    return Command(
+        update={
+            "messages": [tool_message, *extra_messages],
+            **state_updates,
+        }
+    )
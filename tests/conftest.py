@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Settings are read on first import of the app modules; no real LLM is called.
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+os.environ.setdefault("LOG_CONSOLE_LEVEL", "ERROR")
+# Keep test runs out of src/logs.
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="healthcare-agent-logs-"))
+os.environ.setdefault("LOG_FILE_LEVEL", "WARNING")
@@ -0,0 +1,149 @@
+import asyncio
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.app.voice.warmup import build_initial_state
+from src.core.repository import create_repositories
+from src.mock.customer import customer_store
+from src.mock.provider import (
+    Appointment,
+    AppointmentStatus,
+    AppointmentVersionConflict,
+    ProviderStore,
+)
+from src.verticals.provider.tools import tools
+
+"""Stress test for compare-and-set confirm/cancel (no lost updates)."""
+
+CALLS = 5000
+APPOINTMENTS = 20
+
+
+def _open_weekdays(first: datetime, count: int):
+    day = first
+    while count:
+        if day.weekday() != 6:
+            yield day
+            count -= 1
+        day += timedelta(days=1)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repositories(request, tmp_path, monkeypatch):
+    repositories = create_repositories(request.param, str(tmp_path / "appointments.sqlite"))
+    monkeypatch.setattr(tools, "get_repositories", lambda: repositories)
+    return repositories
+
+
+def test_concurrent_confirm_cancel_loses_no_updates(repositories):
+    async def run():
+        appointments = repositories.appointments
+        ids = []
+        for start in _open_weekdays(datetime(2031, 1, 6, 9, 0), APPOINTMENTS):
+            added = await appointments.add(
+                Appointment.at("", "CUST-1001", start, AppointmentStatus.PENDING)
+            )
+            ids.append(added.id)
+
+        state = build_initial_state(customer_store.customers[0], "voice", authorized=True)
+        outcomes: Counter = Counter()
+        applied: Counter = Counter()
+        refusals = set()
+        rng = random.Random(21)
+
+        async def call(i: int) -> None:
+            appointment_id = rng.choice(ids)
+            tool = rng.choice([tools.confirm_appointment, tools.cancel_appointment])
+            command = await tool.ainvoke(
+                {
+                    "type": "tool_call",
+                    "id": f"call-{i}",
+                    "name": tool.name,
+                    "args": {"appointment_id": appointment_id, "state": state},
+                }
+            )
+            text = command.update["messages"][0].content
+            if "successfully" in text:
+                outcomes["applied"] += 1
+                applied[appointment_id] += 1
+            elif "another request" in text:
+                outcomes["conflict"] += 1
+            else:
+                outcomes["refused"] += 1
+                refusals.add(text.split(" is ", 1)[1])
+
+        await asyncio.gather(*(call(i) for i in range(CALLS)))
+
+        for appointment_id in ids:
+            appointment = await appointments.get(appointment_id)
+            # Every reported success is exactly one version bump, and nothing else bumps it.
+            assert appointment.version == 1 + applied[appointment_id], appointment_id
+
+        assert sum(outcomes.values()) == CALLS
+        assert outcomes["applied"] >= APPOINTMENTS
+        # Losers are told what the winner did, never that the appointment is gone.
+        assert outcomes["refused"] > 0
+        assert refusals <= {"already confirmed", "already cancelled"}
+
+    asyncio.run(run())
+
+
+def test_threaded_compare_and_set_counts_every_win():
+    store = ProviderStore()
+    appointment = store.add_appointment(
+        Appointment.at("", "CUST-1001", datetime(2031, 1, 6, 9, 0), AppointmentStatus.PENDING)
+    )
+    wins = [0] * 8
+
+    def worker(k: int) -> None:
+        for _ in range(2000):
+            while True:
+                current = store.get_appointment(appointment.id)
+                target = (
+                    AppointmentStatus.CONFIRMED
+                    if current.status == AppointmentStatus.CANCELLED
+                    else AppointmentStatus.CANCELLED
+                )
+                try:
+                    store.update_appointment(appointment.id, target, current.version)
+                except AppointmentVersionConflict:
+                    continue
+                wins[k] += 1
+                break
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(len(wins))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.get_appointment(appointment.id).version == 1 + sum(wins)
+
+
+def test_confirm_cancel_refuse_other_customers_appointments(repositories):
+    async def run():
+        other = await repositories.appointments.add(
+            Appointment.at("", "CUST-1002", datetime(2031, 1, 6, 9, 0), AppointmentStatus.PENDING)
+        )
+        state = build_initial_state(customer_store.customers[0], "voice", authorized=True)
+
+        for i, tool in enumerate([tools.confirm_appointment, tools.cancel_appointment]):
+            command = await tool.ainvoke(
+                {
+                    "type": "tool_call",
+                    "id": f"call-{i}",
+                    "name": tool.name,
+                    "args": {"appointment_id": other.id, "state": state},
+                }
+            )
+            assert command.update["messages"][0].content == f"Appointment {other.id} not found"
+
+        unchanged = await repositories.appointments.get(other.id)
+        assert unchanged.status == AppointmentStatus.PENDING
+        assert unchanged.version == 1
+
+    asyncio.run(run())
@@ -0,0 +1,52 @@
+from src.core.otp import VerifiedCallerCache
+
+"""Verified-caller trust window: opt-in per clinic, counted per first turn."""
+
+PHONE = "+14803828571"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_trust_is_off_unless_a_clinic_opts_in():
+    clock = FakeClock()
+    trust = VerifiedCallerCache(clinic_ttl_seconds={"appollo": 900}, clock=clock)
+    trust.remember("(480) 382-8571", "CUST-1001")
+
+    assert trust.is_trusted(PHONE, "CUST-1001", "appollo")
+    assert not trust.is_trusted(PHONE, "CUST-1001", "other-clinic")
+    # Never carried over to another customer on the same number.
+    assert not trust.is_trusted(PHONE, "CUST-1002", "appollo")
+
+    clock.now += 900
+    assert not trust.is_trusted(PHONE, "CUST-1001", "appollo")
+
+
+def test_checks_are_not_counted_until_the_first_turn():
+    trust = VerifiedCallerCache(ttl_seconds=900, clock=FakeClock())
+    trust.remember(PHONE, "CUST-1001")
+
+    # A warm-up whose call never takes a turn.
+    assert trust.is_trusted(PHONE, "CUST-1001", "appollo")
+    stats = trust.stats()
+    assert (stats.otp_round_trips_avoided, stats.otp_required) == (0, 0)
+
+    trust.record_first_turn(True)
+    trust.record_first_turn(False)
+    stats = trust.stats()
+    assert (stats.otp_round_trips_avoided, stats.otp_required) == (1, 1)
+
+
+def test_revoke_by_number():
+    trust = VerifiedCallerCache(ttl_seconds=900, clock=FakeClock())
+    trust.remember(PHONE, "CUST-1001")
+    trust.remember(PHONE, "CUST-1002")
+
+    assert trust.revoke("480-382-8571") == 2
+    assert not trust.is_trusted(PHONE, "CUST-1001", "appollo")
+    assert trust.stats().revocations == 2
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from src.mock.customer import BulkLoadResult, Customer, CustomerStore
+from src.utils.phone import normalize_phone_number, try_normalize_phone_number
+
+"""Phone normalization, indexed customer lookups and the streaming bulk loader."""
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("+14803828571", "+14803828571"),
+        ("+1 (480) 382-8571", "+14803828571"),
+        ("(480) 382-8571", "+14803828571"),
+        ("480.382.8571", "+14803828571"),
+        ("14803828571", "+14803828571"),
+        ("1-480-382-8571", "+14803828571"),
+        ("001 480 382 8571", "+14803828571"),
+        ("  4803828571 ", "+14803828571"),
+        ("+91 98765 43210", "+919876543210"),
+        ("0091 98765 43210", "+919876543210"),
+        ("0480 382 8571", "+14803828571"),
+    ],
+)
+def test_normalize_phone_number(raw, expected):
+    assert normalize_phone_number(raw) == expected
+
+
+def test_normalize_phone_number_default_country_code():
+    assert normalize_phone_number("098765 43210", default_country_code="91") == "+919876543210"
+
+
+@pytest.mark.parametrize(
+    "raw", ["", "12345", "+0123456789", "+1234567890123456", "not a number", "+"]
+)
+def test_normalize_phone_number_rejects(raw):
+    with pytest.raises(ValueError):
+        normalize_phone_number(raw)
+    assert try_normalize_phone_number(raw) is None
+
+
+def test_try_normalize_phone_number_none():
+    assert try_normalize_phone_number(None) is None
+
+
+def test_lookups_match_any_format():
+    store = CustomerStore()
+    assert store.add_customer(Customer("CUST-9001", "Ana Ruiz", "(602) 555-0143", "1988-02-11"))
+
+    customer = store.find_customer_by_phone_number("+16025550143")
+    assert customer is not None and customer.id == "CUST-9001"
+    assert customer.phone_number == "+16025550143"
+    assert store.find_customer_by_phone_number("602.555.0143") is customer
+    assert store.get_customer_by_id("CUST-9001") is customer
+    assert store.find_customer_by_phone_number("not a number") is None
+    assert store.get_customer_by_id("CUST-0000") is None
+
+
+def test_add_customer_rejects_duplicates():
+    store = CustomerStore()
+    size = len(store)
+
+    # Same number in another format, and a reused ID.
+    assert not store.add_customer(Customer("CUST-9002", "Dup Phone", "480-382-8571", "1990-01-01"))
+    assert not store.add_customer(Customer("CUST-1001", "Dup Id", "+16025550199", "1990-01-01"))
+    assert len(store) == size
+
+
+def test_load_rows_counts_loaded_duplicates_and_invalid():
+    store = CustomerStore()
+    size = len(store)
+
+    result = store.load_rows(
+        [
+            {"id": "CUST-2001", "name": " Ana ", "phone_number": "602 555 0101", "dob": "1980-01-01"},
+            {"id": "CUST-2002", "name": "Ben", "phone_number": "+16025550102", "dob": "1980-01-01"},
+            # Duplicate phone (in another format) and duplicate id.
+            {"id": "CUST-2003", "name": "Cy", "phone_number": "(602) 555-0101", "dob": "1981-01-01"},
+            {"id": "CUST-2002", "name": "Di", "phone_number": "+16025550104", "dob": "1982-01-01"},
+            # Missing field and unusable number.
+            {"id": "CUST-2005", "name": "Ed", "phone_number": "+16025550105"},
+            {"id": "CUST-2006", "name": "Flo", "phone_number": "12", "dob": "1983-01-01"},
+        ]
+    )
+
+    assert result == BulkLoadResult(loaded=2, duplicates=2, invalid=2)
+    assert len(store) == size + 2
+    assert store.get_customer_by_id("CUST-2001").name == "Ana"
+    assert store.find_customer_by_phone_number("+16025550101").id == "CUST-2001"
+    # Repeated birth dates share one string.
+    assert store.get_customer_by_id("CUST-2001").dob is store.get_customer_by_id("CUST-2002").dob
+
+
+def test_load_file_reads_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "customers.csv"
+    csv_path.write_text(
+        "id,name,phone_number,dob\n"
+        "CUST-3001,Gia,602-555-0201,1979-03-03\n"
+        "CUST-3002,Hal,,1979-03-03\n"
+    )
+    jsonl_path = tmp_path / "customers.jsonl"
+    jsonl_path.write_text(
+        json.dumps({"id": "CUST-3003", "name": "Ivy", "phone_number": "+16025550203", "dob": "1970-01-01"})
+        + "\n\n"
+    )
+    store = CustomerStore()
+
+    assert store.load_file(csv_path) == BulkLoadResult(loaded=1, invalid=1)
+    assert store.load_file(jsonl_path) == BulkLoadResult(loaded=1)
+    assert store.find_customer_by_phone_number("6025550201").id == "CUST-3001"
+    assert store.find_customer_by_phone_number("6025550203").id == "CUST-3003"
+
+    text_path = tmp_path / "customers.txt"
+    text_path.write_text("CUST-3004 Jo 6025550204 1970-01-01\n")
+    with pytest.raises(ValueError):
+        store.load_file(text_path)
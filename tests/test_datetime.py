@@ -0,0 +1,120 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from src.utils.datetime import (
+    DateResolutionError,
+    resolve_appointment_start,
+    resolve_date,
+    resolve_time,
+)
+
+"""Spoken date/time resolver, table-driven against a fixed "now"."""
+
+# A Wednesday.
+TODAY = date(2025, 6, 4)
+NOW = datetime(2025, 6, 4, 10, 0)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("today", date(2025, 6, 4)),
+        ("Tomorrow", date(2025, 6, 5)),
+        ("yesterday", date(2025, 6, 3)),
+        ("day after tomorrow", date(2025, 6, 6)),
+        ("in 3 days", date(2025, 6, 7)),
+        ("in a week", date(2025, 6, 11)),
+        ("in two weeks", date(2025, 6, 18)),
+        ("friday", date(2025, 6, 6)),
+        ("this friday", date(2025, 6, 6)),
+        ("next fri", date(2025, 6, 6)),
+        ("this wednesday", date(2025, 6, 4)),
+        ("next wednesday", date(2025, 6, 11)),
+        ("wednesday", date(2025, 6, 11)),
+        ("06-08-2025", date(2025, 6, 8)),
+        ("2025-06-08", date(2025, 6, 8)),
+        ("06/08/25", date(2025, 6, 8)),
+        ("06/08", date(2025, 6, 8)),
+        ("06/01", date(2026, 6, 1)),
+        ("june 8", date(2025, 6, 8)),
+        ("June 8th, 2026", date(2026, 6, 8)),
+        ("8th of june", date(2025, 6, 8)),
+        ("1 jan", date(2026, 1, 1)),
+        ("feb 29", date(2028, 2, 29)),
+    ],
+)
+def test_resolve_date(text, expected):
+    assert resolve_date(text, TODAY) == expected
+
+
+@pytest.mark.parametrize(
+    "text", ["", "someday", "13-45-2025", "feb 30 2025", "next month", "friday week after"]
+)
+def test_resolve_date_rejects(text):
+    with pytest.raises(DateResolutionError) as error:
+        resolve_date(text, TODAY)
+    assert error.value.code == "unrecognized_date"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("at 3", time(15, 0)),
+        ("3:30", time(15, 30)),
+        ("7:30", time(19, 30)),
+        ("07:30", time(7, 30)),
+        ("08:00", time(8, 0)),
+        ("8", time(8, 0)),
+        ("11:15", time(11, 15)),
+        ("15:00", time(15, 0)),
+        ("00:30", time(0, 30)),
+        ("3pm", time(15, 0)),
+        ("3:30 p.m.", time(15, 30)),
+        ("7 am", time(7, 0)),
+        ("12 am", time(0, 0)),
+        ("12pm", time(12, 0)),
+        ("around 10.45", time(10, 45)),
+        ("noon", time(12, 0)),
+        ("morning", time(9, 0)),
+        ("in the morning", time(9, 0)),
+        ("in the afternoon", time(14, 0)),
+        ("in the evening", time(16, 0)),
+    ],
+)
+def test_resolve_time(text, expected):
+    assert resolve_time(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "late", "13pm", "0am", "24:00", "10:60", "soonish"])
+def test_resolve_time_rejects(text):
+    with pytest.raises(DateResolutionError) as error:
+        resolve_time(text)
+    assert error.value.code == "unrecognized_time"
+
+
+@pytest.mark.parametrize(
+    "date_text, time_text, expected",
+    [
+        ("tomorrow", "at 3", datetime(2025, 6, 5, 15, 0)),
+        ("next friday", "in the morning", datetime(2025, 6, 6, 9, 0)),
+        ("today", "10:10", datetime(2025, 6, 4, 10, 10)),
+    ],
+)
+def test_resolve_appointment_start(date_text, time_text, expected):
+    assert resolve_appointment_start(date_text, time_text, NOW) == expected
+
+
+@pytest.mark.parametrize(
+    "date_text, time_text, code",
+    [
+        ("yesterday", "at 3", "in_past"),
+        ("today", "09:00", "in_past"),
+        ("today", "10:05", "too_soon"),
+    ],
+)
+def test_resolve_appointment_start_rejects(date_text, time_text, code):
+    with pytest.raises(DateResolutionError) as error:
+        resolve_appointment_start(date_text, time_text, NOW)
+    assert error.value.code == code
+    assert error.value.earliest_allowed == NOW + timedelta(minutes=10)
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+import src.agents.appointment_agent.agent as appointment_agent_module
+import src.agents.multi_agent.agent as multi_agent_module
+from src.app.voice.warmup import build_initial_state
+from src.mock.customer import customer_store
+
+"""Regression test: a slow LLM must not block the event loop for other calls."""
+
+CALLS = 50
+LLM_LATENCY_SECONDS = 0.5
+TICK_SECONDS = 0.01
+# A single blocking LLM call would stall the loop for the full LLM_LATENCY_SECONDS;
+# the margin below it absorbs the CPU burst of starting every graph at once.
+MAX_LAG_SECONDS = LLM_LATENCY_SECONDS / 2
+
+
+async def _slow_llm(messages):
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    return AIMessage(content="Sure, how can I help?")
+
+
+async def _measure_lag(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started_at - TICK_SECONDS)
+
+
+@pytest.mark.parametrize(
+    "module, llm_factory",
+    [
+        (appointment_agent_module, "appointment_llm"),
+        (multi_agent_module, "sonnet_llm"),
+    ],
+)
+def test_concurrent_calls_keep_event_loop_responsive(module, llm_factory, monkeypatch):
+    monkeypatch.setattr(module, llm_factory, lambda *args, **kwargs: RunnableLambda(_slow_llm))
+    customer = customer_store.customers[0]
+
+    async def call() -> dict:
+        state = build_initial_state(customer, "voice", authorized=True)
+        state.messages = [HumanMessage(content="hi")]
+        return await module.langgraph_agent.ainvoke(state.model_dump())
+
+    async def run() -> None:
+        stop, lags = asyncio.Event(), []
+        monitor = asyncio.create_task(_measure_lag(stop, lags))
+
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*(call() for _ in range(CALLS)))
+        elapsed = time.perf_counter() - started_at
+
+        stop.set()
+        await monitor
+
+        assert all(result["messages"][-1].content for result in results)
+        assert max(lags) < MAX_LAG_SECONDS, f"event loop stalled for {max(lags) * 1000:.0f}ms"
+        # Run serially, the calls would take CALLS * LLM_LATENCY_SECONDS.
+        assert elapsed < CALLS * LLM_LATENCY_SECONDS / 4
+        # The monitor kept ticking while the calls were in flight, not just around them.
+        assert len(lags) >= LLM_LATENCY_SECONDS / TICK_SECONDS / 2
+
+    asyncio.run(run())
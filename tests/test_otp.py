@@ -0,0 +1,139 @@
+import asyncio
+
+from src.core.otp import (
+    LocalSmsSink,
+    OtpService,
+    OtpStore,
+    OtpVerification,
+    SmsDispatcher,
+    TokenBucketLimiter,
+)
+
+"""OTP store expiry and attempt limits, and per-number send rate limiting."""
+
+PHONE = "+15550100"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _wrong(code: str) -> str:
+    return f"{(int(code) + 1) % 10 ** len(code):0{len(code)}d}"
+
+
+def test_code_verifies_once():
+    store = OtpStore(clock=FakeClock())
+    code = store.issue(PHONE)
+
+    assert store.has_pending(PHONE)
+    assert store.verify(PHONE, f" {code} ") == (OtpVerification.VERIFIED, 0)
+    assert store.verify(PHONE, code) == (OtpVerification.NOT_FOUND, 0)
+    assert not store.has_pending(PHONE)
+
+
+def test_code_expires_after_ttl():
+    clock = FakeClock()
+    store = OtpStore(ttl_seconds=300, clock=clock)
+    code = store.issue(PHONE)
+
+    clock.now += 299.9
+    assert store.has_pending(PHONE)
+    clock.now += 0.1
+    assert not store.has_pending(PHONE)
+    assert store.verify(PHONE, code) == (OtpVerification.EXPIRED, 0)
+    assert store.verify(PHONE, code) == (OtpVerification.NOT_FOUND, 0)
+
+
+def test_expired_codes_are_purged_on_issue():
+    clock = FakeClock()
+    store = OtpStore(ttl_seconds=60, clock=clock)
+    for i in range(10):
+        store.issue(f"+1555000{i}")
+    assert len(store) == 10
+
+    clock.now += 60
+    store.issue(PHONE)
+    assert len(store) == 1
+
+
+def test_reissue_replaces_pending_code():
+    store = OtpStore(clock=FakeClock())
+    first = store.issue(PHONE)
+    second = store.issue(PHONE)
+
+    if first != second:
+        assert store.verify(PHONE, first)[0] == OtpVerification.INVALID
+    assert store.verify(PHONE, second)[0] == OtpVerification.VERIFIED
+
+
+def test_attempt_limit_burns_code():
+    store = OtpStore(max_attempts=3, clock=FakeClock())
+    code = store.issue(PHONE)
+
+    assert store.verify(PHONE, _wrong(code)) == (OtpVerification.INVALID, 2)
+    assert store.verify(PHONE, _wrong(code)) == (OtpVerification.INVALID, 1)
+    assert store.verify(PHONE, _wrong(code)) == (OtpVerification.TOO_MANY_ATTEMPTS, 0)
+    # The right code is no good once the attempts are used up.
+    assert store.verify(PHONE, code) == (OtpVerification.NOT_FOUND, 0)
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(capacity=3, refill_per_second=0.5, clock=clock)
+
+    assert [limiter.try_acquire(PHONE) for _ in range(3)] == [None, None, None]
+    assert limiter.try_acquire(PHONE) == 2.0
+
+    clock.now += 1.0
+    assert limiter.try_acquire(PHONE) == 1.0
+    clock.now += 1.0
+    assert limiter.try_acquire(PHONE) is None
+    assert limiter.try_acquire(PHONE) == 2.0
+
+
+def test_token_bucket_is_per_key():
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.1, clock=FakeClock())
+
+    assert limiter.try_acquire(PHONE) is None
+    assert limiter.try_acquire(PHONE) is not None
+    assert limiter.try_acquire("+15550199") is None
+
+
+def test_token_bucket_prunes_refilled_buckets():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=1.0, prune_every=4, clock=clock)
+    for i in range(3):
+        limiter.try_acquire(f"+1555000{i}")
+    assert len(limiter) == 3
+
+    clock.now += 2.0
+    limiter.try_acquire(PHONE)
+    assert len(limiter) == 1
+
+
+def test_service_rate_limits_sends_and_delivers_codes():
+    clock = FakeClock()
+    sink = LocalSmsSink()
+    service = OtpService(
+        store=OtpStore(clock=clock),
+        limiter=TokenBucketLimiter(capacity=2, refill_per_second=1 / 30, clock=clock),
+        dispatcher=SmsDispatcher(sink, workers=1),
+    )
+
+    async def run():
+        results = [service.send(PHONE) for _ in range(3)]
+        await service.dispatcher.aclose()
+        return results
+
+    first, second, third = asyncio.run(run())
+
+    assert first.sent and second.sent
+    assert not third.sent and third.retry_after == 30.0
+    assert len(sink.sent) == 2
+    code = sink.last_to(PHONE).split("code is ")[1].split(".")[0]
+    assert service.verify(PHONE, code).verified
@@ -0,0 +1,92 @@
+import asyncio
+import random
+import threading
+import time
+
+from src.mock.customer_sessions import _CustomerSessionStore
+
+"""Concurrency stress tests for the customer session store."""
+
+
+def _assert_indexes_consistent(store: _CustomerSessionStore) -> None:
+    sessions = store._sessions
+    assert set(store._by_phone_channel.values()) <= set(sessions)
+    assert set(store._by_call_sid.values()) <= set(sessions)
+    assert set(store._last_seen) == set(sessions)
+    assert set(store._turn_locks) == set(sessions)
+    assert store._connected <= set(sessions)
+
+
+def test_turn_lock_serializes_turns_for_one_session():
+    store = _CustomerSessionStore()
+    session = store.create_session("+919876543210", "voice")
+    running = 0
+    max_running = 0
+
+    async def turn() -> None:
+        nonlocal running, max_running
+        async with store.turn_lock(session.session_id):
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+
+    async def run() -> None:
+        await asyncio.gather(*(turn() for _ in range(200)))
+
+    asyncio.run(run())
+    assert max_running == 1
+
+
+def test_threaded_churn_with_sweeper_leaves_no_stale_entries():
+    store = _CustomerSessionStore(idle_ttl_seconds=0.0)
+    live = store.create_session("+919800000000", "voice", call_sid="CA-live")
+    store.mark_connected(live.session_id)
+    stop = threading.Event()
+
+    def churn(worker: int) -> None:
+        rng = random.Random(worker)
+        for i in range(20_000):
+            phone = f"+9198{worker:02d}{rng.randrange(1000):06d}"
+            session = store.create_session(phone, "voice", call_sid=f"CA-{worker}-{i}")
+            found = store.get_session_by_phone_and_channel(phone, "voice")
+            assert found is None or found.phone_number == phone
+            if rng.random() < 0.5:
+                store.delete_session(session.session_id)
+
+    def sweeper() -> None:
+        while not stop.is_set():
+            store.sweep()
+
+    workers = [threading.Thread(target=churn, args=(k,)) for k in range(4)]
+    sweeper_thread = threading.Thread(target=sweeper)
+    sweeper_thread.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    stop.set()
+    sweeper_thread.join()
+
+    store.sweep()
+    _assert_indexes_consistent(store)
+    # Everything idle was expired; the session with an open websocket survived.
+    assert list(store._sessions) == [live.session_id]
+    assert store.get_session_by_call_sid("CA-live") is live
+
+
+def test_lookups_stay_constant_time():
+    store = _CustomerSessionStore()
+    for i in range(100_000):
+        store.create_session(f"+9198{i:08d}", "voice")
+
+    started_at = time.perf_counter()
+    for i in range(0, 100_000, 10):
+        assert store.get_session_by_phone_and_channel(f"+9198{i:08d}", "VOICE") is not None
+    per_lookup = (time.perf_counter() - started_at) / 10_000
+
+    # A linear scan of 100k sessions takes milliseconds per lookup.
+    assert per_lookup < 1e-4
+    assert len(store._sessions) == 100_000
+    assert store.get_session_by_phone_and_channel("+919900000000", "voice") is None
+    assert store.get_session_by_phone_and_channel("+919800000000", "sms") is None
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from src.core.checkpoint import SqliteCheckpointSaver
+
+"""SQLite checkpointer: delta chains survive a failed group commit."""
+
+
+def _checkpoint(saver: SqliteCheckpointSaver, messages, previous=None):
+    version = saver.get_next_version(
+        previous["channel_versions"]["messages"] if previous else None, None
+    )
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": messages}
+    checkpoint["channel_versions"] = {"messages": version}
+    return checkpoint, {"messages": version}
+
+
+def test_put_after_failed_batch_is_readable(tmp_path, monkeypatch):
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"))
+    config = {"configurable": {"thread_id": "call-1", "checkpoint_ns": ""}}
+    hello, reply, lost, again = "hello", "reply", "lost", "again"
+
+    async def run():
+        first, versions = _checkpoint(saver, [hello, reply])
+        await saver.aput(config, first, {}, versions)
+
+        # The next put is encoded as a delta on `first`, then its commit fails.
+        execute = saver._execute
+
+        def fail_once(statements):
+            monkeypatch.setattr(saver, "_execute", execute)
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(saver, "_execute", fail_once)
+        failed, versions = _checkpoint(saver, [hello, reply, lost], first)
+        with pytest.raises(RuntimeError):
+            await saver.aput(config, failed, {}, versions)
+
+        # LangGraph still writes the following checkpoint of the run.
+        latest, versions = _checkpoint(saver, [hello, reply, lost, again], failed)
+        await saver.aput(config, latest, {}, versions)
+        return await saver.aget_tuple(config)
+
+    checkpoint_tuple = asyncio.run(run())
+    saver.close()
+
+    assert checkpoint_tuple.checkpoint["channel_values"]["messages"] == [
+        hello,
+        reply,
+        lost,
+        again,
+    ]
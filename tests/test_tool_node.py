@@ -0,0 +1,56 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from src.agents.tool_node import ConcurrentToolNode
+
+"""Tool node timeouts: reads are cut off, writes always run to completion."""
+
+committed = []
+
+
+@tool
+async def slow_lookup(appointment_id: str) -> str:
+    """Look up an appointment, slowly."""
+    await asyncio.sleep(0.2)
+    return f"{appointment_id} is confirmed"
+
+
+@tool
+async def slow_cancel(appointment_id: str) -> str:
+    """Cancel an appointment, slowly."""
+    await asyncio.sleep(0.2)
+    committed.append(appointment_id)
+    return f"{appointment_id} cancelled"
+
+
+def _invoke(node: ConcurrentToolNode, name: str):
+    message = AIMessage(
+        content="",
+        tool_calls=[{"name": name, "args": {"appointment_id": "APT-1"}, "id": "call-1"}],
+    )
+    result = asyncio.run(node.ainvoke({"messages": [message]}))
+    return result["messages"][0]
+
+
+def test_read_tool_times_out():
+    node = ConcurrentToolNode([slow_lookup, slow_cancel], default_timeout=0.05)
+
+    reply = _invoke(node, slow_lookup.name)
+
+    assert reply.status == "error"
+    assert "timed out" in reply.content
+
+
+def test_write_tool_is_never_timed_out():
+    node = ConcurrentToolNode(
+        [slow_lookup, slow_cancel], default_timeout=0.05, writes=[slow_cancel.name]
+    )
+    committed.clear()
+
+    reply = _invoke(node, slow_cancel.name)
+
+    assert reply.status == "success"
+    assert reply.content == "APT-1 cancelled"
+    assert committed == ["APT-1"]